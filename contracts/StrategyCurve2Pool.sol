@@ -7,21 +7,18 @@ import { ICurveFi, IGauge, IGaugeFactory } from "./interfaces/curve.sol";
 import { IUniswapV2Router02 } from "./interfaces/uniswap.sol";
 import { SafeERC20, IERC20, Address } from "@openzeppelin/contracts/token/ERC20/utils/SafeERC20.sol";
 
-import "@openzeppelin/contracts/utils/math/SafeMath.sol";
 import "@openzeppelin/contracts/utils/math/Math.sol";
 
 // These are the core Yearn libraries
 abstract contract StrategyCurveBase is BaseStrategy {
     using Address for address;
-    using SafeMath for uint256;
     using SafeERC20 for IERC20;
 
     /* ========== STATE VARIABLES ========== */
     // these should stay the same across different wants.
 
-    // curve infrastructure contracts
-    IGauge public constant gauge =
-        IGauge(0x15bB164F9827De760174d3d3dAD6816eF50dE13c);
+    // curve infrastructure contracts, set per deployment (and per clone) in _initializeStrat
+    IGauge public gauge;
     // Swap stuff
 
     IERC20 internal constant crv =
@@ -50,7 +47,7 @@ abstract contract StrategyCurveBase is BaseStrategy {
     }
 
     function estimatedTotalAssets() public view override returns (uint256) {
-        return balanceOfWant().add(stakedBalance());
+        return balanceOfWant() + stakedBalance();
     }
 
     /* ========== MUTATIVE FUNCTIONS ========== */
@@ -72,15 +69,21 @@ abstract contract StrategyCurveBase is BaseStrategy {
         uint256 _wantBal = balanceOfWant();
         if (_amountNeeded > _wantBal) {
             // check if we have enough free funds to cover the withdrawal
-            uint256 _stakedBal = stakedBalance();
-            if (_stakedBal > 0) {
-                gauge.withdraw(
-                    Math.min(_stakedBal, _amountNeeded.sub(_wantBal))
-                );
+            uint256 _shortfall;
+            unchecked {
+                // _amountNeeded > _wantBal
+                _shortfall = _amountNeeded - _wantBal;
+            }
+            uint256 _toWithdraw = Math.min(stakedBalance(), _shortfall);
+            if (_toWithdraw > 0) {
+                gauge.withdraw(_toWithdraw);
+            }
+            // the gauge hands back exactly what we withdraw, no need to ask want for our new balance
+            _liquidatedAmount = _wantBal + _toWithdraw;
+            unchecked {
+                // _toWithdraw is at most _shortfall, so _liquidatedAmount is at most _amountNeeded
+                _loss = _amountNeeded - _liquidatedAmount;
             }
-            uint256 _withdrawnBal = balanceOfWant();
-            _liquidatedAmount = Math.min(_amountNeeded, _withdrawnBal);
-            _loss = _amountNeeded.sub(_liquidatedAmount);
         } else {
             // we have enough balance to cover the liquidation available
             return (_amountNeeded, 0);
@@ -112,39 +115,147 @@ abstract contract StrategyCurveBase is BaseStrategy {
 contract StrategyCurve2Pool is StrategyCurveBase {
     /* ========== STATE VARIABLES ========== */
     // these will likely change across different wants.
-    using SafeMath for uint256;
 
     // Curve stuff
-    ICurveFi internal constant curve =
-        ICurveFi(0x27E611FD27b276ACbd5Ffd632E5eAEBEC9761E40); // this is used for depositing to all 3Crv metapools
+    ICurveFi public curve; // the pool we deposit our stables to, set per deployment (and per clone)
+    uint256 internal usdcIndex; // which of the pool's coins is usdc, dai is the other one
 
-    IGaugeFactory internal constant gaugeFactory =
-        IGaugeFactory(0xabC000d88f23Bb45525E447528DBF656A9D55bf5);
+    // the same for every pool on a chain, so clones share the original's
+    IGaugeFactory public immutable gaugeFactory;
     // we use these to deposit to our curve pool
     address public targetStable; ///@notice This is the stablecoin we are using to take profits and deposit into 3Crv.
-    address internal constant spooky =
-        0xF491e7B69E4244ad4002BC14e878a34207E38c29; // we use this to sell our bonus token
+    address public immutable spooky; // we use this to sell our bonus token
 
     IERC20 internal constant usdc =
         IERC20(0x04068DA6C83AFCFA0e13ba15A6696662335D5B75);
     IERC20 internal constant dai =
         IERC20(0x8D11eC38a3EB5E956B052f67Da8Bdc9bef8Abf3E);
 
+    uint256 internal constant WEEK = 7 days; // child gauges set CRV emissions per week
+
+    ///@notice Less CRV than this isn't worth a trip through the router, we leave it for the next harvest.
+    uint256 public minCrvToSell;
+    ///@notice Less than this in stables (USDC and DAI together, 18 decimals) isn't worth a Curve deposit yet.
+    uint256 public minStablesToDeposit;
+
+    ///@notice Expected profit (in want) below which we don't harvest on minReportDelay alone.
+    uint256 public harvestProfitMin;
+    ///@notice Expected profit (in want) above which we harvest whatever the call costs, as long as base fee allows.
+    uint256 public harvestProfitMax;
+    ///@notice How many times over expected profit has to pay for the harvest call before minReportDelay triggers.
+    uint256 public profitFactor;
+
+    // clones get a fresh storage slot here, so only the original deployment can clone
+    bool public isOriginal = true;
+
+    event Cloned(address indexed clone);
+
     /* ========== CONSTRUCTOR ========== */
 
-    constructor(address _vault) StrategyCurveBase(_vault) {
+    constructor(
+        address _vault,
+        address _gauge,
+        address _curve,
+        address _gaugeFactory,
+        address _spooky
+    ) StrategyCurveBase(_vault) {
+        gaugeFactory = IGaugeFactory(_gaugeFactory);
+        spooky = _spooky;
+        // immutables can't be read until construction is over, so hand the router over directly
+        _initializeStrat(_gauge, _curve, _spooky);
+    }
+
+    /* ========== CLONING ========== */
+
+    /**
+     * @notice Deploy an EIP-1167 minimal proxy of this strategy for another vault and initialize it. The clone
+     *  uses our gauge factory and router, but farms whichever gauge and pool we give it.
+     */
+    function cloneCurve2Pool(
+        address _vault,
+        address _strategist,
+        address _rewards,
+        address _keeper,
+        address _gauge,
+        address _curve
+    ) external returns (address newStrategy) {
+        require(isOriginal, "!clone");
+        // copied from https://github.com/optionality/clone-factory/blob/master/contracts/CloneFactory.sol
+        bytes20 addressBytes = bytes20(address(this));
+        assembly {
+            let clone_code := mload(0x40)
+            mstore(
+                clone_code,
+                0x3d602d80600a3d3981f3363d3d373d3d3d363d73000000000000000000000000
+            )
+            mstore(add(clone_code, 0x14), addressBytes)
+            mstore(
+                add(clone_code, 0x28),
+                0x5af43d82803e903d91602b57fd5bf30000000000000000000000000000000000
+            )
+            newStrategy := create(0, clone_code, 0x37)
+        }
+
+        StrategyCurve2Pool(newStrategy).initialize(
+            _vault,
+            _strategist,
+            _rewards,
+            _keeper,
+            _gauge,
+            _curve
+        );
+
+        emit Cloned(newStrategy);
+    }
+
+    ///@notice Set up a clone. BaseStrategy's _initialize reverts if we already have a want, so this only works once.
+    function initialize(
+        address _vault,
+        address _strategist,
+        address _rewards,
+        address _keeper,
+        address _gauge,
+        address _curve
+    ) external {
+        _initialize(_vault, _strategist, _rewards, _keeper);
+        _initializeStrat(_gauge, _curve, spooky);
+    }
+
+    // everything a constructor would set, so the original and its clones start out the same
+    function _initializeStrat(
+        address _gauge,
+        address _curve,
+        address _spooky
+    ) internal {
+        // the gauge has to stake our want, and the pool has to take the two stables we sell CRV for
+        require(IGauge(_gauge).lp_token() == address(want), "!gauge");
+        address _coin0 = ICurveFi(_curve).coins(0);
+        address _coin1 = ICurveFi(_curve).coins(1);
+        require(
+            (_coin0 == address(usdc) && _coin1 == address(dai)) ||
+                (_coin0 == address(dai) && _coin1 == address(usdc)),
+            "!curve"
+        );
+        gauge = IGauge(_gauge);
+        curve = ICurveFi(_curve);
+        usdcIndex = _coin0 == address(usdc) ? 0 : 1;
+
         maxReportDelay = 100 days; // 100 days in seconds
         minReportDelay = 21 days; // 21 days in seconds
         creditThreshold = 1e6 * 1e18;
+        minCrvToSell = 1e17;
+        minStablesToDeposit = 1e17;
+        harvestProfitMax = 50_000 * 1e18;
+        profitFactor = 10;
 
         // these are our standard approvals. want = Curve LP token
-        want.approve(address(gauge), type(uint256).max);
-        crv.approve(address(spooky), type(uint256).max);
-        wftm.approve(address(spooky), type(uint256).max);
+        want.approve(_gauge, type(uint256).max);
+        crv.approve(_spooky, type(uint256).max);
+        wftm.approve(_spooky, type(uint256).max);
 
         // these are our approvals and path specific to this contract
-        dai.approve(address(curve), type(uint256).max);
-        usdc.approve(address(curve), type(uint256).max);
+        dai.approve(_curve, type(uint256).max);
+        usdc.approve(_curve, type(uint256).max);
 
         // start with usdt
         targetStable = address(dai);
@@ -162,74 +273,199 @@ contract StrategyCurve2Pool is StrategyCurveBase {
         // if we have anything in the gauge, then harvest CRV from the gauge
         gaugeFactory.mint(address(gauge));
         uint256 _crvBal = crv.balanceOf(address(this));
-        if (_crvBal > 0) {
+        if (_crvBal > 0 && _crvBal >= minCrvToSell) {
             _sellToken(address(crv), _crvBal);
         }
 
+        // dust from either step stays here until there's enough to be worth the gas
         uint256 usdcBal = usdc.balanceOf(address(this));
         uint256 daiBal = dai.balanceOf(address(this));
-        if (usdcBal > 0 || daiBal > 0) {
-            curve.add_liquidity([usdcBal, daiBal], 0);
+        uint256 _stables = usdcBal * 1e12 + daiBal;
+        if (_stables > 0 && _stables >= minStablesToDeposit) {
+            curve.add_liquidity(_poolAmounts(usdcBal, daiBal), 0);
         }
 
-        uint256 stakedBal = stakedBalance();
-        if (_debtOutstanding > 0) {
-            if (stakedBal > 0) {
-                gauge.withdraw(Math.min(stakedBal, _debtOutstanding));
-            }
-            uint256 withdrawnBal = balanceOfWant();
-            _debtPayment = Math.min(stakedBal, _debtOutstanding);
-        }
-        uint256 assets = estimatedTotalAssets();
+        // work out everything we owe the vault first, so we only leave the gauge once and for exactly that much
+        uint256 _wantBal = balanceOfWant();
+        uint256 _stakedBal = stakedBalance();
+        uint256 assets = _wantBal + _stakedBal;
         uint256 debt = vault.strategies(address(this)).totalDebt;
 
         if (assets > debt) {
-            _profit = assets.sub(debt);
-            uint256 _wantBal = balanceOfWant();
-            if (_profit.add(_debtPayment) > _wantBal) {
-                liquidateAllPositions();
+            unchecked {
+                _profit = assets - debt;
             }
+            _debtPayment = _debtOutstanding;
         } else {
-            _loss = debt.sub(assets);
-        } // we're done harvesting, so reset our trigger if we used it
+            unchecked {
+                _loss = debt - assets;
+            }
+            _debtPayment = Math.min(_debtOutstanding, assets);
+        }
+
+        uint256 _needed = _profit + _debtPayment;
+        if (_needed > _wantBal) {
+            uint256 _toWithdraw;
+            unchecked {
+                // _needed > _wantBal
+                _toWithdraw = _needed - _wantBal;
+            }
+            // _needed never exceeds assets, so this is always covered by what we have staked
+            gauge.withdraw(_toWithdraw);
+        }
+
+        // we're done harvesting, so reset our trigger if we used it
         forceHarvestTriggerOnce = false;
     }
 
     function prepareMigration(address _newStrategy) internal override {
-        uint256 _stakedBal = stakedBalance();
-        if (_stakedBal > 0) {
-            gauge.withdraw(_stakedBal);
+        IGauge _gauge = gauge;
+        uint256 _stakedBal = _gauge.balanceOf(address(this));
+        if (_stakedBal == 0) {
+            return;
         }
+
+        // gauge tokens are transferable, so if the new strategy farms the same gauge we hand it our position
+        // instead of unstaking here and having its first harvest stake it all again
+        try StrategyCurve2Pool(_newStrategy).gauge() returns (
+            IGauge _newGauge
+        ) {
+            if (address(_newGauge) == address(_gauge)) {
+                try
+                    IERC20(address(_gauge)).transfer(_newStrategy, _stakedBal)
+                returns (bool _sent) {
+                    if (_sent) {
+                        return;
+                    }
+                } catch {}
+            }
+        } catch {}
+
+        // different gauge, not one of us, or a gauge that won't transfer: unstake and let migrate send want
+        _gauge.withdraw(_stakedBal);
     }
 
     function _sellToken(address token, uint256 amount) internal {
-        address[] memory path = new address[](3);
-        path[0] = address(token);
-        path[1] = address(wftm);
-        path[2] = address(targetStable);
         IUniswapV2Router02(spooky).swapExactTokensForTokens(
             amount,
             uint256(0),
-            path,
+            _sellPath(token),
             address(this),
             block.timestamp
         );
     }
 
+    // usdc and dai amounts in the order our pool lists its coins
+    function _poolAmounts(
+        uint256 _usdcAmount,
+        uint256 _daiAmount
+    ) internal view returns (uint256[2] memory _amounts) {
+        uint256 _usdcIndex = usdcIndex;
+        _amounts[_usdcIndex] = _usdcAmount;
+        _amounts[1 - _usdcIndex] = _daiAmount;
+    }
+
+    function _sellPath(
+        address token
+    ) internal view returns (address[] memory path) {
+        path = new address[](3);
+        path[0] = token;
+        path[1] = address(wftm);
+        path[2] = targetStable;
+    }
+
     // Sells our harvested CRV into the selected output, then WETH -> stables together with any WETH from rewards on UniV3
     /* ========== KEEP3RS ========== */
+    /**
+     * @notice Profit, in want, we expect the next harvest to report: CRV the gauge owes us plus what we hold,
+     *  quoted through Spooky to targetStable and into the 2pool, on top of anything we already hold above our
+     *  debt. Respects our dust thresholds the same way prepareReturn does.
+     */
+    function estimatedHarvestProfit() public view returns (uint256) {
+        uint256 _crvBal = crv.balanceOf(address(this)) + claimableCrv();
+        uint256 usdcBal = usdc.balanceOf(address(this));
+        uint256 daiBal = dai.balanceOf(address(this));
+        if (_crvBal > 0 && _crvBal >= minCrvToSell) {
+            uint256[] memory _amounts = IUniswapV2Router02(spooky)
+                .getAmountsOut(_crvBal, _sellPath(address(crv)));
+            if (targetStable == address(usdc)) {
+                usdcBal += _amounts[2];
+            } else {
+                daiBal += _amounts[2];
+            }
+        }
+
+        uint256 assets = estimatedTotalAssets();
+        uint256 _stables = usdcBal * 1e12 + daiBal;
+        if (_stables > 0 && _stables >= minStablesToDeposit) {
+            assets += curve.calc_token_amount(
+                _poolAmounts(usdcBal, daiBal),
+                true
+            );
+        }
+        uint256 debt = vault.strategies(address(this)).totalDebt;
+        if (assets > debt) {
+            unchecked {
+                return assets - debt;
+            }
+        }
+        return 0;
+    }
+
+    /**
+     * @notice CRV the gauge owes us right now. The child gauge's claimable_tokens checkpoints us first, so it
+     *  can't be called from a view; this walks the same weekly checkpoint math over its public state instead.
+     */
+    function claimableCrv() public view returns (uint256) {
+        IGauge _gauge = gauge;
+        uint256 _period = _gauge.period();
+        uint256 _periodTime = _gauge.period_timestamp(_period);
+        uint256 _invSupply = _gauge.integrate_inv_supply(_period);
+        uint256 _workingSupply = _gauge.working_supply();
+
+        if (block.timestamp > _periodTime && _workingSupply > 0) {
+            uint256 _prevWeekTime = _periodTime;
+            uint256 _weekTime = Math.min(
+                ((_periodTime + WEEK) / WEEK) * WEEK,
+                block.timestamp
+            );
+            for (uint256 i; i < 256; ++i) {
+                _invSupply +=
+                    (_gauge.inflation_rate(_prevWeekTime / WEEK) *
+                        1e18 *
+                        (_weekTime - _prevWeekTime)) /
+                    _workingSupply;
+                if (_weekTime == block.timestamp) {
+                    break;
+                }
+                _prevWeekTime = _weekTime;
+                _weekTime = Math.min(_weekTime + WEEK, block.timestamp);
+            }
+        }
+
+        uint256 _owed = _gauge.integrate_fraction(address(this)) +
+            (_gauge.working_balances(address(this)) *
+                (_invSupply - _gauge.integrate_inv_supply_of(address(this)))) /
+            1e18;
+        return _owed - gaugeFactory.minted(address(this), address(_gauge));
+    }
+
     // use this to determine when to harvest
     function harvestTrigger(
         uint256 callCostinEth
     ) public view override returns (bool) {
+        StrategyParams memory params = vault.strategies(address(this));
+
         // Should not trigger if strategy is not active (no assets and no debtRatio). This means we don't need to adjust keeper job.
-        if (!isActive()) {
+        // same as isActive(), but reusing the params we already have instead of asking the vault twice
+        if (params.debtRatio == 0 && estimatedTotalAssets() == 0) {
             return false;
         }
 
-        StrategyParams memory params = vault.strategies(address(this));
+        uint256 _sinceReport = block.timestamp - params.lastReport;
+
         // harvest no matter what once we reach our maxDelay
-        if (block.timestamp.sub(params.lastReport) > maxReportDelay) {
+        if (_sinceReport > maxReportDelay) {
             return true;
         }
 
@@ -243,11 +479,32 @@ contract StrategyCurve2Pool is StrategyCurveBase {
             return true;
         }
 
-        // harvest if we hit our minDelay, but only if our gas price is acceptable
-        if (block.timestamp.sub(params.lastReport) > minReportDelay) {
+        // only now walk the gauge's checkpoints for our profit. if the quote fails, fall back to time and credit.
+        uint256 _profit;
+        try this.estimatedHarvestProfit() returns (uint256 _estimate) {
+            _profit = _estimate;
+        } catch {}
+
+        // harvest if our profit is big enough that the call's cost doesn't matter
+        if (_profit > harvestProfitMax) {
             return true;
         }
 
+        // harvest if we hit our minDelay, but only if our gas price is acceptable and the profit pays for the call
+        // profitFactor times over. if the call can't be priced, profit doesn't trigger us.
+        if (_sinceReport > minReportDelay && _profit > harvestProfitMin) {
+            try this.ethToWant(callCostinEth) returns (uint256 _callCost) {
+                // _profit > profitFactor * _callCost, without the product overflowing. _profit > 0 here.
+                uint256 _profitFactor = profitFactor;
+                if (
+                    _profitFactor == 0 ||
+                    _callCost <= (_profit - 1) / _profitFactor
+                ) {
+                    return true;
+                }
+            } catch {}
+        }
+
         // harvest our credit if it's above our threshold
         if (vault.creditAvailable() > creditThreshold) {
             return true;
@@ -257,10 +514,28 @@ contract StrategyCurve2Pool is StrategyCurveBase {
         return false;
     }
 
-    // convert our keeper's eth cost into want, we don't need this anymore since we don't use baseStrategy harvestTrigger
+    // convert our keeper's eth cost into want: WFTM to targetStable on Spooky, then into the 2pool
     function ethToWant(
         uint256 _ethAmount
-    ) public view override returns (uint256) {}
+    ) public view override returns (uint256) {
+        if (_ethAmount == 0) {
+            return 0;
+        }
+        address[] memory path = new address[](2);
+        path[0] = address(wftm);
+        path[1] = targetStable;
+        uint256[] memory _amounts = IUniswapV2Router02(spooky).getAmountsOut(
+            _ethAmount,
+            path
+        );
+        return
+            curve.calc_token_amount(
+                targetStable == address(usdc)
+                    ? _poolAmounts(_amounts[1], 0)
+                    : _poolAmounts(0, _amounts[1]),
+                true
+            );
+    }
 
     /* ========== SETTERS ========== */
 
@@ -276,4 +551,33 @@ contract StrategyCurve2Pool is StrategyCurveBase {
             revert("incorrect token");
         }
     }
+
+    /**
+     * @notice Set our profit-based harvest trigger parameters.
+     * @param _harvestProfitMin Expected profit, in want, we need before minReportDelay can trigger a harvest.
+     * @param _harvestProfitMax Expected profit, in want, above which we harvest regardless of the call's cost.
+     * @param _creditThreshold Credit, in want, above which we harvest to take it.
+     * @param _profitFactor How many times over expected profit must cover the harvest call before minReportDelay
+     *  can trigger a harvest.
+     */
+    function setHarvestTriggerParams(
+        uint256 _harvestProfitMin,
+        uint256 _harvestProfitMax,
+        uint256 _creditThreshold,
+        uint256 _profitFactor
+    ) external onlyVaultManagers {
+        harvestProfitMin = _harvestProfitMin;
+        harvestProfitMax = _harvestProfitMax;
+        creditThreshold = _creditThreshold;
+        profitFactor = _profitFactor;
+    }
+
+    ///@notice Set the smallest CRV balance we'll sell and the smallest stable balance we'll deposit to Curve.
+    function setDustThresholds(
+        uint256 _minCrvToSell,
+        uint256 _minStablesToDeposit
+    ) external onlyVaultManagers {
+        minCrvToSell = _minCrvToSell;
+        minStablesToDeposit = _minStablesToDeposit;
+    }
 }
@@ -19,9 +19,36 @@ interface IGauge {
     ) external view returns (uint256);
 
     function withdraw(uint256) external;
+
+    function lp_token() external view returns (address);
+
+    // checkpoint state on child gauges, enough to work out claimable_tokens in a view
+    function period() external view returns (uint256);
+
+    function period_timestamp(uint256) external view returns (uint256);
+
+    function integrate_inv_supply(uint256) external view returns (uint256);
+
+    function integrate_inv_supply_of(address) external view returns (uint256);
+
+    function integrate_fraction(address) external view returns (uint256);
+
+    function inflation_rate(uint256 _week) external view returns (uint256);
+
+    function working_balances(address) external view returns (uint256);
+
+    function working_supply() external view returns (uint256);
 }
 
 interface ICurveFi {
+    function coins(uint256) external view returns (address);
+
+    function A() external view returns (uint256);
+
+    function fee() external view returns (uint256);
+
+    function admin_fee() external view returns (uint256);
+
     function get_virtual_price() external view returns (uint256);
 
     function add_liquidity(
@@ -61,4 +88,9 @@ interface ICurveFi {
 
 interface IGaugeFactory {
     function mint(address gauge) external;
+
+    function minted(
+        address _user,
+        address _gauge
+    ) external view returns (uint256);
 }
@@ -0,0 +1,322 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.8.15;
+
+import "@openzeppelin/contracts/token/ERC20/ERC20.sol";
+import { SafeERC20, IERC20 } from "@openzeppelin/contracts/token/ERC20/utils/SafeERC20.sol";
+import { IERC20Metadata } from "@openzeppelin/contracts/token/ERC20/extensions/IERC20Metadata.sol";
+
+// Two-coin StableSwap pool that is also its own LP token, like the Fantom 2pool. The math is a port
+// of Curve's plain pool template (A_PRECISION = 100) so quotes match the real pool's views.
+contract MockCurvePool is ERC20 {
+    using SafeERC20 for IERC20;
+
+    uint256 internal constant N_COINS = 2;
+    uint256 internal constant FEE_DENOMINATOR = 1e10;
+    uint256 internal constant PRECISION = 1e18;
+    uint256 internal constant A_PRECISION = 100;
+
+    address[2] internal poolCoins;
+    uint256[2] internal precisionMul;
+    uint256[2] public balances;
+
+    uint256 internal initialA; // in A_PRECISION units
+    uint256 public fee; // out of FEE_DENOMINATOR
+    uint256 public admin_fee; // out of FEE_DENOMINATOR
+
+    constructor() ERC20("", "") {}
+
+    function initialize(
+        address[2] memory _coins,
+        uint256 _A,
+        uint256 _fee,
+        uint256 _adminFee
+    ) external {
+        require(initialA == 0, "initialized");
+        for (uint256 i = 0; i < N_COINS; i++) {
+            poolCoins[i] = _coins[i];
+            precisionMul[i] =
+                10 ** (18 - uint256(IERC20Metadata(_coins[i]).decimals()));
+        }
+        initialA = _A * A_PRECISION;
+        fee = _fee;
+        admin_fee = _adminFee;
+    }
+
+    function name() public pure override returns (string memory) {
+        return "Curve.fi DAI/USDC";
+    }
+
+    function symbol() public pure override returns (string memory) {
+        return "DAI+USDC";
+    }
+
+    /* ========== VIEWS ========== */
+
+    function coins(uint256 i) external view returns (address) {
+        return poolCoins[i];
+    }
+
+    function A() external view returns (uint256) {
+        return initialA / A_PRECISION;
+    }
+
+    function A_precise() external view returns (uint256) {
+        return initialA;
+    }
+
+    function get_virtual_price() external view returns (uint256) {
+        uint256 D = _getD(_xp(balances), initialA);
+        return (D * PRECISION) / totalSupply();
+    }
+
+    function calc_token_amount(
+        uint256[2] calldata _amounts,
+        bool _is_deposit
+    ) external view returns (uint256) {
+        uint256 amp = initialA;
+        uint256[2] memory _balances = balances;
+        uint256 D0 = _getD(_xp(_balances), amp);
+        for (uint256 i = 0; i < N_COINS; i++) {
+            if (_is_deposit) {
+                _balances[i] += _amounts[i];
+            } else {
+                _balances[i] -= _amounts[i];
+            }
+        }
+        uint256 D1 = _getD(_xp(_balances), amp);
+        uint256 diff = _is_deposit ? D1 - D0 : D0 - D1;
+        return (diff * totalSupply()) / D0;
+    }
+
+    function get_dy(
+        int128 i,
+        int128 j,
+        uint256 _dx
+    ) external view returns (uint256) {
+        (uint256 dy, ) = _getDy(uint256(uint128(i)), uint256(uint128(j)), _dx);
+        return dy;
+    }
+
+    function calc_withdraw_one_coin(
+        uint256 _token_amount,
+        int128 i
+    ) external view returns (uint256) {
+        (uint256 dy, ) = _calcWithdrawOneCoin(
+            _token_amount,
+            uint256(uint128(i))
+        );
+        return dy;
+    }
+
+    /* ========== MUTATIVE FUNCTIONS ========== */
+
+    function add_liquidity(
+        uint256[2] calldata _amounts,
+        uint256 _min_mint_amount
+    ) external returns (uint256 mintAmount) {
+        uint256 amp = initialA;
+        uint256 supply = totalSupply();
+        uint256[2] memory oldBalances = balances;
+        uint256 D0;
+        if (supply > 0) {
+            D0 = _getD(_xp(oldBalances), amp);
+        }
+
+        // memory arrays assign by reference, so copy element-wise
+        uint256[2] memory newBalances;
+        for (uint256 i = 0; i < N_COINS; i++) {
+            if (supply == 0) {
+                require(_amounts[i] > 0, "initial deposit requires all coins");
+            }
+            newBalances[i] = oldBalances[i] + _amounts[i];
+        }
+        uint256 D1 = _getD(_xp(newBalances), amp);
+        require(D1 > D0, "D1 <= D0");
+
+        if (supply > 0) {
+            uint256 _fee = (fee * N_COINS) / (4 * (N_COINS - 1));
+            for (uint256 i = 0; i < N_COINS; i++) {
+                uint256 idealBalance = (D1 * oldBalances[i]) / D0;
+                uint256 difference = idealBalance > newBalances[i]
+                    ? idealBalance - newBalances[i]
+                    : newBalances[i] - idealBalance;
+                uint256 coinFee = (_fee * difference) / FEE_DENOMINATOR;
+                balances[i] =
+                    newBalances[i] -
+                    ((coinFee * admin_fee) / FEE_DENOMINATOR);
+                newBalances[i] -= coinFee;
+            }
+            uint256 D2 = _getD(_xp(newBalances), amp);
+            mintAmount = (supply * (D2 - D0)) / D0;
+        } else {
+            balances = newBalances;
+            mintAmount = D1;
+        }
+        require(mintAmount >= _min_mint_amount, "Slippage screwed you");
+
+        for (uint256 i = 0; i < N_COINS; i++) {
+            if (_amounts[i] > 0) {
+                IERC20(poolCoins[i]).safeTransferFrom(
+                    msg.sender,
+                    address(this),
+                    _amounts[i]
+                );
+            }
+        }
+        _mint(msg.sender, mintAmount);
+    }
+
+    function exchange(
+        int128 i,
+        int128 j,
+        uint256 _dx,
+        uint256 _min_dy
+    ) external returns (uint256 dy) {
+        uint256 _i = uint256(uint128(i));
+        uint256 _j = uint256(uint128(j));
+        uint256 dyFee;
+        (dy, dyFee) = _getDy(_i, _j, _dx);
+        require(dy >= _min_dy, "Exchange resulted in fewer coins than expected");
+
+        uint256 dyAdminFee = (dyFee * admin_fee) /
+            FEE_DENOMINATOR /
+            precisionMul[_j];
+        balances[_i] += _dx;
+        balances[_j] -= dy + dyAdminFee;
+
+        IERC20(poolCoins[_i]).safeTransferFrom(msg.sender, address(this), _dx);
+        IERC20(poolCoins[_j]).safeTransfer(msg.sender, dy);
+    }
+
+    function remove_liquidity(
+        uint256 _amount,
+        uint256[2] calldata _min_amounts
+    ) external {
+        uint256 supply = totalSupply();
+        for (uint256 i = 0; i < N_COINS; i++) {
+            uint256 value = (balances[i] * _amount) / supply;
+            require(
+                value >= _min_amounts[i],
+                "Withdrawal resulted in fewer coins than expected"
+            );
+            balances[i] -= value;
+            IERC20(poolCoins[i]).safeTransfer(msg.sender, value);
+        }
+        _burn(msg.sender, _amount);
+    }
+
+    function remove_liquidity_one_coin(
+        uint256 _token_amount,
+        int128 i,
+        uint256 _min_amount
+    ) external {
+        uint256 _i = uint256(uint128(i));
+        (uint256 dy, uint256 dyFee) = _calcWithdrawOneCoin(_token_amount, _i);
+        require(dy >= _min_amount, "Not enough coins removed");
+
+        balances[_i] -= dy + ((dyFee * admin_fee) / FEE_DENOMINATOR);
+        _burn(msg.sender, _token_amount);
+        IERC20(poolCoins[_i]).safeTransfer(msg.sender, dy);
+    }
+
+    /* ========== STABLESWAP MATH ========== */
+
+    function _xp(
+        uint256[2] memory _balances
+    ) internal view returns (uint256[2] memory xp) {
+        for (uint256 i = 0; i < N_COINS; i++) {
+            xp[i] = _balances[i] * precisionMul[i];
+        }
+    }
+
+    function _getD(
+        uint256[2] memory xp,
+        uint256 amp
+    ) internal pure returns (uint256) {
+        uint256 S = xp[0] + xp[1];
+        if (S == 0) {
+            return 0;
+        }
+
+        uint256 D = S;
+        uint256 Ann = amp * N_COINS;
+        for (uint256 _i = 0; _i < 255; _i++) {
+            uint256 D_P = D;
+            for (uint256 k = 0; k < N_COINS; k++) {
+                D_P = (D_P * D) / (xp[k] * N_COINS);
+            }
+            uint256 Dprev = D;
+            D =
+                (((Ann * S) / A_PRECISION + D_P * N_COINS) * D) /
+                (((Ann - A_PRECISION) * D) / A_PRECISION + (N_COINS + 1) * D_P);
+            if (D > Dprev ? D - Dprev <= 1 : Dprev - D <= 1) {
+                return D;
+            }
+        }
+        revert("D did not converge");
+    }
+
+    // solve for the balance of coin j given the balance x of the other coin, for a fixed D
+    function _getYD(
+        uint256 amp,
+        uint256 x,
+        uint256 D
+    ) internal pure returns (uint256) {
+        uint256 Ann = amp * N_COINS;
+        uint256 c = (D * D) / (x * N_COINS);
+        c = (c * D * A_PRECISION) / (Ann * N_COINS);
+        uint256 b = x + (D * A_PRECISION) / Ann;
+
+        uint256 y = D;
+        for (uint256 _i = 0; _i < 255; _i++) {
+            uint256 yPrev = y;
+            y = (y * y + c) / (2 * y + b - D);
+            if (y > yPrev ? y - yPrev <= 1 : yPrev - y <= 1) {
+                return y;
+            }
+        }
+        revert("y did not converge");
+    }
+
+    function _getDy(
+        uint256 i,
+        uint256 j,
+        uint256 _dx
+    ) internal view returns (uint256 dy, uint256 dyFee) {
+        uint256 amp = initialA;
+        uint256[2] memory xp = _xp(balances);
+        uint256 D = _getD(xp, amp);
+        uint256 x = xp[i] + _dx * precisionMul[i];
+        uint256 y = _getYD(amp, x, D);
+        dy = xp[j] - y - 1;
+        dyFee = (dy * fee) / FEE_DENOMINATOR;
+        dy = (dy - dyFee) / precisionMul[j];
+    }
+
+    function _calcWithdrawOneCoin(
+        uint256 _token_amount,
+        uint256 i
+    ) internal view returns (uint256 dy, uint256 dyFee) {
+        uint256 amp = initialA;
+        uint256[2] memory xp = _xp(balances);
+        uint256 D0 = _getD(xp, amp);
+        uint256 D1 = D0 - (_token_amount * D0) / totalSupply();
+        uint256 j = 1 - i;
+        uint256 newY = _getYD(amp, xp[j], D1);
+
+        uint256 _fee = (fee * N_COINS) / (4 * (N_COINS - 1));
+        uint256[2] memory xpReduced;
+        xpReduced[i] =
+            xp[i] -
+            (_fee * (((xp[i] * D1) / D0) - newY)) /
+            FEE_DENOMINATOR;
+        xpReduced[j] =
+            xp[j] -
+            (_fee * (xp[j] - ((xp[j] * D1) / D0))) /
+            FEE_DENOMINATOR;
+
+        dy = (xpReduced[i] - _getYD(amp, xpReduced[j], D1) - 1) / precisionMul[i];
+        uint256 dy0 = (xp[i] - newY) / precisionMul[i];
+        dyFee = dy0 - dy;
+    }
+}
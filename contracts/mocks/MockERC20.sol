@@ -0,0 +1,46 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.8.15;
+
+import "@openzeppelin/contracts/token/ERC20/ERC20.sol";
+
+// Mintable token used in place of CRV, WFTM, USDC and DAI on a local chain. Metadata lives in
+// storage (not the constructor) so the runtime code can be etched at the real token address.
+contract MockERC20 is ERC20 {
+    string internal mockName;
+    string internal mockSymbol;
+    uint8 internal mockDecimals;
+
+    constructor() ERC20("", "") {}
+
+    function initialize(
+        string memory _name,
+        string memory _symbol,
+        uint8 _decimals
+    ) external {
+        require(mockDecimals == 0, "initialized");
+        mockName = _name;
+        mockSymbol = _symbol;
+        mockDecimals = _decimals;
+    }
+
+    function name() public view override returns (string memory) {
+        return mockName;
+    }
+
+    function symbol() public view override returns (string memory) {
+        return mockSymbol;
+    }
+
+    function decimals() public view override returns (uint8) {
+        return mockDecimals;
+    }
+
+    ///@notice Anyone can mint, this is only ever deployed on a local dev chain.
+    function mint(address _to, uint256 _amount) external {
+        _mint(_to, _amount);
+    }
+
+    function burn(address _from, uint256 _amount) external {
+        _burn(_from, _amount);
+    }
+}
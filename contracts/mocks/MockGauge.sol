@@ -0,0 +1,136 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.8.15;
+
+import "@openzeppelin/contracts/token/ERC20/ERC20.sol";
+import { SafeERC20, IERC20 } from "@openzeppelin/contracts/token/ERC20/utils/SafeERC20.sol";
+
+interface IMockGaugeFactory {
+    function minted(address, address) external view returns (uint256);
+}
+
+// Tokenized gauge that streams a configurable amount of CRV per second to stakers pro-rata. CRV is
+// never held here; like Curve's child gauges we only track integrate_fraction, and the factory mints.
+// Checkpoints are kept per period with the same public getters as the child gauge, so the strategy can
+// work out what it's owed without calling claimable_tokens.
+contract MockGauge is ERC20 {
+    using SafeERC20 for IERC20;
+
+    address public lp_token;
+    address public factory;
+
+    uint256 public emissionRate; // CRV per second across all stakers
+    uint256 public period;
+    mapping(uint256 => uint256) public period_timestamp;
+    mapping(uint256 => uint256) public integrate_inv_supply; // CRV per gauge token at each period, scaled by 1e18
+    mapping(address => uint256) public integrate_inv_supply_of;
+    mapping(address => uint256) public integrate_fraction;
+
+    constructor() ERC20("", "") {}
+
+    function initialize(address _lpToken, address _factory) external {
+        require(lp_token == address(0), "initialized");
+        lp_token = _lpToken;
+        factory = _factory;
+        period_timestamp[0] = block.timestamp;
+    }
+
+    function name() public pure override returns (string memory) {
+        return "Curve.fi DAI/USDC Gauge Deposit";
+    }
+
+    function symbol() public pure override returns (string memory) {
+        return "2CRV-gauge";
+    }
+
+    /* ========== VIEWS ========== */
+
+    // the rate only changes at a checkpoint, so it's the same for every week since the last one
+    function inflation_rate(uint256) external view returns (uint256) {
+        return emissionRate;
+    }
+
+    // no boosts here
+    function working_balances(address _addr) external view returns (uint256) {
+        return balanceOf(_addr);
+    }
+
+    function working_supply() external view returns (uint256) {
+        return totalSupply();
+    }
+
+    function claimable_tokens(address _addr) external view returns (uint256) {
+        uint256 _invSupply = integrate_inv_supply[period] + _pendingInvSupply();
+        uint256 _fraction = integrate_fraction[_addr] +
+            (balanceOf(_addr) * (_invSupply - integrate_inv_supply_of[_addr])) /
+            1e18;
+        return _fraction - IMockGaugeFactory(factory).minted(_addr, address(this));
+    }
+
+    function claimable_reward(address, address) external pure returns (uint256) {
+        return 0;
+    }
+
+    /* ========== MUTATIVE FUNCTIONS ========== */
+
+    function deposit(uint256 _value) external {
+        _mint(msg.sender, _value);
+        IERC20(lp_token).safeTransferFrom(msg.sender, address(this), _value);
+    }
+
+    function withdraw(uint256 _value) external {
+        _burn(msg.sender, _value);
+        IERC20(lp_token).safeTransfer(msg.sender, _value);
+    }
+
+    function user_checkpoint(address _addr) external returns (bool) {
+        _checkpoint(_addr);
+        return true;
+    }
+
+    function claim_rewards() external {}
+
+    ///@notice Set how much CRV per second the gauge emits. Accrues at the old rate first.
+    function setEmissionRate(uint256 _rate) external {
+        _checkpoint(address(0));
+        emissionRate = _rate;
+    }
+
+    /* ========== INTERNAL ========== */
+
+    function _pendingInvSupply() internal view returns (uint256) {
+        uint256 _supply = totalSupply();
+        uint256 _lastCheckpoint = period_timestamp[period];
+        if (_supply == 0 || block.timestamp <= _lastCheckpoint) {
+            return 0;
+        }
+        return
+            (emissionRate * (block.timestamp - _lastCheckpoint) * 1e18) /
+            _supply;
+    }
+
+    function _checkpoint(address _addr) internal {
+        uint256 _invSupply = integrate_inv_supply[period] + _pendingInvSupply();
+        if (block.timestamp > period_timestamp[period]) {
+            period += 1;
+            period_timestamp[period] = block.timestamp;
+            integrate_inv_supply[period] = _invSupply;
+        }
+        if (_addr != address(0)) {
+            integrate_fraction[_addr] +=
+                (balanceOf(_addr) *
+                    (_invSupply - integrate_inv_supply_of[_addr])) /
+                1e18;
+            integrate_inv_supply_of[_addr] = _invSupply;
+        }
+    }
+
+    // checkpoint both sides before any balance moves, this covers deposit, withdraw and transfers
+    function _beforeTokenTransfer(
+        address _from,
+        address _to,
+        uint256
+    ) internal override {
+        _checkpoint(_from);
+        _checkpoint(_to);
+    }
+}
@@ -0,0 +1,31 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.8.15;
+
+import { MockERC20 } from "./MockERC20.sol";
+
+interface IMockGauge {
+    function user_checkpoint(address) external returns (bool);
+
+    function integrate_fraction(address) external view returns (uint256);
+}
+
+// Stand-in for Curve's child gauge factory: mints whatever CRV a gauge says the caller has earned.
+contract MockGaugeFactory {
+    address public crv;
+    mapping(address => mapping(address => uint256)) public minted; // user => gauge => amount
+
+    function initialize(address _crv) external {
+        require(crv == address(0), "initialized");
+        crv = _crv;
+    }
+
+    function mint(address _gauge) external {
+        IMockGauge(_gauge).user_checkpoint(msg.sender);
+        uint256 _total = IMockGauge(_gauge).integrate_fraction(msg.sender);
+        uint256 _toMint = _total - minted[msg.sender][_gauge];
+        if (_toMint > 0) {
+            minted[msg.sender][_gauge] = _total;
+            MockERC20(crv).mint(msg.sender, _toMint);
+        }
+    }
+}
@@ -0,0 +1,145 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.8.15;
+
+import { MockERC20 } from "./MockERC20.sol";
+import { SafeERC20, IERC20 } from "@openzeppelin/contracts/token/ERC20/utils/SafeERC20.sol";
+
+// Holds reserves for one token pair so off-chain readers can use the usual factory -> pair -> getReserves path.
+contract MockPair {
+    address public immutable router;
+    address public immutable token0;
+    address public immutable token1;
+    uint112 internal reserve0;
+    uint112 internal reserve1;
+    uint32 internal blockTimestampLast;
+
+    constructor(address _tokenA, address _tokenB) {
+        router = msg.sender;
+        (token0, token1) = _tokenA < _tokenB
+            ? (_tokenA, _tokenB)
+            : (_tokenB, _tokenA);
+    }
+
+    function getReserves() external view returns (uint112, uint112, uint32) {
+        return (reserve0, reserve1, blockTimestampLast);
+    }
+
+    function sync(uint256 _reserve0, uint256 _reserve1) external {
+        require(msg.sender == router, "!router");
+        reserve0 = uint112(_reserve0);
+        reserve1 = uint112(_reserve1);
+        blockTimestampLast = uint32(block.timestamp);
+    }
+}
+
+// UniswapV2-style router with SpookySwap's 0.2% fee. It is also its own factory. Swaps pull the input
+// token and mint the output token, so pairs only need to track reserves, not hold balances.
+contract MockRouter {
+    using SafeERC20 for IERC20;
+
+    mapping(address => mapping(address => address)) public getPair;
+
+    function factory() external view returns (address) {
+        return address(this);
+    }
+
+    ///@notice Create the pair if needed and set its reserves, amounts are given in (tokenA, tokenB) order.
+    function setReserves(
+        address _tokenA,
+        address _tokenB,
+        uint256 _reserveA,
+        uint256 _reserveB
+    ) external {
+        address pair = getPair[_tokenA][_tokenB];
+        if (pair == address(0)) {
+            pair = address(new MockPair(_tokenA, _tokenB));
+            getPair[_tokenA][_tokenB] = pair;
+            getPair[_tokenB][_tokenA] = pair;
+        }
+        if (MockPair(pair).token0() == _tokenA) {
+            MockPair(pair).sync(_reserveA, _reserveB);
+        } else {
+            MockPair(pair).sync(_reserveB, _reserveA);
+        }
+    }
+
+    /* ========== VIEWS ========== */
+
+    function getReserves(
+        address _tokenA,
+        address _tokenB
+    ) public view returns (uint256 reserveA, uint256 reserveB) {
+        address pair = getPair[_tokenA][_tokenB];
+        require(pair != address(0), "no pair");
+        (uint112 reserve0, uint112 reserve1, ) = MockPair(pair).getReserves();
+        (reserveA, reserveB) = MockPair(pair).token0() == _tokenA
+            ? (uint256(reserve0), uint256(reserve1))
+            : (uint256(reserve1), uint256(reserve0));
+    }
+
+    function getAmountOut(
+        uint256 _amountIn,
+        uint256 _reserveIn,
+        uint256 _reserveOut
+    ) public pure returns (uint256) {
+        require(_amountIn > 0, "INSUFFICIENT_INPUT_AMOUNT");
+        require(_reserveIn > 0 && _reserveOut > 0, "INSUFFICIENT_LIQUIDITY");
+        uint256 amountInWithFee = _amountIn * 998;
+        return
+            (amountInWithFee * _reserveOut) /
+            (_reserveIn * 1000 + amountInWithFee);
+    }
+
+    function getAmountsOut(
+        uint256 _amountIn,
+        address[] memory _path
+    ) public view returns (uint256[] memory amounts) {
+        require(_path.length >= 2, "INVALID_PATH");
+        amounts = new uint256[](_path.length);
+        amounts[0] = _amountIn;
+        for (uint256 i = 0; i < _path.length - 1; i++) {
+            (uint256 reserveIn, uint256 reserveOut) = getReserves(
+                _path[i],
+                _path[i + 1]
+            );
+            amounts[i + 1] = getAmountOut(amounts[i], reserveIn, reserveOut);
+        }
+    }
+
+    /* ========== MUTATIVE FUNCTIONS ========== */
+
+    function swapExactTokensForTokens(
+        uint256 _amountIn,
+        uint256 _amountOutMin,
+        address[] calldata _path,
+        address _to,
+        uint256 _deadline
+    ) external returns (uint256[] memory amounts) {
+        require(_deadline >= block.timestamp, "EXPIRED");
+        amounts = getAmountsOut(_amountIn, _path);
+        require(
+            amounts[amounts.length - 1] >= _amountOutMin,
+            "INSUFFICIENT_OUTPUT_AMOUNT"
+        );
+        IERC20(_path[0]).safeTransferFrom(msg.sender, address(this), _amountIn);
+
+        for (uint256 i = 0; i < _path.length - 1; i++) {
+            (uint256 reserveIn, uint256 reserveOut) = getReserves(
+                _path[i],
+                _path[i + 1]
+            );
+            address pair = getPair[_path[i]][_path[i + 1]];
+            uint256 newIn = reserveIn + amounts[i];
+            uint256 newOut = reserveOut - amounts[i + 1];
+            if (MockPair(pair).token0() == _path[i]) {
+                MockPair(pair).sync(newIn, newOut);
+            } else {
+                MockPair(pair).sync(newOut, newIn);
+            }
+        }
+        MockERC20(_path[_path.length - 1]).mint(
+            _to,
+            amounts[amounts.length - 1]
+        );
+    }
+}
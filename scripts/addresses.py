@@ -0,0 +1,13 @@
+# Fantom addresses StrategyCurve2Pool hardcodes (the tokens) or is deployed with (pool, gauge, gauge factory,
+# router). Keep in sync with contracts/StrategyCurve2Pool.sol.
+CRV = "0x1E4F97b9f9F913c46F1632781732927B9019C68b"
+WFTM = "0x21be370D5312f44cB42ce377BC9b8a0cEF1A4C83"
+USDC = "0x04068DA6C83AFCFA0e13ba15A6696662335D5B75"
+DAI = "0x8D11eC38a3EB5E956B052f67Da8Bdc9bef8Abf3E"
+CURVE_POOL = "0x27E611FD27b276ACbd5Ffd632E5eAEBEC9761E40"
+GAUGE = "0x15bB164F9827De760174d3d3dAD6816eF50dE13c"
+GAUGE_FACTORY = "0xabC000d88f23Bb45525E447528DBF656A9D55bf5"
+SPOOKY = "0xF491e7B69E4244ad4002BC14e878a34207E38c29"
+
+# setOptimal index for each stable
+OPTIMAL = {DAI: 0, USDC: 1}
@@ -0,0 +1,141 @@
+"""
+Gas flamegraphs from harvest call traces.
+
+Every step of a transaction's trace is charged to the stack of functions it ran in: external calls
+(gaugeFactory.mint, the Spooky swap, curve.add_liquidity, gauge.withdraw, vault.report) as well as our
+own internal functions (prepareReturn, _sellToken, ...). Stacks are summed across as many transactions
+as we like and written in the collapsed format ("a;b;c gas" per line), which flamegraph.pl, inferno or
+speedscope turn into a flamegraph.
+
+Traces need debug_traceTransaction, so use a local or forked chain. Run against transactions already
+mined with `brownie run gas_flamegraph --network ftm-main-fork`, or set GAS_FLAMEGRAPH=<file> when
+running the tests to collect every harvest they send.
+"""
+import os
+from collections import Counter
+
+import click
+from brownie import chain
+from hexbytes import HexBytes
+
+CALL_OPS = {"CALL", "CALLCODE", "DELEGATECALL", "STATICCALL", "CREATE", "CREATE2"}
+
+# what a transaction pays before its first step: the base cost and its calldata. harvests carry no access list
+INTRINSIC = "<intrinsic>"
+TX_BASE_GAS = 21_000
+ZERO_BYTE_GAS = 4
+NONZERO_BYTE_GAS = 16
+
+# what it gets back at the end for clearing storage, kept as its own (negative) frame so it's never hidden in
+# another one. since London the refund is capped at a fifth of the gas used.
+REFUND = "<refund>"
+MAX_REFUND_QUOTIENT = 5
+
+
+def _frame(step):
+    return step.get("fn") or step["address"]
+
+
+def _call_cost(trace, i):
+    """Gas a call opcode costs the caller itself, leaving out what the callee spends."""
+    step = trace[i]
+    back = next(
+        (j for j in range(i + 1, len(trace)) if trace[j]["depth"] <= step["depth"]),
+        None,
+    )
+    if back is None:
+        # the call was the last thing we did, nothing left to measure against
+        return step["gasCost"]
+    total = step["gas"] - trace[back]["gas"]
+    if back == i + 1:
+        # precompile or a call to an account without code, no steps of its own
+        return total
+    last = trace[back - 1]
+    spent_inside = trace[i + 1]["gas"] - (last["gas"] - last["gasCost"])
+    return total - spent_inside
+
+
+def intrinsic_gas(tx):
+    """Gas tx paid before its first step: 21k plus 4 per zero and 16 per non-zero byte of calldata."""
+    data = HexBytes(tx.input)
+    zeros = data.count(0)
+    return TX_BASE_GAS + ZERO_BYTE_GAS * zeros + NONZERO_BYTE_GAS * (len(data) - zeros)
+
+
+def refund_gas(tx, spent):
+    """Gas refunded to tx at the end, where spent is what it used before the refund."""
+    counter = tx.trace[-1].get("refund")
+    if counter is None:
+        # ganache's steps don't carry the refund counter, so all we can say is what spent and gas_used differ by
+        return spent - tx.gas_used
+    if isinstance(counter, str):
+        counter = int(counter, 16)
+    return min(counter, spent // MAX_REFUND_QUOTIENT)
+
+
+def collapse(tx):
+    """Gas charged to each call stack in tx, as a Counter of ";"-joined stacks."""
+    trace = tx.trace
+    stacks = Counter()
+    # frames[depth] holds the internal function stack for the contract at that call depth
+    frames = []
+    for i, step in enumerate(trace):
+        depth, jump_depth = step["depth"], step["jumpDepth"]
+        del frames[depth + 1 :]
+        if len(frames) <= depth:
+            frames.append([])
+        internal = frames[depth]
+        del internal[jump_depth + 1 :]
+        internal.extend([None] * (jump_depth + 1 - len(internal)))
+        internal[jump_depth] = _frame(step)
+
+        stack = ";".join(fn for level in frames for fn in level if fn is not None)
+        if step["op"] in CALL_OPS:
+            stacks[stack] += _call_cost(trace, i)
+        else:
+            stacks[stack] += step["gasCost"]
+
+    executed = sum(stacks.values())
+    stacks[INTRINSIC] = intrinsic_gas(tx)
+    stacks[REFUND] = -refund_gas(tx, stacks[INTRINSIC] + executed)
+    return stacks
+
+
+class GasFlamegraph:
+    """Collapsed gas stacks summed over any number of transactions."""
+
+    def __init__(self):
+        self.stacks = Counter()
+        self.transactions = 0
+
+    def add(self, tx):
+        self.stacks.update(collapse(tx))
+        self.transactions += 1
+
+    def hottest(self, count=10):
+        """The count leaf frames (self gas, not including children) we spent the most on."""
+        leaves = Counter()
+        for stack, gas in self.stacks.items():
+            leaves[stack.split(";")[-1]] += gas
+        return leaves.most_common(count)
+
+    def write(self, path):
+        with open(path, "w") as fp:
+            for stack, gas in sorted(self.stacks.items()):
+                if gas > 0:
+                    fp.write(f"{stack} {gas}\n")
+
+
+def main():
+    hashes = os.environ.get("TXS") or click.prompt(
+        "Harvest tx hashes (comma separated)"
+    )
+    out = os.environ.get("OUT", "harvest.folded")
+    flamegraph = GasFlamegraph()
+    for tx_hash in hashes.split(","):
+        flamegraph.add(chain.get_transaction(tx_hash.strip()))
+    flamegraph.write(out)
+
+    print(f"Wrote {out} from {flamegraph.transactions} transactions, hottest frames:")
+    for frame, gas in flamegraph.hottest():
+        print(f"{gas:>12,}  {frame}")
@@ -0,0 +1,198 @@
+"""
+Off-chain replica of StrategyCurve2Pool.harvestTrigger for keepers polling many strategies every block.
+
+Everything the on-chain view reads (vault.strategies, estimatedHarvestProfit, isBaseFeeAcceptable,
+forceHarvestTriggerOnce, the report delays, our profit limits, what the call costs in want,
+creditAvailable and creditThreshold) is fetched for all strategies, along with the block timestamp, in
+one multicall. The same checks then run locally, in the same order, and also tell
+us which one fired.
+"""
+from brownie import Contract, interface, multicall
+
+# why harvest_trigger returned what it did, in the order the contract checks them
+INACTIVE = "inactive"
+MAX_REPORT_DELAY = "maxReportDelay"
+BASE_FEE = "baseFee"
+FORCE_HARVEST = "forceHarvestTriggerOnce"
+MAX_PROFIT = "harvestProfitMax"
+MIN_REPORT_DELAY = "minReportDelay"
+CREDIT_THRESHOLD = "creditThreshold"
+NOTHING = "nothing"
+
+# only the two vault views we need, so we don't depend on an explorer for the vault ABI
+VAULT_ABI = [
+    {
+        "name": "strategies",
+        "inputs": [{"name": "arg0", "type": "address"}],
+        "outputs": [
+            {"name": "performanceFee", "type": "uint256"},
+            {"name": "activation", "type": "uint256"},
+            {"name": "debtRatio", "type": "uint256"},
+            {"name": "minDebtPerHarvest", "type": "uint256"},
+            {"name": "maxDebtPerHarvest", "type": "uint256"},
+            {"name": "lastReport", "type": "uint256"},
+            {"name": "totalDebt", "type": "uint256"},
+            {"name": "totalGain", "type": "uint256"},
+            {"name": "totalLoss", "type": "uint256"},
+        ],
+        "stateMutability": "view",
+        "type": "function",
+    },
+    {
+        "name": "creditAvailable",
+        "inputs": [{"name": "strategy", "type": "address"}],
+        "outputs": [{"name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+]
+
+
+class TriggerInputs:
+    """Everything harvestTrigger reads for one strategy at one block."""
+
+    __slots__ = (
+        "debt_ratio",
+        "total_assets",
+        "last_report",
+        "max_report_delay",
+        "min_report_delay",
+        "estimated_profit",
+        "harvest_profit_min",
+        "harvest_profit_max",
+        "profit_factor",
+        "call_cost_in_want",
+        "base_fee_acceptable",
+        "force_harvest_trigger_once",
+        "credit_available",
+        "credit_threshold",
+    )
+
+    def __init__(self, **values):
+        for name, value in values.items():
+            setattr(self, name, value)
+
+
+def harvest_trigger(inputs, timestamp):
+    """Same checks, same order as the contract. Returns (should_harvest, reason)."""
+    # isActive()
+    if inputs.debt_ratio == 0 and inputs.total_assets == 0:
+        return False, INACTIVE
+
+    since_report = timestamp - inputs.last_report
+    if since_report > inputs.max_report_delay:
+        return True, MAX_REPORT_DELAY
+
+    if not inputs.base_fee_acceptable:
+        return False, BASE_FEE
+
+    if inputs.force_harvest_trigger_once:
+        return True, FORCE_HARVEST
+
+    if inputs.estimated_profit > inputs.harvest_profit_max:
+        return True, MAX_PROFIT
+
+    # a call we couldn't price (None) never triggers on profit, same as the contract
+    if (
+        since_report > inputs.min_report_delay
+        and inputs.estimated_profit > inputs.harvest_profit_min
+        and inputs.call_cost_in_want is not None
+        and inputs.estimated_profit > inputs.profit_factor * inputs.call_cost_in_want
+    ):
+        return True, MIN_REPORT_DELAY
+
+    if inputs.credit_available > inputs.credit_threshold:
+        return True, CREDIT_THRESHOLD
+
+    return False, NOTHING
+
+
+class HarvestTriggerPoller:
+    """Batches harvestTrigger inputs for a set of strategies into one multicall per block."""
+
+    def __init__(self, strategies):
+        self.strategies = list(strategies)
+        # a strategy's vault never changes, look it up once
+        self.vaults = [
+            Contract.from_abi("Vault", strategy.vault(), VAULT_ABI)
+            for strategy in self.strategies
+        ]
+
+    def read(self, block_identifier=None, call_cost=0):
+        """
+        Read the block timestamp and inputs for every strategy in a single multicall. call_cost is what
+        the harvest will cost us, in FTM, same as harvestTrigger's callCostinEth.
+        """
+        with multicall(block_identifier=block_identifier) as batch:
+            timestamp = interface.Multicall2(batch.address).getCurrentBlockTimestamp()
+            raw = [
+                (
+                    vault.strategies(strategy),
+                    strategy.estimatedTotalAssets(),
+                    strategy.maxReportDelay(),
+                    strategy.minReportDelay(),
+                    strategy.estimatedHarvestProfit(),
+                    strategy.harvestProfitMin(),
+                    strategy.harvestProfitMax(),
+                    strategy.profitFactor(),
+                    strategy.ethToWant(call_cost),
+                    strategy.isBaseFeeAcceptable(),
+                    strategy.forceHarvestTriggerOnce(),
+                    vault.creditAvailable(strategy),
+                    strategy.creditThreshold(),
+                )
+                for strategy, vault in zip(self.strategies, self.vaults)
+            ]
+        inputs = [
+            TriggerInputs(
+                debt_ratio=int(params[2]),
+                total_assets=int(total_assets),
+                last_report=int(params[5]),
+                max_report_delay=int(max_delay),
+                min_report_delay=int(min_delay),
+                # harvestTrigger counts a failed estimate as no profit, and so does a failed call in the batch
+                estimated_profit=int(profit or 0),
+                harvest_profit_min=int(profit_min),
+                harvest_profit_max=int(profit_max),
+                profit_factor=int(profit_factor),
+                # batch results are proxies, a reverted quote is one wrapping None
+                call_cost_in_want=None
+                if call_cost_in_want.__wrapped__ is None
+                else int(call_cost_in_want),
+                base_fee_acceptable=bool(base_fee_ok),
+                force_harvest_trigger_once=bool(force),
+                credit_available=int(credit),
+                credit_threshold=int(threshold),
+            )
+            for (
+                params,
+                total_assets,
+                max_delay,
+                min_delay,
+                profit,
+                profit_min,
+                profit_max,
+                profit_factor,
+                call_cost_in_want,
+                base_fee_ok,
+                force,
+                credit,
+                threshold,
+            ) in raw
+        ]
+        return int(timestamp), inputs
+
+    def poll(self, block_identifier=None, timestamp=None, call_cost=0):
+        """
+        (strategy, should_harvest, reason) for every strategy. timestamp defaults to the block's; pass
+        the time you expect the harvest to land at if you want to be ahead of it. call_cost is the
+        harvest's cost in FTM.
+        """
+        block_timestamp, all_inputs = self.read(block_identifier, call_cost)
+        if timestamp is None:
+            timestamp = block_timestamp
+        results = []
+        for strategy, inputs in zip(self.strategies, all_inputs):
+            should_harvest, reason = harvest_trigger(inputs, timestamp)
+            results.append((strategy, should_harvest, reason))
+        return results
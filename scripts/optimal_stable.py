@@ -0,0 +1,150 @@
+"""
+Keeper component that keeps StrategyCurve2Pool's targetStable on whichever of DAI or USDC turns the
+next harvest's CRV into the most 2pool LP.
+
+For each stable we take the SpookySwap quote for CRV -> WFTM -> stable, then the LP the 2pool mints for
+a single-sided deposit of that stable. Reserves and pool balances are read once per block in two
+multicalls; each decision after that is pure math. setOptimal is only sent when the extra LP is worth
+more than the gas to send it.
+"""
+import os
+import time
+
+import click
+import numpy as np
+from brownie import StrategyCurve2Pool, accounts, interface, multicall, web3
+
+from scripts.addresses import CRV, DAI, OPTIMAL, USDC
+from scripts.spooky_quotes import SpookyQuoter
+from scripts.stableswap import (
+    A_PRECISION,
+    PoolState,
+    add_liquidity,
+    get_virtual_price,
+)
+
+# what setOptimal costs, with some headroom
+SET_OPTIMAL_GAS = 40_000
+
+
+class TargetStableSelector:
+    def __init__(self, strategy, quoter=None):
+        self.strategy = strategy
+        self.quoter = quoter or SpookyQuoter(stables=(DAI, USDC))
+        self.crv = interface.ERC20(CRV)
+
+        # these never change for a strategy, so read them once
+        self.pool = interface.ICurveFi(strategy.curve())
+        self.lp_token = interface.ERC20(strategy.want())
+        self.gauge = interface.IGauge(strategy.gauge())
+        self.coins = [self.pool.coins(i) for i in range(2)]
+        self.precision_mul = [
+            10 ** (18 - interface.ERC20(coin).decimals()) for coin in self.coins
+        ]
+        self.block = None
+        self.state = None
+        self.target_stable = None
+        self.min_crv_to_sell = 0
+
+    def refresh(self, block_identifier=None):
+        """Re-read reserves and pool state, at most once per block."""
+        if block_identifier is None:
+            block_identifier = web3.eth.block_number
+        if block_identifier == self.block:
+            return
+        self.quoter.refresh(block_identifier)
+        with multicall(block_identifier=block_identifier):
+            balances = [self.pool.balances(i) for i in range(2)]
+            amp = self.pool.A()
+            fee = self.pool.fee()
+            admin_fee = self.pool.admin_fee()
+            supply = self.lp_token.totalSupply()
+            target_stable = self.strategy.targetStable()
+            min_crv_to_sell = self.strategy.minCrvToSell()
+        self.target_stable = str(target_stable)
+        self.min_crv_to_sell = int(min_crv_to_sell)
+        self.state = PoolState(
+            balances=[int(b) for b in balances],
+            amp=int(amp) * A_PRECISION,
+            fee=int(fee),
+            admin_fee=int(admin_fee),
+            supply=int(supply),
+            precision_mul=self.precision_mul,
+        )
+        self.block = block_identifier
+
+    def expected_crv(self, block_identifier=None):
+        """CRV the next harvest will sell: what's sitting in the strategy plus what the gauge owes us."""
+        with multicall(block_identifier=block_identifier):
+            idle = self.crv.balanceOf(self.strategy)
+            claimable = self.gauge.claimable_tokens(self.strategy)
+        return int(idle) + int(claimable)
+
+    def lp_out(self, crv_amounts):
+        """LP minted for each stable, for every CRV size in crv_amounts."""
+        quotes = self.quoter.quote_all(crv_amounts, self.quoter.block)
+        lp = {}
+        for stable, stable_out in quotes.items():
+            deposit = np.zeros(np.shape(stable_out) + (2,), dtype=object)
+            deposit[..., self.coins.index(stable)] = stable_out
+            lp[stable] = add_liquidity(self.state, deposit)
+        return lp
+
+    def lp_to_wftm(self, lp_amount):
+        """Value LP in WFTM, via the virtual price and the WFTM/DAI pair, to compare with gas."""
+        usd = lp_amount * get_virtual_price(self.state) // 10 ** 18
+        reserve_wftm, reserve_dai = self.quoter.reserves[(self.quoter.hop, DAI)]
+        return int(usd * reserve_wftm // reserve_dai)
+
+    def decide(self, crv_amount, gas_price, block_identifier=None):
+        """
+        Returns (stable, gain_in_wftm) when switching targetStable pays for its own gas, otherwise
+        (None, gain_in_wftm). crv_amount is what we expect the next harvest to sell.
+        """
+        self.refresh(block_identifier)
+        current = self.target_stable
+        # the strategy won't sell dust, so there's nothing to choose a stable for
+        if crv_amount == 0 or crv_amount < self.min_crv_to_sell:
+            return None, 0
+        lp = self.lp_out(crv_amount)
+        best = max(lp, key=lambda stable: lp[stable])
+        gain = self.lp_to_wftm(lp[best] - lp[current])
+        if best != current and gain > gas_price * SET_OPTIMAL_GAS:
+            return best, gain
+        return None, gain
+
+    def maybe_set_optimal(self, keeper, gas_price=None):
+        """
+        Flip targetStable if it's worth it. Returns the tx, or None if we left it alone. setOptimal is
+        onlyVaultManagers, so keeper here needs to be the vault's management or governance.
+        """
+        if gas_price is None:
+            gas_price = web3.eth.gas_price
+        block = web3.eth.block_number
+        stable, gain = self.decide(self.expected_crv(block), gas_price, block)
+        if stable is None:
+            return None
+        tx = self.strategy.setOptimal(
+            OPTIMAL[stable], {"from": keeper, "gas_price": gas_price}
+        )
+        self.target_stable = stable
+        return tx
+
+
+def main():
+    strategy = StrategyCurve2Pool.at(
+        os.environ.get("STRATEGY") or click.prompt("Strategy")
+    )
+    keeper = accounts.load(click.prompt("Account", type=click.Choice(accounts.load())))
+    selector = TargetStableSelector(strategy)
+
+    # check every new block until stopped
+    last = None
+    while True:
+        block = web3.eth.block_number
+        if block != last:
+            tx = selector.maybe_set_optimal(keeper)
+            if tx is not None:
+                print(f"Block {block}: targetStable set to {strategy.targetStable()}")
+            last = block
+        time.sleep(1)
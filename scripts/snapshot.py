@@ -0,0 +1,109 @@
+"""
+One-multicall snapshots of strategy and vault state, for dashboards and tests.
+
+Everything below is read for any number of strategies in a single aggregate call: stakedBalance,
+balanceOfWant, estimatedTotalAssets, targetStable, vault.strategies, vault.creditAvailable and the
+gauge's claimable_tokens, plus the block number and timestamp they were read at.
+"""
+from brownie import Contract, interface, multicall
+
+from scripts.harvest_trigger import VAULT_ABI
+
+
+class StrategyParams:
+    """vault.strategies(strategy) for a 0.4.x vault."""
+
+    __slots__ = (
+        "performance_fee",
+        "activation",
+        "debt_ratio",
+        "min_debt_per_harvest",
+        "max_debt_per_harvest",
+        "last_report",
+        "total_debt",
+        "total_gain",
+        "total_loss",
+    )
+
+    def __init__(self, values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, int(value))
+
+
+class StrategySnapshot:
+    """State of one strategy and its vault at one block."""
+
+    __slots__ = (
+        "block",
+        "timestamp",
+        "strategy",
+        "vault",
+        "staked_balance",
+        "balance_of_want",
+        "estimated_total_assets",
+        "target_stable",
+        "params",
+        "credit_available",
+        "claimable_crv",
+    )
+
+    def __init__(self, **values):
+        for name, value in values.items():
+            setattr(self, name, value)
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)}" for name in self.__slots__)
+        return f"StrategySnapshot({fields})"
+
+
+class SnapshotReader:
+    """Reads StrategySnapshots for a fixed set of strategies, one multicall per read."""
+
+    def __init__(self, strategies):
+        self.strategies = list(strategies)
+        # vault and gauge are fixed for a strategy, look them up once
+        self.vaults = []
+        self.gauges = []
+        for strategy in self.strategies:
+            self.vaults.append(Contract.from_abi("Vault", strategy.vault(), VAULT_ABI))
+            self.gauges.append(interface.IGauge(strategy.gauge()))
+
+    def read(self, block_identifier=None):
+        with multicall(block_identifier=block_identifier) as batch:
+            helper = interface.Multicall2(batch.address)
+            block = helper.getBlockNumber()
+            timestamp = helper.getCurrentBlockTimestamp()
+            raw = [
+                (
+                    strategy.stakedBalance(),
+                    strategy.balanceOfWant(),
+                    strategy.estimatedTotalAssets(),
+                    strategy.targetStable(),
+                    vault.strategies(strategy),
+                    vault.creditAvailable(strategy),
+                    gauge.claimable_tokens(strategy),
+                )
+                for strategy, vault, gauge in zip(
+                    self.strategies, self.vaults, self.gauges
+                )
+            ]
+
+        snapshots = []
+        for strategy, vault, values in zip(self.strategies, self.vaults, raw):
+            staked, idle, assets, target_stable, params, credit, claimable = values
+            snapshots.append(
+                StrategySnapshot(
+                    block=int(block),
+                    timestamp=int(timestamp),
+                    strategy=strategy.address,
+                    vault=vault.address,
+                    staked_balance=int(staked),
+                    balance_of_want=int(idle),
+                    estimated_total_assets=int(assets),
+                    target_stable=str(target_stable),
+                    params=StrategyParams(params),
+                    credit_available=int(credit),
+                    claimable_crv=int(claimable),
+                )
+            )
+        return snapshots
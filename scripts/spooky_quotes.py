@@ -0,0 +1,90 @@
+"""
+Batched off-chain quotes for the route _sellToken uses: CRV -> WFTM -> targetStable on SpookySwap.
+
+Pair reserves are read once per block in a single multicall. Each getAmountsOut is then evaluated in
+closed form over numpy arrays of input sizes, so quoting 10k sizes for both stables costs one RPC
+instead of 10k eth_calls. Results match the router's uint256 math to the wei.
+"""
+import numpy as np
+from brownie import ZERO_ADDRESS, interface, multicall, web3
+
+from scripts.addresses import CRV, DAI, SPOOKY, USDC, WFTM
+from scripts.stableswap import uint_array
+
+# SpookySwap takes 0.2% per hop
+FEE_NUMERATOR = 998
+FEE_DENOMINATOR = 1000
+
+
+def get_amount_out(amount_in, reserve_in, reserve_out):
+    """UniswapV2Library.getAmountOut over arrays. Zero in gives zero out instead of reverting."""
+    amount_in_with_fee = uint_array(amount_in) * FEE_NUMERATOR
+    return (amount_in_with_fee * reserve_out) // (
+        reserve_in * FEE_DENOMINATOR + amount_in_with_fee
+    )
+
+
+class SpookyQuoter:
+    """
+    Quotes every route from token_in through WFTM to each of our stables. Pair addresses are looked up
+    once; reserves are cached per block and only re-read when refresh sees a new block.
+    """
+
+    def __init__(self, router=SPOOKY, token_in=CRV, stables=(DAI, USDC), hop=WFTM):
+        self.token_in = token_in
+        self.hop = hop
+        self.stables = tuple(stables)
+        factory = interface.IUniswapV2Factory(
+            interface.IUniswapV2Router02(router).factory()
+        )
+
+        # (token_a, token_b) -> pair contract, for each hop we'll ever quote
+        self.pairs = {}
+        for token_a, token_b in [(token_in, hop)] + [(hop, s) for s in self.stables]:
+            pair = factory.getPair(token_a, token_b)
+            if pair == ZERO_ADDRESS:
+                raise ValueError(f"No SpookySwap pair for {token_a} and {token_b}")
+            self.pairs[(token_a, token_b)] = interface.IUniswapV2Pair(pair)
+
+        self.block = None
+        self.reserves = {}
+
+    def refresh(self, block_identifier=None):
+        """Re-read all reserves in one multicall, unless we already have them for this block."""
+        if block_identifier is None:
+            block_identifier = web3.eth.block_number
+        if block_identifier == self.block:
+            return
+        with multicall(block_identifier=block_identifier):
+            raw = {key: pair.getReserves() for key, pair in self.pairs.items()}
+        for (token_a, token_b), (reserve0, reserve1, _) in raw.items():
+            # pairs sort their tokens by address
+            if int(token_a, 16) < int(token_b, 16):
+                self.reserves[(token_a, token_b)] = (int(reserve0), int(reserve1))
+            else:
+                self.reserves[(token_a, token_b)] = (int(reserve1), int(reserve0))
+        self.block = block_identifier
+
+    def get_amounts_out(self, amounts_in, path):
+        """
+        Router.getAmountsOut for every size in amounts_in. Returns an array shaped
+        (len(path), *amounts_in.shape), row k holding the amount of path[k].
+        """
+        amounts = [uint_array(amounts_in)]
+        for token_a, token_b in zip(path[:-1], path[1:]):
+            reserve_in, reserve_out = self.reserves[(token_a, token_b)]
+            amounts.append(get_amount_out(amounts[-1], reserve_in, reserve_out))
+        return np.stack(amounts)
+
+    def quote(self, amounts_in, stable, block_identifier=None):
+        """Stable received by _sellToken for each size in amounts_in."""
+        self.refresh(block_identifier)
+        return self.get_amounts_out(amounts_in, [self.token_in, self.hop, stable])[-1]
+
+    def quote_all(self, amounts_in, block_identifier=None):
+        """Quotes for every stable at once, keyed by stable address."""
+        self.refresh(block_identifier)
+        return {
+            stable: self.quote(amounts_in, stable, self.block)
+            for stable in self.stables
+        }
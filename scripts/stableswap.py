@@ -0,0 +1,243 @@
+"""
+Vectorized model of the Fantom 2pool's StableSwap math.
+
+Mirrors the ICurveFi views in contracts/interfaces/curve.sol (calc_token_amount, get_dy,
+calc_withdraw_one_coin, get_virtual_price), plus the LP actually minted by add_liquidity once
+imbalance fees are taken. Every function takes numpy arrays of amounts and/or pool states and
+broadcasts them against each other, so thousands of scenarios are quoted in one call.
+
+Values are held in object arrays of python ints so results match the pool's uint256 math to the
+wei. Scenarios the pool would revert on (an empty coin balance, for instance) raise here too.
+"""
+
+import numpy as np
+
+N_COINS = 2
+FEE_DENOMINATOR = 10 ** 10
+PRECISION = 10 ** 18
+A_PRECISION = 100
+MAX_ITERATIONS = 255
+
+
+def uint_array(values):
+    """Convert anything array-like (ints, floats like 1e18, Wei) to an object array of python ints."""
+    values = np.asarray(values, dtype=object)
+    return np.vectorize(int, otypes=[object])(values) if values.size else values
+
+
+class PoolState:
+    """
+    One or many snapshots of the pool. balances has shape (..., 2), in native coin units; amp (in
+    A_PRECISION units), fee, admin_fee and supply have shape (...). precision_mul scales each coin
+    to 18 decimals and is the same for every snapshot.
+    """
+
+    __slots__ = ("balances", "amp", "fee", "admin_fee", "supply", "precision_mul")
+
+    def __init__(self, balances, amp, fee, admin_fee, supply, precision_mul):
+        self.balances = uint_array(balances)
+        self.amp = uint_array(amp)
+        self.fee = uint_array(fee)
+        self.admin_fee = uint_array(admin_fee)
+        self.supply = uint_array(supply)
+        self.precision_mul = uint_array(precision_mul)
+
+    @classmethod
+    def from_pool(cls, pool, block_identifier=None):
+        """Read the current state of a deployed pool (any brownie contract with the pool ABI)."""
+        call = (
+            {} if block_identifier is None else {"block_identifier": block_identifier}
+        )
+        precision_mul = []
+        for i in range(N_COINS):
+            decimals = _erc20_decimals(pool.coins(i, **call), block_identifier)
+            precision_mul.append(10 ** (18 - decimals))
+        # older pools only expose A(), newer ones keep extra precision
+        if hasattr(pool, "A_precise"):
+            amp = pool.A_precise(**call)
+        else:
+            amp = pool.A(**call) * A_PRECISION
+        return cls(
+            balances=[pool.balances(i, **call) for i in range(N_COINS)],
+            amp=amp,
+            fee=pool.fee(**call),
+            admin_fee=pool.admin_fee(**call),
+            supply=pool.totalSupply(**call),
+            precision_mul=precision_mul,
+        )
+
+    def xp(self):
+        return self.balances * self.precision_mul
+
+
+def _erc20_decimals(address, block_identifier=None):
+    from brownie import web3
+
+    # decimals() selector, so we don't need an ABI for each coin
+    tx = {"to": str(address), "data": "0x313ce567"}
+    return int.from_bytes(web3.eth.call(tx, block_identifier), "big")
+
+
+def _broadcast(*arrays):
+    """Broadcast, then flatten to 1-d so the solvers can index active rows."""
+    arrays = np.broadcast_arrays(*[uint_array(a) for a in arrays])
+    shape = arrays[0].shape
+    return shape, [a.reshape(-1).copy() for a in arrays]
+
+
+############################################ INVARIANT ############################################
+
+
+def _get_D(x0, x1, amp):
+    """1-d core of get_D. Rows converge independently and are frozen once they do, like the pool."""
+    S = x0 + x1
+    D = S.copy()
+    Ann = amp * N_COINS
+    active = np.nonzero(S != 0)[0]
+    for _ in range(MAX_ITERATIONS):
+        if active.size == 0:
+            return D
+        d = D[active]
+        D_P = d * d // (x0[active] * N_COINS)
+        D_P = D_P * d // (x1[active] * N_COINS)
+        ann = Ann[active]
+        new = (
+            (ann * S[active] // A_PRECISION + D_P * N_COINS)
+            * d
+            // ((ann - A_PRECISION) * d // A_PRECISION + (N_COINS + 1) * D_P)
+        )
+        D[active] = new
+        active = active[np.abs(new - d) > 1]
+    raise ValueError("D did not converge")
+
+
+def _get_y_D(amp, x, D):
+    """1-d core of get_y_D for two coins: the balance of one coin given the other's and D."""
+    Ann = amp * N_COINS
+    c = D * D // (x * N_COINS)
+    c = c * D * A_PRECISION // (Ann * N_COINS)
+    b = x + D * A_PRECISION // Ann
+    y = D.copy()
+    active = np.arange(y.size)
+    for _ in range(MAX_ITERATIONS):
+        if active.size == 0:
+            return y
+        prev = y[active]
+        new = (prev * prev + c[active]) // (2 * prev + b[active] - D[active])
+        y[active] = new
+        active = active[np.abs(new - prev) > 1]
+    raise ValueError("y did not converge")
+
+
+def get_D(xp, amp):
+    """StableSwap invariant for xp (..., 2) in 18 decimals and amp in A_PRECISION units."""
+    xp = uint_array(xp)
+    shape, (x0, x1, amp) = _broadcast(xp[..., 0], xp[..., 1], amp)
+    return _get_D(x0, x1, amp).reshape(shape)
+
+
+def get_y_D(amp, x, D):
+    """Balance of the other coin that keeps invariant D when one coin's balance is x (18 decimals)."""
+    shape, (amp, x, D) = _broadcast(amp, x, D)
+    return _get_y_D(amp, x, D).reshape(shape)
+
+
+############################################## VIEWS ##############################################
+
+
+def get_virtual_price(state):
+    D = get_D(state.xp(), state.amp)
+    return D * PRECISION // state.supply
+
+
+def calc_token_amount(state, amounts, is_deposit=True):
+    """LP minted (or burned) for amounts (..., 2), fee-less like the pool's own view."""
+    amounts = uint_array(amounts)
+    balances = state.balances
+    new_balances = balances + amounts if is_deposit else balances - amounts
+    xp_old = balances * state.precision_mul
+    xp_new = new_balances * state.precision_mul
+    shape, (o0, o1, n0, n1, amp, supply) = _broadcast(
+        xp_old[..., 0],
+        xp_old[..., 1],
+        xp_new[..., 0],
+        xp_new[..., 1],
+        state.amp,
+        state.supply,
+    )
+    D0 = _get_D(o0, o1, amp)
+    D1 = _get_D(n0, n1, amp)
+    diff = D1 - D0 if is_deposit else D0 - D1
+    return (diff * supply // D0).reshape(shape)
+
+
+def add_liquidity(state, amounts):
+    """
+    LP actually minted by add_liquidity(amounts, 0), after the imbalance fee. This is what the
+    strategy receives in prepareReturn, and is slightly below calc_token_amount for one-sided deposits.
+    """
+    amounts = uint_array(amounts)
+    new_balances = state.balances + amounts
+    shape, (b0, b1, n0, n1, m0, m1, amp, fee, supply) = _broadcast(
+        state.balances[..., 0],
+        state.balances[..., 1],
+        new_balances[..., 0],
+        new_balances[..., 1],
+        state.precision_mul[0],
+        state.precision_mul[1],
+        state.amp,
+        state.fee,
+        state.supply,
+    )
+    D0 = _get_D(b0 * m0, b1 * m1, amp)
+    D1 = _get_D(n0 * m0, n1 * m1, amp)
+    _fee = fee * N_COINS // (4 * (N_COINS - 1))
+    after_fees = []
+    for old, new in ((b0, n0), (b1, n1)):
+        ideal = D1 * old // D0
+        after_fees.append(new - _fee * np.abs(ideal - new) // FEE_DENOMINATOR)
+    D2 = _get_D(after_fees[0] * m0, after_fees[1] * m1, amp)
+    return (supply * (D2 - D0) // D0).reshape(shape)
+
+
+def get_dy(state, i, j, dx):
+    """Coin j received for dx of coin i, after the swap fee."""
+    xp = state.xp()
+    shape, (xi, xj, mi, mj, amp, fee, dx) = _broadcast(
+        xp[..., i],
+        xp[..., j],
+        state.precision_mul[i],
+        state.precision_mul[j],
+        state.amp,
+        state.fee,
+        dx,
+    )
+    D = _get_D(xi, xj, amp)
+    y = _get_y_D(amp, xi + dx * mi, D)
+    dy = xj - y - 1
+    dy_fee = dy * fee // FEE_DENOMINATOR
+    return ((dy - dy_fee) // mj).reshape(shape)
+
+
+def calc_withdraw_one_coin(state, token_amount, i):
+    """Coin i received for burning token_amount of LP, after the imbalance fee."""
+    j = 1 - i
+    xp = state.xp()
+    shape, (xi, xj, mi, amp, fee, supply, token_amount) = _broadcast(
+        xp[..., i],
+        xp[..., j],
+        state.precision_mul[i],
+        state.amp,
+        state.fee,
+        state.supply,
+        token_amount,
+    )
+    D0 = _get_D(xi, xj, amp)
+    D1 = D0 - token_amount * D0 // supply
+    new_y = _get_y_D(amp, xj, D1)
+
+    _fee = fee * N_COINS // (4 * (N_COINS - 1))
+    reduced_i = xi - _fee * (xi * D1 // D0 - new_y) // FEE_DENOMINATOR
+    reduced_j = xj - _fee * (xj - xj * D1 // D0) // FEE_DENOMINATOR
+    dy = reduced_i - _get_y_D(amp, reduced_j, D1) - 1
+    return (dy // mi).reshape(shape)
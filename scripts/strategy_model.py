@@ -0,0 +1,747 @@
+"""
+Pure-python reference model of StrategyCurve2Pool and the Yearn vault (0.4.6) accounting around it.
+
+The strategy side mirrors prepareReturn, adjustPosition, liquidatePosition, liquidateAllPositions and
+BaseStrategy.harvest/withdraw; the vault side mirrors deposit, withdraw, report, creditAvailable,
+debtOutstanding, fees and locked profit, all in the same integer math. CRV is left out: with gauge
+emissions off, profit only comes from donations of want or gauge tokens, which is exactly what the
+donation and debt-change tests poke at by hand.
+
+Random operation sequences run against the model on every core, checking invariants after each step.
+Any sequence is reproducible from its seed, so a sample of them can be replayed on the mock chain and
+the events compared to the wei (see tests/test_strategy_model.py). Run the fuzzer on its own with
+`brownie run strategy_model` (SEQUENCES, LENGTH, SEED and PROCESSES env vars).
+"""
+import os
+import random
+import time
+from multiprocessing import Pool
+
+MAX_BPS = 10_000
+SECS_PER_YEAR = 31_556_952
+DEGRADATION_COEFFICIENT = 10 ** 18
+MAX_UINT256 = 2 ** 256 - 1
+
+
+class ModelRevert(Exception):
+    """The contracts would revert on this operation. The model's state is left as it was."""
+
+
+def _require(condition, reason):
+    if not condition:
+        raise ModelRevert(reason)
+
+
+class VaultModel:
+    """One vault with a single strategy. Shares are tracked per user; fee shares are pooled in fee_shares."""
+
+    __slots__ = (
+        "total_idle",
+        "total_debt",
+        "debt_ratio",
+        "last_report",
+        "locked_profit",
+        "locked_profit_degradation",
+        "performance_fee",
+        "management_fee",
+        "deposit_limit",
+        "emergency_shutdown",
+        "total_supply",
+        "shares",
+        "fee_shares",
+        # our strategy's vault.strategies() entry
+        "strategy_performance_fee",
+        "activation",
+        "strategy_debt_ratio",
+        "min_debt_per_harvest",
+        "max_debt_per_harvest",
+        "strategy_last_report",
+        "strategy_total_debt",
+        "total_gain",
+        "total_loss",
+    )
+
+    def __init__(self, **values):
+        for name, value in values.items():
+            setattr(self, name, value)
+
+    def copy(self):
+        new = object.__new__(VaultModel)
+        for name in VaultModel.__slots__:
+            setattr(new, name, getattr(self, name))
+        new.shares = list(self.shares)
+        return new
+
+    def total_assets(self):
+        return self.total_idle + self.total_debt
+
+    def calculate_locked_profit(self, now):
+        ratio = (now - self.last_report) * self.locked_profit_degradation
+        if ratio < DEGRADATION_COEFFICIENT:
+            return (
+                self.locked_profit
+                - ratio * self.locked_profit // DEGRADATION_COEFFICIENT
+            )
+        return 0
+
+    def free_funds(self, now):
+        return self.total_assets() - self.calculate_locked_profit(now)
+
+    def share_value(self, shares, now):
+        if self.total_supply == 0:
+            return shares
+        return shares * self.free_funds(now) // self.total_supply
+
+    def shares_for_amount(self, amount, now):
+        free_funds = self.free_funds(now)
+        if free_funds > 0:
+            return amount * self.total_supply // free_funds
+        return 0
+
+    def issue_shares(self, amount, now):
+        if self.total_supply > 0:
+            free_funds = self.free_funds(now)
+            _require(free_funds > 0, "no free funds")
+            shares = amount * self.total_supply // free_funds
+        else:
+            shares = amount
+        _require(shares != 0, "division rounding resulted in zero")
+        self.total_supply += shares
+        return shares
+
+    def credit_available(self):
+        if self.emergency_shutdown:
+            return 0
+        total_assets = self.total_assets()
+        vault_debt_limit = self.debt_ratio * total_assets // MAX_BPS
+        strategy_debt_limit = self.strategy_debt_ratio * total_assets // MAX_BPS
+        if (
+            strategy_debt_limit <= self.strategy_total_debt
+            or vault_debt_limit <= self.total_debt
+        ):
+            return 0
+        available = strategy_debt_limit - self.strategy_total_debt
+        available = min(available, vault_debt_limit - self.total_debt)
+        available = min(available, self.total_idle)
+        if available < self.min_debt_per_harvest:
+            return 0
+        return min(available, self.max_debt_per_harvest)
+
+    def debt_outstanding(self):
+        if self.debt_ratio == 0:
+            return self.strategy_total_debt
+        strategy_debt_limit = self.strategy_debt_ratio * self.total_assets() // MAX_BPS
+        if self.emergency_shutdown:
+            return self.strategy_total_debt
+        if self.strategy_total_debt <= strategy_debt_limit:
+            return 0
+        return self.strategy_total_debt - strategy_debt_limit
+
+    def report_loss(self, loss):
+        _require(self.strategy_total_debt >= loss, "loss above debt")
+        if self.debt_ratio != 0:
+            ratio_change = min(
+                loss * self.debt_ratio // self.total_debt, self.strategy_debt_ratio
+            )
+            self.strategy_debt_ratio -= ratio_change
+            self.debt_ratio -= ratio_change
+        self.total_loss += loss
+        self.strategy_total_debt -= loss
+        self.total_debt -= loss
+
+    def assess_fees(self, gain, now):
+        if self.activation == now:
+            return 0
+        duration = now - self.strategy_last_report
+        _require(duration != 0, "can't assess fees twice within the same block")
+        if gain == 0:
+            return 0
+        management_fee = (
+            (self.strategy_total_debt * duration * self.management_fee)
+            // MAX_BPS
+            // SECS_PER_YEAR
+        )
+        strategist_fee = gain * self.strategy_performance_fee // MAX_BPS
+        performance_fee = gain * self.performance_fee // MAX_BPS
+        total_fee = min(performance_fee + strategist_fee + management_fee, gain)
+        if total_fee > 0:
+            self.fee_shares += self.issue_shares(total_fee, now)
+        return total_fee
+
+    def update_debt_ratio(self, debt_ratio):
+        _require(not self.emergency_shutdown, "shutdown")
+        new_ratio = self.debt_ratio - self.strategy_debt_ratio + debt_ratio
+        _require(new_ratio <= MAX_BPS, "debt ratio over 100%")
+        self.debt_ratio = new_ratio
+        self.strategy_debt_ratio = debt_ratio
+
+    def revoke(self):
+        self.debt_ratio -= self.strategy_debt_ratio
+        self.strategy_debt_ratio = 0
+
+
+class StrategyModel:
+    """Our want balance, what we have staked in the gauge, and the strategy logic around them."""
+
+    __slots__ = ("want", "staked", "emergency_exit")
+
+    def __init__(self, want=0, staked=0, emergency_exit=False):
+        self.want = want
+        self.staked = staked
+        self.emergency_exit = emergency_exit
+
+    def copy(self):
+        return StrategyModel(self.want, self.staked, self.emergency_exit)
+
+    def estimated_total_assets(self):
+        return self.want + self.staked
+
+    def _unstake(self, amount):
+        self.staked -= amount
+        self.want += amount
+
+    def prepare_return(self, debt_outstanding, total_debt):
+        assets = self.want + self.staked
+        if assets > total_debt:
+            profit, loss = assets - total_debt, 0
+            debt_payment = debt_outstanding
+        else:
+            profit, loss = 0, total_debt - assets
+            debt_payment = min(debt_outstanding, assets)
+        needed = profit + debt_payment
+        if needed > self.want:
+            self._unstake(needed - self.want)
+        return profit, loss, debt_payment
+
+    def adjust_position(self):
+        if self.emergency_exit:
+            return
+        if self.want > 0:
+            self.staked += self.want
+            self.want = 0
+
+    def liquidate_position(self, amount_needed):
+        if amount_needed > self.want:
+            to_withdraw = min(self.staked, amount_needed - self.want)
+            liquidated = self.want + to_withdraw
+            if to_withdraw > 0:
+                self._unstake(to_withdraw)
+            return liquidated, amount_needed - liquidated
+        return amount_needed, 0
+
+    def liquidate_all_positions(self):
+        if self.staked > 0:
+            self._unstake(self.staked)
+        return self.want
+
+
+class Model:
+    """
+    The vault, our strategy and the wallets of the users who deposit and donate, driven one operation at a
+    time. Each operation is a tuple, see apply(). now advances a second per transaction, plus any sleeps,
+    unless the caller (a replay on a real chain) tells us the block timestamp instead.
+    """
+
+    __slots__ = ("vault", "strategy", "wallets", "now")
+
+    def __init__(self, vault, strategy, wallets, now):
+        self.vault = vault
+        self.strategy = strategy
+        self.wallets = wallets
+        self.now = now
+
+    @classmethod
+    def fresh(cls, wallets, now=0, performance_fee=1_000, management_fee=0):
+        """A new vault with our strategy added at 100% debt ratio, the way conftest sets them up."""
+        vault = VaultModel(
+            total_idle=0,
+            total_debt=0,
+            debt_ratio=MAX_BPS,
+            last_report=now,
+            locked_profit=0,
+            locked_profit_degradation=DEGRADATION_COEFFICIENT * 46 // 10 ** 6,
+            performance_fee=performance_fee,
+            management_fee=management_fee,
+            deposit_limit=MAX_UINT256,
+            emergency_shutdown=False,
+            total_supply=0,
+            shares=[0] * len(wallets),
+            fee_shares=0,
+            strategy_performance_fee=0,
+            activation=now,
+            strategy_debt_ratio=MAX_BPS,
+            min_debt_per_harvest=0,
+            max_debt_per_harvest=MAX_UINT256,
+            strategy_last_report=now,
+            strategy_total_debt=0,
+            total_gain=0,
+            total_loss=0,
+        )
+        return cls(vault, StrategyModel(), list(wallets), now)
+
+    @classmethod
+    def from_chain(cls, vault, strategy, token, users):
+        """Read the current state of a deployed vault and strategy, with users as our depositors."""
+        from brownie import chain
+
+        params = vault.strategies(strategy)
+        shares = [vault.balanceOf(user) for user in users]
+        model_vault = VaultModel(
+            total_idle=vault.totalIdle(),
+            total_debt=vault.totalDebt(),
+            debt_ratio=vault.debtRatio(),
+            last_report=vault.lastReport(),
+            locked_profit=vault.lockedProfit(),
+            locked_profit_degradation=vault.lockedProfitDegradation(),
+            performance_fee=vault.performanceFee(),
+            management_fee=vault.managementFee(),
+            deposit_limit=vault.depositLimit(),
+            emergency_shutdown=vault.emergencyShutdown(),
+            total_supply=vault.totalSupply(),
+            shares=shares,
+            fee_shares=vault.totalSupply() - sum(shares),
+            strategy_performance_fee=params["performanceFee"],
+            activation=params["activation"],
+            strategy_debt_ratio=params["debtRatio"],
+            min_debt_per_harvest=params["minDebtPerHarvest"],
+            max_debt_per_harvest=params["maxDebtPerHarvest"],
+            strategy_last_report=params["lastReport"],
+            strategy_total_debt=params["totalDebt"],
+            total_gain=params["totalGain"],
+            total_loss=params["totalLoss"],
+        )
+        model_strategy = StrategyModel(
+            strategy.balanceOfWant(), strategy.stakedBalance(), strategy.emergencyExit()
+        )
+        wallets = [token.balanceOf(user) for user in users]
+        return cls(model_vault, model_strategy, wallets, chain.time())
+
+    def copy(self):
+        # deepcopy is most of our runtime otherwise
+        return Model(
+            self.vault.copy(), self.strategy.copy(), list(self.wallets), self.now
+        )
+
+    # ---------------------------------------------------------------- operations
+
+    def apply(self, op, now=None):
+        """
+        Run one operation and return its outcome, or raise ModelRevert with our state untouched.
+
+        ("deposit", user, amount)          -> shares minted
+        ("withdraw", user, shares)         -> want sent to user, with maxLoss = 100%
+        ("donate_want", user, amount)      -> None, want sent straight to the strategy
+        ("donate_staked", user, amount)    -> None, gauge tokens sent to the strategy
+        ("debt_ratio", bps)                -> None
+        ("harvest",)                       -> (profit, loss, debtPayment, debtOutstanding), as in Harvested
+        ("emergency_exit",)                -> None
+        ("sleep", seconds)                 -> None, no transaction
+        """
+        kind = op[0]
+        if kind == "sleep":
+            self.now += op[1]
+            return None
+        before = self.copy()
+        self.now = self.now + 1 if now is None else now
+        try:
+            return getattr(self, "_" + kind)(*op[1:])
+        except ModelRevert:
+            self.vault, self.strategy, self.wallets = (
+                before.vault,
+                before.strategy,
+                before.wallets,
+            )
+            raise
+
+    def _deposit(self, user, amount):
+        vault = self.vault
+        _require(not vault.emergency_shutdown, "shutdown")
+        _require(vault.total_assets() + amount <= vault.deposit_limit, "deposit limit")
+        _require(amount > 0, "zero deposit")
+        _require(self.wallets[user] >= amount, "balance")
+        shares = vault.issue_shares(amount, self.now)
+        vault.shares[user] += shares
+        self.wallets[user] -= amount
+        vault.total_idle += amount
+        return shares
+
+    def _withdraw(self, user, shares, max_loss=MAX_BPS):
+        vault = self.vault
+        _require(0 < shares <= vault.shares[user], "shares")
+        value = vault.share_value(shares, self.now)
+        vault_balance = vault.total_idle
+        total_loss = 0
+        if value > vault_balance:
+            amount_needed = min(value - vault_balance, vault.strategy_total_debt)
+            if amount_needed > 0:
+                withdrawn, loss = self._strategy_withdraw(amount_needed)
+                vault_balance += withdrawn
+                if loss > 0:
+                    value -= loss
+                    total_loss += loss
+                    vault.report_loss(loss)
+                vault.strategy_total_debt -= withdrawn
+                vault.total_debt -= withdrawn
+            vault.total_idle = vault_balance
+            if value > vault_balance:
+                value = vault_balance
+                shares = vault.shares_for_amount(value + total_loss, self.now)
+            _require(
+                total_loss <= max_loss * (value + total_loss) // MAX_BPS, "max loss"
+            )
+        _require(vault.shares[user] >= shares, "burn")
+        vault.shares[user] -= shares
+        vault.total_supply -= shares
+        vault.total_idle -= value
+        self.wallets[user] += value
+        return value
+
+    def _strategy_withdraw(self, amount_needed):
+        freed, loss = self.strategy.liquidate_position(amount_needed)
+        self.strategy.want -= freed
+        return freed, loss
+
+    def _donate_want(self, user, amount):
+        _require(0 < amount <= self.wallets[user], "balance")
+        self.wallets[user] -= amount
+        self.strategy.want += amount
+
+    def _donate_staked(self, user, amount):
+        _require(0 < amount <= self.wallets[user], "balance")
+        self.wallets[user] -= amount
+        self.strategy.staked += amount
+
+    def _debt_ratio(self, bps):
+        _require(not self.strategy.emergency_exit, "strategy in emergency")
+        self.vault.update_debt_ratio(bps)
+
+    def _emergency_exit(self):
+        _require(not self.strategy.emergency_exit, "already exiting")
+        self.strategy.emergency_exit = True
+        if self.vault.strategy_debt_ratio != 0:
+            self.vault.revoke()
+
+    def _harvest(self):
+        vault, strategy = self.vault, self.strategy
+        profit = loss = debt_payment = 0
+        debt_outstanding = vault.debt_outstanding()
+        if strategy.emergency_exit:
+            freed = strategy.liquidate_all_positions()
+            if freed < debt_outstanding:
+                loss = debt_outstanding - freed
+            elif freed > debt_outstanding:
+                profit = freed - debt_outstanding
+            debt_payment = debt_outstanding - loss
+        else:
+            profit, loss, debt_payment = strategy.prepare_return(
+                debt_outstanding, vault.strategy_total_debt
+            )
+        debt_outstanding = self._report(profit, loss, debt_payment)
+        strategy.adjust_position()
+        return profit, loss, debt_payment, debt_outstanding
+
+    def _report(self, gain, loss, debt_payment):
+        vault, strategy = self.vault, self.strategy
+        _require(strategy.want >= gain + debt_payment, "report balance")
+        if loss > 0:
+            vault.report_loss(loss)
+        total_fees = vault.assess_fees(gain, self.now)
+        vault.total_gain += gain
+
+        credit = vault.credit_available()
+        debt = vault.debt_outstanding()
+        debt_payment = min(debt_payment, debt)
+        if debt_payment > 0:
+            vault.strategy_total_debt -= debt_payment
+            vault.total_debt -= debt_payment
+            debt -= debt_payment
+        if credit > 0:
+            vault.strategy_total_debt += credit
+            vault.total_debt += credit
+
+        total_available = gain + debt_payment
+        if total_available < credit:
+            vault.total_idle -= credit - total_available
+            strategy.want += credit - total_available
+        elif total_available > credit:
+            vault.total_idle += total_available - credit
+            strategy.want -= total_available - credit
+
+        locked_before_loss = vault.calculate_locked_profit(self.now) + gain - total_fees
+        vault.locked_profit = max(locked_before_loss - loss, 0)
+        vault.strategy_last_report = self.now
+        vault.last_report = self.now
+
+        if vault.strategy_debt_ratio == 0 or vault.emergency_shutdown:
+            return strategy.estimated_total_assets()
+        return debt
+
+    # ---------------------------------------------------------------- checks
+
+    def total_want(self):
+        return (
+            sum(self.wallets)
+            + self.vault.total_idle
+            + self.strategy.estimated_total_assets()
+        )
+
+    def check_invariants(self, total_want, last_op=None):
+        """
+        Raise AssertionError on the first accounting invariant we break. last_op is the operation that
+        just went through, if it did.
+        """
+        vault, strategy = self.vault, self.strategy
+        assert vault.total_debt == vault.strategy_total_debt, "vault and strategy debt"
+        assert vault.debt_ratio == vault.strategy_debt_ratio <= MAX_BPS, "debt ratio"
+        assert vault.total_supply == sum(vault.shares) + vault.fee_shares, "shares"
+        assert min(vault.total_idle, strategy.want, strategy.staked) >= 0, "negative"
+        assert self.total_want() == total_want, "want created or destroyed"
+        if last_op == ("harvest",):
+            if strategy.emergency_exit:
+                assert strategy.estimated_total_assets() == 0, "exit left funds"
+            else:
+                assert strategy.want == 0, "harvest left want unstaked"
+
+
+# -------------------------------------------------------------------- fuzzing
+
+
+def _amount(rng, balance):
+    """Anything from a single wei to all of balance, spread evenly over orders of magnitude."""
+    if balance <= 0:
+        return 0
+    pick = rng.random()
+    if pick < 0.05:
+        return 1
+    if pick < 0.15:
+        return balance
+    return max(1, int(balance ** rng.random()))
+
+
+def random_op(rng, model):
+    """One operation that makes sense for the model's current state (it may still revert)."""
+    users = len(model.wallets)
+    user = rng.randrange(users)
+    pick = rng.random()
+    if pick < 0.2:
+        return ("deposit", user, _amount(rng, model.wallets[user]))
+    if pick < 0.4 and model.vault.shares[user] > 0:
+        return ("withdraw", user, _amount(rng, model.vault.shares[user]))
+    if pick < 0.47:
+        return ("donate_want", user, _amount(rng, model.wallets[user] // 10))
+    if pick < 0.54:
+        return ("donate_staked", user, _amount(rng, model.wallets[user] // 10))
+    if pick < 0.64:
+        return ("debt_ratio", rng.choice((0, 1, 5_000, 9_999, MAX_BPS)))
+    if pick < 0.65 and not model.strategy.emergency_exit:
+        return ("emergency_exit",)
+    if pick < 0.75:
+        return ("sleep", rng.choice((1, 60, 6 * 3600, 86_400, 30 * 86_400)))
+    return ("harvest",)
+
+
+def sequence(seed, template, length):
+    """
+    Generate and run length operations from seed against a copy of template. Returns the operations, the
+    model after each one (as outcome or ModelRevert) and the first invariant broken, if any.
+    """
+    rng = random.Random(seed)
+    model = template.copy()
+    total_want = model.total_want()
+    ops, outcomes = [], []
+    for step in range(length):
+        op = random_op(rng, model)
+        # fees can't be assessed twice in a block, so give every harvest its own
+        if op == ("harvest",) and (not ops or ops[-1][0] != "sleep"):
+            ops.append(("sleep", 1))
+            outcomes.append(model.apply(("sleep", 1)))
+        try:
+            outcome = model.apply(op)
+        except ModelRevert as revert:
+            outcome = revert
+        ops.append(op)
+        outcomes.append(outcome)
+        try:
+            model.check_invariants(
+                total_want, None if isinstance(outcome, ModelRevert) else op
+            )
+        except AssertionError as error:
+            return ops, outcomes, (step, str(error))
+    return ops, outcomes, None
+
+
+def _fuzz_chunk(args):
+    seeds, template, length = args
+    failures = []
+    for seed in seeds:
+        _, _, failure = sequence(seed, template, length)
+        if failure is not None:
+            failures.append((seed, *failure))
+    return len(seeds), failures
+
+
+def fuzz(template, sequences, length=20, seed=0, processes=None, chunk=2_000):
+    """
+    Run sequences random operation sequences of the given length on every core. Returns (seeds run,
+    failures) where each failure is (seed, step, invariant) and sequence(seed, template, length) rebuilds
+    it exactly.
+    """
+    seeds = range(seed, seed + sequences)
+    chunks = [
+        (seeds[i : i + chunk], template, length) for i in range(0, sequences, chunk)
+    ]
+    run, failures = 0, []
+    with Pool(processes) as pool:
+        for count, chunk_failures in pool.imap_unordered(_fuzz_chunk, chunks):
+            run += count
+            failures.extend(chunk_failures)
+    return run, sorted(failures)
+
+
+# -------------------------------------------------------------------- replay on a chain
+
+
+def replay(ops, model, vault, strategy, token, gauge, users, gov):
+    """
+    Send ops to the real vault and strategy, stepping model along at each transaction's timestamp.
+    Returns a list of (step, op, expected, actual) for every divergence in an outcome or in the state
+    afterwards; empty means the model and the contracts agree to the wei.
+    """
+    import brownie
+    from brownie import chain
+
+    divergences = []
+
+    def compare(step, op, expected, actual):
+        if expected != actual:
+            divergences.append((step, op, expected, actual))
+
+    for step, op in enumerate(ops):
+        if op[0] == "sleep":
+            chain.sleep(op[1])
+            model.apply(op)
+            continue
+
+        send = _transactions(op, vault, strategy, token, gauge, users, gov)
+        # will it revert? the next block lands at about chain.time()
+        try:
+            model.copy().apply(op, now=max(chain.time(), model.now))
+        except ModelRevert:
+            with brownie.reverts():
+                send()
+            continue
+
+        tx = send()
+        try:
+            expected = model.apply(op, now=tx.timestamp)
+        except ModelRevert as revert:
+            expected = revert
+        compare(step, op, expected, _outcome(op, tx))
+        compare(
+            step,
+            op,
+            _model_state(model),
+            _chain_state(vault, strategy, token, gauge, users),
+        )
+    return divergences
+
+
+def _transactions(op, vault, strategy, token, gauge, users, gov):
+    """A function that sends op on chain and returns its (last) transaction."""
+    kind = op[0]
+    if kind == "deposit":
+        _, user, amount = op
+        return lambda: vault.deposit(amount, {"from": users[user]})
+    if kind == "withdraw":
+        _, user, shares = op
+        return lambda: vault.withdraw(
+            shares, users[user], MAX_BPS, {"from": users[user]}
+        )
+    if kind == "donate_want":
+        _, user, amount = op
+        return lambda: token.transfer(strategy, amount, {"from": users[user]})
+    if kind == "donate_staked":
+        _, user, amount = op
+
+        def send():
+            token.approve(gauge, amount, {"from": users[user]})
+            gauge.deposit(amount, {"from": users[user]})
+            return gauge.transfer(strategy, amount, {"from": users[user]})
+
+        return send
+    if kind == "debt_ratio":
+        return lambda: vault.updateStrategyDebtRatio(strategy, op[1], {"from": gov})
+    if kind == "emergency_exit":
+        return lambda: strategy.setEmergencyExit({"from": gov})
+    if kind == "harvest":
+        return lambda: strategy.harvest({"from": gov})
+    raise ValueError(f"unknown operation {op}")
+
+
+def _outcome(op, tx):
+    if op[0] in ("deposit", "withdraw"):
+        return tx.return_value
+    if op[0] == "harvest":
+        event = tx.events["Harvested"]
+        return (
+            event["profit"],
+            event["loss"],
+            event["debtPayment"],
+            event["debtOutstanding"],
+        )
+    return None
+
+
+def _model_state(model):
+    vault, strategy = model.vault, model.strategy
+    return (
+        vault.total_idle,
+        vault.total_debt,
+        vault.debt_ratio,
+        vault.total_supply,
+        vault.locked_profit,
+        vault.strategy_total_debt,
+        vault.total_gain,
+        vault.total_loss,
+        strategy.want,
+        strategy.staked,
+        list(vault.shares),
+        list(model.wallets),
+    )
+
+
+def _chain_state(vault, strategy, token, gauge, users):
+    params = vault.strategies(strategy)
+    return (
+        vault.totalIdle(),
+        vault.totalDebt(),
+        vault.debtRatio(),
+        vault.totalSupply(),
+        vault.lockedProfit(),
+        params["totalDebt"],
+        params["totalGain"],
+        params["totalLoss"],
+        token.balanceOf(strategy),
+        gauge.balanceOf(strategy),
+        [vault.balanceOf(user) for user in users],
+        [token.balanceOf(user) for user in users],
+    )
+
+
+def main():
+    sequences = int(os.environ.get("SEQUENCES", 1_000_000))
+    length = int(os.environ.get("LENGTH", 20))
+    seed = int(os.environ.get("SEED", 0))
+    processes = int(os.environ["PROCESSES"]) if os.environ.get("PROCESSES") else None
+
+    # two depositors with very different wallets, like our whale and a small user
+    template = Model.fresh([10 ** 24, 10 ** 20])
+    start = time.time()
+    run, failures = fuzz(template, sequences, length, seed, processes)
+    elapsed = time.time() - start
+    print(
+        f"{run:,} sequences of {length} operations in {elapsed:.1f}s "
+        f"({run * 60 / elapsed:,.0f} per minute), {len(failures)} broke an invariant"
+    )
+    for failure_seed, step, invariant in failures[:10]:
+        print(f"  seed {failure_seed}, step {step}: {invariant}")
@@ -1,6 +1,19 @@
+import os
+import time
+
 import pytest
-from brownie import config, Wei, Contract, chain, ZERO_ADDRESS
+from brownie import config, Wei, Contract, chain, history, ZERO_ADDRESS
 import requests
+from utils import gas
+from utils.abi_cache import cached_contract
+from utils.mocks import deploy_mock_infrastructure, mint_lp
+from scripts.addresses import CURVE_POOL, GAUGE, GAUGE_FACTORY, SPOOKY
+from scripts.gas_flamegraph import GasFlamegraph
+from utils.fork_cache import route_fork
+from utils.funding import set_balance
+from utils.parallel import fork_block, network_id, pin_fork
+from utils.rpc_count import by_fixture, requests_sent
+from utils.time_travel import saved, travel
 
 # Snapshots the chain before each test and reverts after test completion.
 @pytest.fixture(autouse=True)
@@ -8,9 +21,119 @@ def isolation(fn_isolation):
     pass
 
 
+################################################### GAS FLAMEGRAPH ###################################################
+
+# set GAS_FLAMEGRAPH=<file> to trace every harvest the tests send and write their summed gas as collapsed stacks
+flamegraph_path = os.environ.get("GAS_FLAMEGRAPH")
+flamegraph = GasFlamegraph()
+
+
+@pytest.fixture(autouse=True)
+def harvest_flamegraph(isolation):
+    first = len(history)
+    yield
+    # before fn_isolation reverts and takes these out of history
+    if flamegraph_path:
+        for tx in history[first:]:
+            if tx.fn_name == "harvest" and tx.status == 1:
+                flamegraph.add(tx)
+
+
+def pytest_sessionfinish(session):
+    if fork_cache is not None:
+        fork_cache.save()
+        print(
+            f"\nFork cache: {fork_cache.hits} reads served locally, {fork_cache.misses} fetched"
+        )
+    if flamegraph_path and flamegraph.transactions:
+        # each xdist worker writes its own file, cat them together: identical stacks are summed anyway
+        worker = os.environ.get("PYTEST_XDIST_WORKER")
+        flamegraph.write(f"{flamegraph_path}.{worker}" if worker else flamegraph_path)
+
+
+################################################### GAS BENCHMARKS ###################################################
+
+# a benchmark with no baseline fails, run with --update-gas to record tests/gas_baseline.json and commit it
+def pytest_addoption(parser):
+    parser.addoption(
+        "--update-gas",
+        action="store_true",
+        help="record the gas benchmarks as the new baseline instead of checking them",
+    )
+
+
+##################################################### FORK CACHE #####################################################
+
+# set FORK_CACHE=1 and FORK_BLOCK=<block> to fork through a local cache of every account, code and storage slot
+# the chain reads at that block, kept in tests/fork_cache/. once a run has warmed it, the suite needs no RPC at all
+# (FORK_CACHE_OFFLINE=1 makes sure of it). the block has to be pinned: a new block means a new, empty cache.
+use_fork_cache = bool(os.environ.get("FORK_CACHE"))
+fork_cache = None
+
+
+#################################################### TIME TRAVEL #####################################################
+
+# round-trips utils.time_travel.travel saved in each test, over the chain.sleep and chain.mine calls it replaces
+travel_saved = {}
+
+
+@pytest.fixture(autouse=True)
+def count_travel(request):
+    before = saved["round_trips"]
+    yield
+    if saved["round_trips"] > before:
+        travel_saved[request.node.nodeid] = saved["round_trips"] - before
+
+
+################################################### RPC REQUESTS ###################################################
+
+# count the JSON-RPC requests each fixture's setup sends, they're what a cold session waits on
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(fixturedef, request):
+    before = requests_sent()
+    yield
+    by_fixture[fixturedef.argname] += requests_sent() - before
+
+
+############################################### PARALLEL (brownie test -n) ###############################################
+
+# master: pick the fork block once and hand it to every worker
+def pytest_configure_node(node):
+    config = node.config
+    if not hasattr(config, "_fork_block"):
+        config._fork_block = fork_block(network_id())
+    node.workerinput["fork_block"] = config._fork_block
+
+
+# worker: fork that same block on our own chain (brownie already gave us our own port)
+def pytest_configure(config):
+    global fork_cache
+    gas.UPDATE = config.getoption("--update-gas")
+    if use_fork_cache and not os.environ.get("FORK_BLOCK"):
+        raise pytest.UsageError("FORK_CACHE needs FORK_BLOCK set to the block to cache")
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput:
+        network, block = network_id(workerinput), workerinput.get("fork_block")
+    elif use_fork_cache and not config.getoption("numprocesses", None):
+        # serial run: no master to pin a block for us, and brownie hasn't read --network yet
+        network = (config.getoption("--network") or [None])[0] or network_id()
+        block = fork_block(network)
+    else:
+        return
+    if block is None:
+        return
+    if use_fork_cache:
+        fork_cache = route_fork(network, block)
+    pin_fork(network, block)
+
+
 # set this for if we want to use tenderly or not; mostly helpful because with brownie.reverts fails in tenderly forks.
 use_tenderly = False
 
+# set this to True to run on a plain local chain, with mocks etched at the gauge, gauge factory, router, 2pool and
+# token addresses the strategy hardcodes or is deployed with. no RPC needed. run with `brownie test --network development`.
+use_mocks = False
+
 
 ################################################## TENDERLY DEBUGGING ##################################################
 
@@ -37,6 +160,11 @@ def tests_using_tenderly():
     yield yes_or_no
 
 
+@pytest.fixture(scope="session")
+def tests_using_mocks():
+    yield use_mocks
+
+
 # use this to set what chain we use. 1 for ETH, 250 for fantom
 chain_used = 250
 
@@ -47,7 +175,7 @@ def pid():
     yield pid
 
 
-# this is the amount of funds we have our whale deposit. adjust this as needed based on their wallet balance
+# this is the amount of funds we have our whale deposit
 @pytest.fixture(scope="session")
 def amount():
     amount = 35_000e18  # use 35k for MIM, 140k for FRAX
@@ -56,16 +184,13 @@ def amount():
 
 
 
-@pytest.fixture(scope="session")
-def whale(accounts, amount, token):
+# module scoped, after module_isolation: its chain.reset() would wipe a balance written once per session
+@pytest.fixture(scope="module")
+def whale(module_isolation, accounts, amount, token):
     # Totally in it for the tech
-    # Update this with a large holder of your want token (the largest EOA holder of LP)
-    # MIM 0xe896e539e557BC751860a7763C8dD589aF1698Ce, FRAX 0x839Bb033738510AA6B4f78Af20f066bdC824B189
-    whale = accounts.at("0x8866414733F22295b7563f9C5299715D2D76CAf4", force=True)
-    if token.balanceOf(whale) < 2 * amount:
-        raise ValueError(
-            "Our whale needs more funds. Find another whale or reduce your amount variable."
-        )
+    # one of our own accounts, with its LP written straight into the token's storage: no real holder to find
+    whale = accounts[5]
+    set_balance(token, whale, 2 * amount)
     yield whale
 
 
@@ -99,11 +224,17 @@ def contract_name(StrategyCurve2Pool):
     yield contract_name
 
 
+# the gauge, curve pool, gauge factory and router we deploy our strategy with, in constructor order
+@pytest.fixture(scope="session")
+def strategy_params():
+    yield [GAUGE, CURVE_POOL, GAUGE_FACTORY, SPOOKY]
+
+
 # this is the address of our rewards token
 @pytest.fixture(scope="session")
 def rewards_token():  # OGN 0x8207c1FfC5B6804F6024322CcF34F29c3541Ae26, SPELL 0x090185f2135308BaD17527004364eBcC2D37e5F6
     # SNX 0xC011a73ee8576Fb46F5E1c5751cA3B9Fe0af2a6F
-    yield Contract("0x27e611fd27b276acbd5ffd632e5eaebec9761e40")
+    yield cached_contract("0x27e611fd27b276acbd5ffd632e5eaebec9761e40")
 
 
 # sUSD gauge uses blocks instead of seconds to determine rewards, so this needs to be true for that to test if we're earning
@@ -121,11 +252,11 @@ def test_donation():
     yield test_donation
 
 
-@pytest.fixture(scope="session")
-def rewards_whale(accounts):
-    # SNX whale: 0x8D6F396D210d385033b348bCae9e4f9Ea4e045bD, >600k SNX
-    # SPELL whale: 0x46f80018211D5cBBc988e853A8683501FCA4ee9b, >10b SPELL
-    yield accounts.at("0x46f80018211D5cBBc988e853A8683501FCA4ee9b", force=True)
+@pytest.fixture(scope="module")
+def rewards_whale(module_isolation, accounts, rewards_token, rewards_amount):
+    rewards_whale = accounts[7]
+    set_balance(rewards_token, rewards_whale, rewards_amount)
+    yield rewards_whale
 
 
 @pytest.fixture(scope="session")
@@ -139,7 +270,7 @@ def rewards_amount():
 # whether or not a strategy is clonable. if true, don't forget to update what our cloning function is called in test_cloning.py
 @pytest.fixture(scope="session")
 def is_clonable():
-    is_clonable = False 
+    is_clonable = True
     yield is_clonable
 
 
@@ -210,49 +341,49 @@ if chain_used == 1:  # mainnet
 
     @pytest.fixture(scope="session")
     def sushi_router():  # use this to check our allowances
-        yield Contract("0xd9e1cE17f2641f24aE83637ab66a2cca9C378B9F")
+        yield cached_contract("0xd9e1cE17f2641f24aE83637ab66a2cca9C378B9F")
 
     # all contracts below should be able to stay static based on the pid
     @pytest.fixture(scope="session")
     def booster():  # this is the deposit contract
-        yield Contract("0xF403C135812408BFbE8713b5A23a04b3D48AAE31")
+        yield cached_contract("0xF403C135812408BFbE8713b5A23a04b3D48AAE31")
 
     @pytest.fixture(scope="session")
     def voter():
-        yield Contract("0xF147b8125d2ef93FB6965Db97D6746952a133934")
+        yield cached_contract("0xF147b8125d2ef93FB6965Db97D6746952a133934")
 
     @pytest.fixture(scope="session")
     def convexToken():
-        yield Contract("0x4e3FBD56CD56c3e72c1403e103b45Db9da5B9D2B")
+        yield cached_contract("0x4e3FBD56CD56c3e72c1403e103b45Db9da5B9D2B")
 
     @pytest.fixture(scope="session")
     def crv():
-        yield Contract("0xD533a949740bb3306d119CC777fa900bA034cd52")
+        yield cached_contract("0xD533a949740bb3306d119CC777fa900bA034cd52")
 
     @pytest.fixture(scope="session")
     def other_vault_strategy():
-        yield Contract("0x8423590CD0343c4E18d35aA780DF50a5751bebae")
+        yield cached_contract("0x8423590CD0343c4E18d35aA780DF50a5751bebae")
 
     @pytest.fixture(scope="session")
     def proxy():
-        yield Contract("0xA420A63BbEFfbda3B147d0585F1852C358e2C152")
+        yield cached_contract("0xA420A63BbEFfbda3B147d0585F1852C358e2C152")
 
     @pytest.fixture(scope="session")
     def curve_registry():
-        yield Contract("0x90E00ACe148ca3b23Ac1bC8C240C2a7Dd9c2d7f5")
+        yield cached_contract("0x90E00ACe148ca3b23Ac1bC8C240C2a7Dd9c2d7f5")
 
     @pytest.fixture(scope="session")
     def curve_cryptoswap_registry():
-        yield Contract("0x4AacF35761d06Aa7142B9326612A42A2b9170E33")
+        yield cached_contract("0x4AacF35761d06Aa7142B9326612A42A2b9170E33")
 
     @pytest.fixture(scope="session")
     def healthCheck():
-        yield Contract("0xDDCea799fF1699e98EDF118e0629A974Df7DF012")
+        yield cached_contract("0xDDCea799fF1699e98EDF118e0629A974Df7DF012")
 
     @pytest.fixture(scope="session")
     def farmed():
         # this is the token that we are farming and selling for more of our want.
-        yield Contract("0xD533a949740bb3306d119CC777fa900bA034cd52")
+        yield cached_contract("0xD533a949740bb3306d119CC777fa900bA034cd52")
 
    # @pytest.fixture(scope="session")
    # def token(pid, booster):
@@ -264,18 +395,18 @@ if chain_used == 1:  # mainnet
     def cvxDeposit(booster, pid):
         # this should be the address of the convex deposit token
         cvx_address = booster.poolInfo(pid)[1]
-        yield Contract(cvx_address)
+        yield cached_contract(cvx_address)
 
     @pytest.fixture(scope="session")
     def rewardsContract(pid, booster):
         rewardsContract = booster.poolInfo(pid)[3]
-        yield Contract(rewardsContract)
+        yield cached_contract(rewardsContract)
 
     # gauge for the curve pool
     @pytest.fixture(scope="session")
     def gauge(pid, booster):
         gauge = booster.poolInfo(pid)[2]
-        yield Contract(gauge)
+        yield cached_contract(gauge)
 
     # curve deposit pool
     @pytest.fixture(scope="session")
@@ -291,17 +422,17 @@ if chain_used == 1:  # mainnet
                     poolAddress = curve_cryptoswap_registry.get_pool_from_lp_token(
                         token
                     )
-                    poolContract = Contract(poolAddress)
+                    poolContract = cached_contract(poolAddress)
             else:
                 poolAddress = curve_registry.get_pool_from_lp_token(token)
-                poolContract = Contract(poolAddress)
+                poolContract = cached_contract(poolAddress)
         else:
-            poolContract = Contract(old_pool)
+            poolContract = cached_contract(old_pool)
         yield poolContract
 
     @pytest.fixture(scope="session")
     def gasOracle():
-        yield Contract("0xb5e1CAcB567d98faaDB60a1fD4820720141f064F")
+        yield cached_contract("0xb5e1CAcB567d98faaDB60a1fD4820720141f064F")
 
     # Define any accounts in this section
     # for live testing, governance is the strategist MS; we will update this before we endorse
@@ -344,10 +475,9 @@ if chain_used == 1:  # mainnet
             vault.initialize(token, gov, rewards, "", "", guardian)
             vault.setDepositLimit(2 ** 256 - 1, {"from": gov})
             vault.setManagement(management, {"from": gov})
-            chain.sleep(1)
-            chain.mine(1)
+            travel(1)
         else:
-            vault = Contract(vault_address)
+            vault = cached_contract(vault_address)
         yield vault
 
     # replace the first value with the name of your strategy
@@ -357,7 +487,7 @@ elif chain_used == 250:  # only fantom so far and convex doesn't exist there
    
     @pytest.fixture(scope="session")
     def crv():
-        yield Contract("0x1E4F97b9f9F913c46F1632781732927B9019C68b")
+        yield cached_contract("0x1E4F97b9f9F913c46F1632781732927B9019C68b")
 
     
         
@@ -392,7 +522,7 @@ elif chain_used == 250:  # only fantom so far and convex doesn't exist there
 
     @pytest.fixture(scope="session")
     def other_vault_strategy():
-        yield Contract("0xfF8bb7261E4D51678cB403092Ae219bbEC52aa51")
+        yield cached_contract("0xfF8bb7261E4D51678cB403092Ae219bbEC52aa51")
 
     @pytest.fixture(scope="session")
     def strategist(accounts):
@@ -401,19 +531,19 @@ elif chain_used == 250:  # only fantom so far and convex doesn't exist there
     @pytest.fixture(scope="session")
     def token():
         token_address = "0x27E611FD27b276ACbd5Ffd632E5eAEBEC9761E40"  # this should be the address of the ERC-20 used by the strategy/vault (DAI)
-        yield Contract(token_address)
+        yield cached_contract(token_address)
 
     @pytest.fixture(scope="session")
     def farmed():
-        yield Contract("0x1E4F97b9f9F913c46F1632781732927B9019C68b") # CRV
+        yield cached_contract("0x1E4F97b9f9F913c46F1632781732927B9019C68b") # CRV
 
     @pytest.fixture(scope="session")
     def healthCheck():
-        yield Contract("0xf13Cd6887C62B5beC145e30c38c4938c5E627fe0")
+        yield cached_contract("0xf13Cd6887C62B5beC145e30c38c4938c5E627fe0")
 
     @pytest.fixture(scope="session")
     def gasOracle():
-        yield Contract("0xb5e1CAcB567d98faaDB60a1fD4820720141f064F")
+        yield cached_contract("0xb5e1CAcB567d98faaDB60a1fD4820720141f064F")
 
     @pytest.fixture(scope="session")
     def no_profit():
@@ -435,13 +565,13 @@ elif chain_used == 250:  # only fantom so far and convex doesn't exist there
             vault.initialize(token, gov, rewards, "", "", guardian)
             vault.setDepositLimit(2 ** 256 - 1, {"from": gov})
             vault.setManagement(management, {"from": gov})
-            chain.sleep(1)
-            chain.mine(1)
+            travel(1)
             yield vault
    
     @pytest.fixture(scope="module")
     def strategy(
         contract_name,
+        strategy_params,
         strategist,
         keeper,
         vault,
@@ -473,7 +603,7 @@ elif chain_used == 250:  # only fantom so far and convex doesn't exist there
             strategy = strategist.deploy(
                 contract_name,
                 vault,
-
+                *strategy_params,
             )
             print("\nCurve strategy")
 
@@ -504,6 +634,136 @@ elif chain_used == 250:  # only fantom so far and convex doesn't exist there
 
 
 
+############################################## FUNDED AND HARVESTED ##############################################
+
+# most tests start by depositing amount from our whale and harvesting. module_isolation resets the chain for every
+# module, so the best we can do is build that state once per module; fn_isolation then snapshots it and every test
+# that asks for funded_strategy starts from the snapshot instead of sending the same transactions again.
+funded_timing = {"builds": 0, "seconds": 0.0, "tests": 0}
+
+
+@pytest.fixture(scope="module")
+def starting_whale(module_isolation, token, whale):
+    # whale's balance before funded_strategy deposits
+    yield token.balanceOf(whale)
+
+
+@pytest.fixture(scope="module")
+def funded_strategy(
+    starting_whale, token, vault, whale, strategy, gov, chain, amount
+):
+    start = time.perf_counter()
+    token.approve(vault, 2 ** 256 - 1, {"from": whale})
+    vault.deposit(amount, {"from": whale})
+    travel(1, blocks=0)
+    strategy.harvest({"from": gov})
+    travel(1, blocks=0)
+    funded_timing["builds"] += 1
+    funded_timing["seconds"] += time.perf_counter() - start
+    yield strategy
+
+
+# once funded_strategy is built the module's chain stays funded, so run each module's other tests first
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(items):
+    modules = {}
+    for item in items:
+        modules.setdefault(item.module, len(modules))
+    items.sort(
+        key=lambda item: (
+            modules[item.module],
+            "funded_strategy" in item.fixturenames,
+        )
+    )
+
+
+def pytest_runtest_call(item):
+    if "funded_strategy" in item.fixturenames:
+        funded_timing["tests"] += 1
+
+
+def pytest_terminal_summary(terminalreporter):
+    if saved["travels"]:
+        terminalreporter.write_sep("=", "time travel")
+        terminalreporter.write_line(
+            f"{saved['travels']} travels saved {saved['round_trips']} RPC round-trips, most in:"
+        )
+        busiest = sorted(travel_saved.items(), key=lambda item: -item[1])[:5]
+        for nodeid, round_trips in busiest:
+            terminalreporter.write_line(f"  {round_trips:>4}  {nodeid}")
+
+    if by_fixture:
+        terminalreporter.write_sep("=", "fixture RPC requests")
+        terminalreporter.write_line(
+            f"{sum(by_fixture.values())} requests during fixture setup, most in:"
+        )
+        for name, sent in by_fixture.most_common(10):
+            terminalreporter.write_line(f"  {sent:>6}  {name}")
+
+    builds = funded_timing["builds"]
+    if not builds:
+        return
+    per_build = funded_timing["seconds"] / builds
+    reused = funded_timing["tests"] - builds
+    terminalreporter.write_sep("=", "funded_strategy")
+    terminalreporter.write_line(
+        f"built {builds} times ({per_build:.2f}s each) for {funded_timing['tests']} tests, "
+        f"skipping {3 * reused} transactions and about {reused * per_build:.1f}s"
+    )
+
+
+################################################ LOCAL MOCK CHAIN ################################################
+
+# these override the fork fixtures above when we run against our mocks instead. module_isolation resets the chain to
+# where it was at connect, so everything we etch, mint or fund has to be redone per module, after that reset.
+if use_mocks:
+
+    @pytest.fixture(scope="module", autouse=True)
+    def mock_infrastructure(
+        module_isolation, accounts, gov, keeper, rewards, strategist_ms
+    ):
+        mocks = deploy_mock_infrastructure(accounts[0])
+        # our hardcoded roles have no gas money on a fresh chain
+        for role in [gov, keeper, rewards, strategist_ms]:
+            accounts[0].transfer(role, 10e18)
+        yield mocks
+
+    @pytest.fixture(scope="module")
+    def crv(mock_infrastructure):
+        yield mock_infrastructure.crv
+
+    @pytest.fixture(scope="module")
+    def farmed(mock_infrastructure):
+        yield mock_infrastructure.crv
+
+    @pytest.fixture(scope="module")
+    def token(mock_infrastructure):
+        yield mock_infrastructure.pool
+
+    @pytest.fixture(scope="module")
+    def rewards_token(mock_infrastructure):
+        yield mock_infrastructure.pool
+
+    @pytest.fixture(scope="module")
+    def whale(accounts, amount, mock_infrastructure):
+        whale = accounts[5]
+        mint_lp(mock_infrastructure, whale, 2 * amount)
+        yield whale
+
+    # no deployed health check locally; a zero address just means harvests skip the check
+    @pytest.fixture(scope="session")
+    def healthCheck():
+        yield ZERO_ADDRESS
+
+    @pytest.fixture(scope="module")
+    def other_vault_strategy(
+        pm, gov, rewards, guardian, token, strategist, contract_name, strategy_params
+    ):
+        Vault = pm(config["dependencies"][0]).Vault
+        other_vault = guardian.deploy(Vault)
+        other_vault.initialize(token, gov, rewards, "", "", guardian)
+        yield strategist.deploy(contract_name, other_vault, *strategy_params)
+
 
 # commented-out fixtures to be used with live testing
 
@@ -2,6 +2,7 @@ import brownie
 from brownie import Contract
 from brownie import config
 import math
+from utils.time_travel import travel
 
 # test changing the debtRatio on a strategy and then harvesting it
 def test_change_debt(
@@ -16,15 +17,9 @@ def test_change_debt(
     sleep_time,
     is_slippery,
     no_profit,
+    funded_strategy,
+    starting_whale,
 ):
-    ## deposit to the vault after approving
-    startingWhale = token.balanceOf(whale)
-    token.approve(vault, 2 ** 256 - 1, {"from": whale})
-    vault.deposit(amount, {"from": whale})
-    chain.sleep(1)
-    strategy.harvest({"from": gov})
-    chain.sleep(1)
-
     # evaluate our current total assets
     old_assets = vault.totalAssets()
     startingStrategy = strategy.estimatedTotalAssets()
@@ -32,21 +27,20 @@ def test_change_debt(
     # debtRatio is in BPS (aka, max is 10,000, which represents 100%), and is a fraction of the funds that can be in the strategy
     currentDebt = vault.strategies(strategy)["debtRatio"]
     vault.updateStrategyDebtRatio(strategy, currentDebt / 2, {"from": gov})
-    chain.sleep(sleep_time)
+    travel(sleep_time, blocks=0)
     strategy.harvest({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
 
     assert strategy.estimatedTotalAssets() <= startingStrategy
 
     # simulate one day of earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    travel(sleep_time)
 
     # set DebtRatio back to 100%
     vault.updateStrategyDebtRatio(strategy, currentDebt, {"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.harvest({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
 
     # evaluate our current total assets
     new_assets = vault.totalAssets()
@@ -55,15 +49,14 @@ def test_change_debt(
     assert new_assets >= old_assets or math.isclose(new_assets, old_assets, abs_tol=5)
 
     # simulate a day of waiting for share price to bump back up
-    chain.sleep(86400)
-    chain.mine(1)
+    travel(86400)
 
     # withdraw and confirm we made money, or at least that we have about the same
     vault.withdraw({"from": whale})
     if is_slippery and no_profit:
         assert (
-            math.isclose(token.balanceOf(whale), startingWhale, abs_tol=10)
-            or token.balanceOf(whale) >= startingWhale
+            math.isclose(token.balanceOf(whale), starting_whale, abs_tol=10)
+            or token.balanceOf(whale) >= starting_whale
         )
     else:
-        assert token.balanceOf(whale) >= startingWhale
+        assert token.balanceOf(whale) >= starting_whale
@@ -1,6 +1,6 @@
 import brownie
-from brownie import chain
 import math
+from utils.time_travel import travel
 
 # test changing the debtRatio on a strategy, donating some assets, and then harvesting it
 def test_change_debt_with_profit(
@@ -18,8 +18,7 @@ def test_change_debt_with_profit(
     ## deposit to the vault after approving
     token.approve(vault, 2 ** 256 - 1, {"from": whale})
     vault.deposit(amount, {"from": whale})
-    chain.sleep(1)
-    chain.mine(1)
+    travel(1)
     strategy.harvest({"from": gov})
 
     # store our values before we start doing weird stuff
@@ -34,14 +33,12 @@ def test_change_debt_with_profit(
 
     # turn off health check since we just took big profit
     strategy.setDoHealthCheck(False, {"from": gov})
-    chain.sleep(1)
-    chain.mine(1)
+    travel(1)
     strategy.harvest({"from": gov})
     new_params = vault.strategies(strategy)
 
     # sleep 10 hours to allow share price to normalize
-    chain.sleep(60 * 60 * 10)
-    chain.mine(1)
+    travel(60 * 60 * 10)
 
     profit = new_params["totalGain"] - prev_params["totalGain"]
 
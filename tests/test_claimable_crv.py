@@ -0,0 +1,17 @@
+from brownie import chain, interface
+from utils.time_travel import travel
+
+# our view walk of the gauge's checkpoints should owe us exactly what the gauge itself says. on the fork this is
+# the real child gauge, whose claimable_tokens checkpoints us first, so it only answers to eth_call.
+def test_claimable_crv(funded_strategy, sleep_time, no_profit):
+    strategy = funded_strategy
+    gauge = interface.IGauge(strategy.gauge())
+
+    # within a week, then far enough that the walk crosses weekly emission boundaries
+    for seconds in (sleep_time, 86400 * 15):
+        travel(seconds)
+        block = chain.height
+        claimable = gauge.claimable_tokens.call(strategy, block_identifier=block)
+        print("Claimable CRV:", claimable / 1e18)
+        assert no_profit or claimable > 0
+        assert strategy.claimableCrv(block_identifier=block) == claimable
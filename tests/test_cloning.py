@@ -1,6 +1,7 @@
 import brownie
 from brownie import Wei, accounts, Contract, config, ZERO_ADDRESS
 import math
+from utils.time_travel import travel
 
 # test cloning our strategy, make sure the cloned strategy still works just fine by sending funds to it
 def test_cloning(
@@ -14,17 +15,13 @@ def test_cloning(
     rewards,
     chain,
     contract_name,
-    pid,
     amount,
     strategy_name,
     sleep_time,
     tests_using_tenderly,
     is_slippery,
     no_profit,
-    is_convex,
     vault_address,
-    has_rewards,
-    rewards_token,
     is_clonable,
 ):
 
@@ -32,147 +29,60 @@ def test_cloning(
     if not is_clonable:
         return
 
+    # we clone onto the same gauge and pool
+    gauge = strategy.gauge()
+    curve = strategy.curve()
+
     # tenderly doesn't work for "with brownie.reverts"
-    if tests_using_tenderly:
-        if is_convex:
-            ## clone our strategy
-            tx = strategy.cloneCurve3CrvRewards(
-                vault,
-                strategist,
-                rewards,
-                keeper,
-                pid,
-                pool,
-                strategy_name,
-                {"from": gov},
-            )
-            newStrategy = contract_name.at(tx.return_value)
-        else:
-            ## clone our strategy
-            tx = strategy.cloneCurve3CrvRewards(
-                vault,
-                strategist,
-                rewards,
-                keeper,
-                gauge,
-                pool,
-                strategy_name,
-                {"from": gov},
+    if not tests_using_tenderly:
+        # Shouldn't be able to call initialize again
+        with brownie.reverts():
+            strategy.initialize(
+                vault, strategist, rewards, keeper, gauge, curve, {"from": gov}
             )
-            newStrategy = contract_name.at(tx.return_value)
-    else:
-        if is_convex:
-            # Shouldn't be able to call initialize again
-            with brownie.reverts():
-                strategy.initialize(
-                    vault,
-                    strategist,
-                    rewards,
-                    keeper,
-                    pid,
-                    pool,
-                    strategy_name,
-                    {"from": gov},
-                )
 
-            ## clone our strategy
-            tx = strategy.cloneCurve3CrvRewards(
-                vault,
-                strategist,
-                rewards,
-                keeper,
-                pid,
-                pool,
-                strategy_name,
-                {"from": gov},
+    ## clone our strategy
+    tx = strategy.cloneCurve2Pool(
+        vault, strategist, rewards, keeper, gauge, curve, {"from": gov}
+    )
+    newStrategy = contract_name.at(tx.return_value)
+    assert tx.events["Cloned"]["clone"] == newStrategy
+    print("\nClone gas:", tx.gas_used, "Deploy gas:", strategy.tx.gas_used)
+
+    # a minimal proxy is the whole point, it should cost a fraction of a full deploy
+    assert tx.gas_used * 5 < strategy.tx.gas_used
+
+    # our clone starts out configured exactly like the original
+    assert newStrategy.want() == token
+    assert newStrategy.vault() == vault
+    assert newStrategy.strategist() == strategist
+    assert newStrategy.keeper() == keeper
+    assert newStrategy.gauge() == gauge
+    assert newStrategy.curve() == curve
+    assert newStrategy.targetStable() == strategy.targetStable()
+    assert newStrategy.minReportDelay() == strategy.minReportDelay()
+    assert newStrategy.maxReportDelay() == strategy.maxReportDelay()
+    assert newStrategy.isOriginal() == False
+
+    if not tests_using_tenderly:
+        # Shouldn't be able to call initialize again
+        with brownie.reverts():
+            newStrategy.initialize(
+                vault, strategist, rewards, keeper, gauge, curve, {"from": gov}
             )
-            newStrategy = contract_name.at(tx.return_value)
-
-            # Shouldn't be able to call initialize again
-            with brownie.reverts():
-                newStrategy.initialize(
-                    vault,
-                    strategist,
-                    rewards,
-                    keeper,
-                    pid,
-                    pool,
-                    strategy_name,
-                    {"from": gov},
-                )
-
-            ## shouldn't be able to clone a clone
-            with brownie.reverts():
-                newStrategy.cloneCurve3CrvRewards(
-                    vault,
-                    strategist,
-                    rewards,
-                    keeper,
-                    pid,
-                    pool,
-                    strategy_name,
-                    {"from": gov},
-                )
 
-        else:
-            # Shouldn't be able to call initialize again
-            with brownie.reverts():
-                strategy.initialize(
-                    vault,
-                    strategist,
-                    rewards,
-                    keeper,
-                    gauge,
-                    pool,
-                    strategy_name,
-                    {"from": gov},
-                )
-
-            ## clone our strategy
-            tx = strategy.cloneCurve3CrvRewards(
-                vault,
-                strategist,
-                rewards,
-                keeper,
-                gauge,
-                pool,
-                strategy_name,
-                {"from": gov},
+        ## shouldn't be able to clone a clone
+        with brownie.reverts():
+            newStrategy.cloneCurve2Pool(
+                vault, strategist, rewards, keeper, gauge, curve, {"from": gov}
             )
-            newStrategy = contract_name.at(tx.return_value)
-
-            # Shouldn't be able to call initialize again
-            with brownie.reverts():
-                newStrategy.initialize(
-                    vault,
-                    strategist,
-                    rewards,
-                    keeper,
-                    gauge,
-                    pool,
-                    strategy_name,
-                    {"from": gov},
-                )
-
-            ## shouldn't be able to clone a clone
-            with brownie.reverts():
-                newStrategy.cloneCurve3CrvRewards(
-                    vault,
-                    strategist,
-                    rewards,
-                    keeper,
-                    gauge,
-                    pool,
-                    strategy_name,
-                    {"from": gov},
-                )
 
     # revoke and get funds back into vault
     currentDebt = vault.strategies(strategy)["debtRatio"]
     vault.revokeStrategy(strategy, {"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.harvest({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
 
     # attach our new strategy
     vault.addStrategy(newStrategy, currentDebt, 0, 2 ** 256 - 1, 1_000, {"from": gov})
@@ -189,13 +99,6 @@ def test_cloning(
     assert vault.strategies(newStrategy)["debtRatio"] == currentDebt
     assert vault.strategies(strategy)["debtRatio"] == 0
 
-    # add rewards token if needed
-    if has_rewards:
-        if is_convex:
-            newStrategy.updateRewards(True, 0, {"from": gov})
-        else:
-            newStrategy.updateRewards(True, rewards_token, {"from": gov})
-
     ## deposit to the vault after approving; this is basically just our simple_harvest test
     before_pps = vault.pricePerShare()
     startingWhale = token.balanceOf(whale)
@@ -203,10 +106,8 @@ def test_cloning(
     vault.deposit(amount, {"from": whale})
 
     # harvest, store asset amount
-    if not is_convex:  # make sure to update our proxy if a curve strategy
-        proxy.approveStrategy(strategy.gauge(), newStrategy, {"from": gov})
     newStrategy.harvest({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
     old_assets = vault.totalAssets()
     assert old_assets > 0
     assert token.balanceOf(newStrategy) == 0
@@ -214,16 +115,11 @@ def test_cloning(
     print("\nStarting Assets: ", old_assets / 1e18)
 
     # try and include custom logic here to check that funds are in the staking contract (if needed)
-    if is_convex:
-        assert rewardsContract.balanceOf(newStrategy) > 0
-        print("\nAssets Staked: ", rewardsContract.balanceOf(newStrategy) / 1e18)
-    else:
-        assert newStrategy.stakedBalance() > 0
-        print("\nAssets Staked: ", newStrategy.stakedBalance() / 1e18)
+    assert newStrategy.stakedBalance() > 0
+    print("\nAssets Staked: ", newStrategy.stakedBalance() / 1e18)
 
     # simulate some earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    travel(sleep_time)
 
     # harvest after a day, store new asset amount
     newStrategy.harvest({"from": gov})
@@ -243,8 +139,7 @@ def test_cloning(
     )
 
     # simulate a day of waiting for share price to bump back up
-    chain.sleep(86400)
-    chain.mine(1)
+    travel(86400)
 
     # withdraw and confirm we made money, or at least that we have about the same
     vault.withdraw({"from": whale})
@@ -2,6 +2,7 @@ import math
 import brownie
 from brownie import Contract
 from brownie import config
+from utils.time_travel import travel
 
 # test that emergency exit works properly
 def test_emergency_exit(
@@ -15,42 +16,34 @@ def test_emergency_exit(
     is_slippery,
     no_profit,
     sleep_time,
+    funded_strategy,
+    starting_whale,
 ):
-    ## deposit to the vault after approving
-    startingWhale = token.balanceOf(whale)
-    token.approve(vault, 2 ** 256 - 1, {"from": whale})
-    vault.deposit(amount, {"from": whale})
-    chain.sleep(1)
-    strategy.harvest({"from": gov})
-    chain.sleep(1)
-
     # simulate earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
-    chain.sleep(1)
+    travel(sleep_time)
+    travel(1, blocks=0)
     strategy.harvest({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
 
     # set emergency and exit, then confirm that the strategy has no funds
     strategy.setEmergencyExit({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.harvest({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
     assert strategy.estimatedTotalAssets() == 0
 
     # simulate a day of waiting for share price to bump back up
-    chain.sleep(86400)
-    chain.mine(1)
+    travel(86400)
 
     # withdraw and confirm we made money, or at least that we have about the same
     vault.withdraw({"from": whale})
     if is_slippery and no_profit:
         assert (
-            math.isclose(token.balanceOf(whale), startingWhale, abs_tol=10)
-            or token.balanceOf(whale) >= startingWhale
+            math.isclose(token.balanceOf(whale), starting_whale, abs_tol=10)
+            or token.balanceOf(whale) >= starting_whale
         )
     else:
-        assert token.balanceOf(whale) >= startingWhale
+        assert token.balanceOf(whale) >= starting_whale
 
 
 # test emergency exit, but with a donation (profit)
@@ -71,30 +64,28 @@ def test_emergency_exit_with_profit(
     startingWhale = token.balanceOf(whale)
     token.approve(vault, 2 ** 256 - 1, {"from": whale})
     vault.deposit(amount, {"from": whale})
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.harvest({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
 
     # simulate earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
-    chain.sleep(1)
+    travel(sleep_time)
+    travel(1, blocks=0)
     strategy.harvest({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
 
     # set emergency and exit, then confirm that the strategy has no funds
     donation = amount / 2
     token.transfer(strategy, donation, {"from": whale})
     strategy.setDoHealthCheck(False, {"from": gov})
     strategy.setEmergencyExit({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.harvest({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
     assert strategy.estimatedTotalAssets() == 0
 
     # simulate a day of waiting for share price to bump back up
-    chain.sleep(86400)
-    chain.mine(1)
+    travel(86400)
 
     # withdraw and confirm we made money, or at least that we have about the same
     vault.withdraw({"from": whale})
@@ -127,9 +118,9 @@ def test_emergency_exit_with_loss(
     startingWhale = token.balanceOf(whale)
     token.approve(vault, 2 ** 256 - 1, {"from": whale})
     vault.deposit(amount, {"from": whale})
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.harvest({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
 
       # our whale donates 1 wei to the vault so we don't divide by zero (0.3.2 vault, errors in vault._reportLoss)
     token.transfer(strategy, 1, {"from": whale})
@@ -137,14 +128,13 @@ def test_emergency_exit_with_loss(
     # set emergency and exit, then confirm that the strategy has no funds
     strategy.setEmergencyExit({"from": gov})
     strategy.setDoHealthCheck(False, {"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.harvest({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
     assert strategy.estimatedTotalAssets() == 0
 
     # simulate a day of waiting for share price to bump back up
-    chain.sleep(86400)
-    chain.mine(1)
+    travel(86400)
 
     # withdraw and see how down bad we are
     vault.withdraw({"from": whale})
@@ -178,22 +168,21 @@ def test_emergency_exit_with_no_loss(
     token.approve(vault, 2 ** 256 - 1, {"from": whale})
     vault.deposit(amount, {"from": whale})
     depositSharePrice = vault.pricePerShare()
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.harvest({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
 
     # set emergency and exit, then confirm that the strategy has no funds
     strategy.setEmergencyExit({"from": gov})
     strategy.setDoHealthCheck(False, {"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
     tx = strategy.harvest({"from": gov})
     assert tx.events["Harvested"]["loss"] == 0
-    chain.sleep(1)
+    travel(1, blocks=0)
     assert strategy.estimatedTotalAssets() == 0
 
     # simulate a day of waiting for share price to bump back up
-    chain.sleep(86400)
-    chain.mine(1)
+    travel(86400)
 
     # withdraw and confirm we have about the same when including convex profit
     whale_profit = (
@@ -231,13 +220,12 @@ def test_emergency_withdraw_method_0(
     startingWhale = token.balanceOf(whale)
     token.approve(vault, 2 ** 256 - 1, {"from": whale})
     vault.deposit(amount, {"from": whale})
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.harvest({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
 
     # simulate earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    travel(sleep_time)
 
     # set emergency exit so no funds will go back to strategy
     # here we assume that the swap out to curve pool tokens is borked, so we stay in cvx vault tokens and send to gov
@@ -252,9 +240,9 @@ def test_emergency_withdraw_method_0(
 
     # turn off health check since we're doing weird shit
     strategy.setDoHealthCheck(False, {"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.harvest({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
     assert strategy.estimatedTotalAssets() == 0
     assert rewardsContract.balanceOf(strategy) == 0
     assert cvxDeposit.balanceOf(strategy) > 0
@@ -284,12 +272,11 @@ def test_emergency_withdraw_method_1(
     startingWhale = token.balanceOf(whale)
     token.approve(vault, 2 ** 256 - 1, {"from": whale})
     vault.deposit(amount, {"from": whale})
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.harvest({"from": gov})
 
     # simulate earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    travel(sleep_time)
 
     # set emergency exit so no funds will go back to strategy
     # here we assume that the swap out to curve pool tokens is borked, so we stay in cvx vault tokens and send to gov
@@ -304,7 +291,7 @@ def test_emergency_withdraw_method_1(
 
     # turn off health check since we're doing weird shit
     strategy.setDoHealthCheck(False, {"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.harvest({"from": gov})
     assert strategy.estimatedTotalAssets() == 0
     assert rewardsContract.balanceOf(strategy) == 0
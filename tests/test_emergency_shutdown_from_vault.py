@@ -2,6 +2,7 @@ import brownie
 from brownie import Contract
 from brownie import config
 import math
+from utils.time_travel import travel
 
 # test calling emergency shutdown from the vault, harvesting to ensure we can get all assets out
 def test_emergency_shutdown_from_vault(
@@ -15,41 +16,34 @@ def test_emergency_shutdown_from_vault(
     sleep_time,
     is_slippery,
     no_profit,
+    funded_strategy,
+    starting_whale,
 ):
-    ## deposit to the vault after approving
-    startingWhale = token.balanceOf(whale)
-    token.approve(vault, 2 ** 256 - 1, {"from": whale})
-    vault.deposit(amount, {"from": whale})
-    chain.sleep(1)
-    strategy.harvest({"from": gov})
-    chain.sleep(1)
-
     # simulate earnings
-    chain.sleep(sleep_time)
+    travel(sleep_time, blocks=0)
 
-    chain.mine(1)
+    travel()
     strategy.harvest({"from": gov})
 
     # simulate earnings
-    chain.sleep(sleep_time)
+    travel(sleep_time, blocks=0)
 
     # set emergency and exit, then confirm that the strategy has no funds
     vault.setEmergencyShutdown(True, {"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.harvest({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
     assert math.isclose(strategy.estimatedTotalAssets(), 0, abs_tol=5)
 
     # simulate a day of waiting for share price to bump back up
-    chain.sleep(86400)
-    chain.mine(1)
+    travel(86400)
 
     # withdraw and confirm we made money, or at least that we have about the same
     vault.withdraw({"from": whale})
     if is_slippery and no_profit:
         assert (
-            math.isclose(token.balanceOf(whale), startingWhale, abs_tol=10)
-            or token.balanceOf(whale) >= startingWhale
+            math.isclose(token.balanceOf(whale), starting_whale, abs_tol=10)
+            or token.balanceOf(whale) >= starting_whale
         )
     else:
-        assert token.balanceOf(whale) >= startingWhale
+        assert token.balanceOf(whale) >= starting_whale
@@ -0,0 +1,25 @@
+from brownie import interface
+from utils.time_travel import travel
+
+# our one-call profit estimate should match what the next harvest actually reports
+def test_estimated_harvest_profit(gov, funded_strategy, sleep_time, no_profit):
+    strategy = funded_strategy
+    travel(sleep_time)
+    estimate = strategy.estimatedHarvestProfit()
+    print("Estimated profit:", estimate / 1e18)
+
+    tx = strategy.harvest({"from": gov})
+    profit = tx.events["Harvested"]["profit"]
+    print("Actual profit:", profit / 1e18)
+    if no_profit:
+        assert estimate == 0
+    else:
+        assert estimate > 0
+        # calc_token_amount leaves out the imbalance fee, which on a one-sided 2pool deposit is at most the swap fee
+        fee = interface.ICurveFi(strategy.curve()).fee() / 1e10
+        assert profit >= estimate * (1 - fee)
+        # and the harvest mines a few seconds later, with that much more CRV to sell
+        assert profit <= estimate * (1 + 10 / sleep_time)
+
+    # right after a harvest there's nothing left to report
+    assert strategy.estimatedHarvestProfit() < estimate
@@ -0,0 +1,167 @@
+import pytest
+from utils.gas import check_gas
+from utils.time_travel import travel
+
+# gas for every path through harvest, withdrawals and migration, checked against tests/gas_baseline.json.
+# only the mock chain sends exactly the same transactions every run, so that's the only place we benchmark.
+
+
+@pytest.fixture(scope="module")
+def mocks(tests_using_mocks, request):
+    if not tests_using_mocks:
+        pytest.skip("gas benchmarks need the mock chain, set use_mocks in conftest.py")
+    yield request.getfixturevalue("mock_infrastructure")
+
+
+# prepareReturn with nothing to sell or deposit, just the mint, accounting and report
+def test_harvest_no_crv(mocks, funded_strategy, gov):
+    strategy = funded_strategy
+    mocks.gauge.setEmissionRate(0, {"from": gov})
+    # clear out whatever accrued before the rate hit zero
+    strategy.harvest({"from": gov})
+    travel(1, blocks=0)
+    tx = strategy.harvest({"from": gov})
+    assert tx.events["Harvested"]["profit"] == 0
+    check_gas("harvest_no_crv", tx)
+
+
+@pytest.mark.parametrize(
+    "optimal,path", [(0, "harvest_crv_to_dai"), (1, "harvest_crv_to_usdc")]
+)
+def test_harvest_sell_crv(mocks, funded_strategy, gov, sleep_time, optimal, path):
+    strategy = funded_strategy
+    strategy.setOptimal(optimal, {"from": gov})
+    travel(sleep_time)
+    tx = strategy.harvest({"from": gov})
+    assert tx.events["Harvested"]["profit"] > 0
+    check_gas(path, tx)
+
+
+# a low-emission harvest: the CRV is below minCrvToSell, so it waits for the next harvest instead of paying for a swap
+def test_harvest_crv_dust(mocks, funded_strategy, crv, gov):
+    strategy = funded_strategy
+    mocks.gauge.setEmissionRate(1e12, {"from": gov})
+    strategy.harvest({"from": gov})
+    travel(1, blocks=0)
+    tx = strategy.harvest({"from": gov})
+    assert 0 < crv.balanceOf(strategy) < strategy.minCrvToSell()
+    check_gas("harvest_crv_dust", tx)
+
+
+# the same harvest with both thresholds off, which is what every harvest did before we had them
+def test_harvest_crv_dust_unthresholded(mocks, funded_strategy, crv, gov):
+    strategy = funded_strategy
+    strategy.setDustThresholds(0, 0, {"from": gov})
+    mocks.gauge.setEmissionRate(1e12, {"from": gov})
+    strategy.harvest({"from": gov})
+    travel(1, blocks=0)
+    tx = strategy.harvest({"from": gov})
+    assert crv.balanceOf(strategy) == 0
+    check_gas("harvest_crv_dust_unthresholded", tx)
+
+
+# debt ratio cut in half, so prepareReturn pulls _debtOutstanding out of the gauge
+def test_harvest_debt_outstanding(mocks, funded_strategy, vault, gov, sleep_time):
+    strategy = funded_strategy
+    vault.updateStrategyDebtRatio(strategy, 5_000, {"from": gov})
+    travel(sleep_time)
+    tx = strategy.harvest({"from": gov})
+    assert tx.events["Harvested"]["debtPayment"] > 0
+
+    # one trip out of the gauge for exactly what we owe, and nothing left over to stake again
+    gauge_calls = [
+        call["function"] for call in tx.subcalls if call["to"] == mocks.gauge.address
+    ]
+    assert gauge_calls.count("withdraw(uint256)") == 1
+    assert "deposit(uint256)" not in gauge_calls
+    check_gas("harvest_debt_outstanding", tx)
+
+
+# a donation of gauge tokens is profit we have no loose want for, so prepareReturn takes just that out of the gauge
+def test_harvest_profit_from_stake(mocks, funded_strategy, gov, whale, amount):
+    strategy = funded_strategy
+    mocks.gauge.setEmissionRate(0, {"from": gov})
+    strategy.harvest({"from": gov})
+    donation = amount // 10
+    mocks.pool.approve(mocks.gauge, donation, {"from": whale})
+    mocks.gauge.deposit(donation, {"from": whale})
+    mocks.gauge.transfer(strategy, donation, {"from": whale})
+    travel(1, blocks=0)
+    tx = strategy.harvest({"from": gov})
+    assert tx.events["Harvested"]["profit"] >= donation
+    assert strategy.stakedBalance() > 0
+    check_gas("harvest_profit_from_stake", tx)
+
+
+# a harvest with new credit from the vault and nothing else to do, so the difference is adjustPosition's deposit
+def test_adjust_position(mocks, funded_strategy, vault, gov, whale, amount):
+    strategy = funded_strategy
+    mocks.gauge.setEmissionRate(0, {"from": gov})
+    strategy.harvest({"from": gov})
+    vault.deposit(amount // 2, {"from": whale})
+    travel(1, blocks=0)
+    tx = strategy.harvest({"from": gov})
+    assert tx.events["StrategyReported"]["debtAdded"] > 0
+    check_gas("adjust_position", tx)
+
+
+@pytest.mark.parametrize(
+    "fraction,path", [(2, "liquidate_position_partial"), (1, "liquidate_position_full")]
+)
+def test_liquidate_position(mocks, funded_strategy, vault, whale, fraction, path):
+    shares = vault.balanceOf(whale) // fraction
+    tx = vault.withdraw(shares, {"from": whale})
+    check_gas(path, tx)
+
+
+# same gauge, so our gauge tokens move over and the new strategy's first harvest has nothing to stake
+def test_prepare_migration(
+    mocks, funded_strategy, vault, gov, strategist, contract_name, strategy_params
+):
+    strategy = funded_strategy
+    staked = strategy.stakedBalance()
+    new_strategy = strategist.deploy(contract_name, vault, *strategy_params)
+    tx = vault.migrateStrategy(strategy, new_strategy, {"from": gov})
+    assert strategy.stakedBalance() == 0
+    assert new_strategy.stakedBalance() == staked
+    assert "withdraw(uint256)" not in [call["function"] for call in tx.subcalls]
+    check_gas("prepare_migration", tx)
+
+    travel(1, blocks=0)
+    tx = new_strategy.harvest({"from": gov})
+    assert "deposit(uint256)" not in [call["function"] for call in tx.subcalls]
+    check_gas("harvest_after_migration", tx)
+
+
+# a new strategy on another gauge can't take our position, so we fall back to unstaking
+def test_prepare_migration_unstake(
+    mocks, funded_strategy, vault, gov, strategist, contract_name, strategy_params
+):
+    from brownie import MockGauge
+
+    strategy = funded_strategy
+    other_gauge = MockGauge.deploy({"from": gov})
+    other_gauge.initialize(mocks.pool, mocks.gauge_factory, {"from": gov})
+    new_strategy = strategist.deploy(
+        contract_name, vault, other_gauge, *strategy_params[1:]
+    )
+    tx = vault.migrateStrategy(strategy, new_strategy, {"from": gov})
+    assert strategy.stakedBalance() == 0
+    assert new_strategy.balanceOfWant() > 0
+    check_gas("prepare_migration_unstake", tx)
+
+
+# a new vault's strategy as a minimal proxy, compared with deploying the whole contract again
+def test_clone(mocks, strategy, vault, gov, strategist, rewards, keeper):
+    tx = strategy.cloneCurve2Pool(
+        vault,
+        strategist,
+        rewards,
+        keeper,
+        strategy.gauge(),
+        strategy.curve(),
+        {"from": gov},
+    )
+    check_gas("clone", tx)
+    # what the clone saves is only visible next to a full deploy, so keep that in the baseline too
+    check_gas("deploy", strategy.tx)
@@ -0,0 +1,61 @@
+from brownie import interface
+from scripts.gas_flamegraph import (
+    INTRINSIC,
+    MAX_REFUND_QUOTIENT,
+    REFUND,
+    GasFlamegraph,
+    collapse,
+)
+from utils.time_travel import travel
+
+# make sure a harvest's collapsed stacks account for all of its gas and sum up across transactions
+def test_gas_flamegraph(gov, vault, funded_strategy, sleep_time, tmp_path):
+    strategy = funded_strategy
+    # so their frames are named after what they do rather than <UnknownContract>
+    interface.IGauge(strategy.gauge())
+    interface.IUniswapV2Router02(strategy.spooky())
+    # with debt outstanding the harvest has to leave the gauge as well as sell CRV
+    vault.updateStrategyDebtRatio(strategy, 5_000, {"from": gov})
+    travel(sleep_time)
+    tx = strategy.harvest({"from": gov})
+
+    stacks = collapse(tx)
+    assert all(
+        stack in (INTRINSIC, REFUND) or stack.split(";")[0].endswith(".harvest")
+        for stack in stacks
+    )
+    assert any("prepareReturn" in stack for stack in stacks)
+
+    # every step is charged to exactly one stack, so together they're all the gas the trace spent
+    trace = tx.trace
+    executed = trace[0]["gas"] - (trace[-1]["gas"] - trace[-1]["gasCost"])
+    traced = sum(
+        gas for stack, gas in stacks.items() if stack not in (INTRINSIC, REFUND)
+    )
+    assert traced == executed
+
+    # the first step gets the gas limit less what was charged up front, which is exactly our intrinsic gas
+    intrinsic = stacks[INTRINSIC]
+    assert intrinsic == tx.gas_limit - trace[0]["gas"]
+
+    # and the refund is what brings that down to what we paid, within the cap
+    refund = -stacks[REFUND]
+    print("Intrinsic:", intrinsic, "traced:", traced, "refund:", refund)
+    assert 0 <= refund <= (intrinsic + traced) // MAX_REFUND_QUOTIENT
+    assert intrinsic + traced - refund == tx.gas_used
+
+    frames = {frame for stack in stacks for frame in stack.split(";")}
+    assert "IGauge.withdraw" in frames
+    assert "IUniswapV2Router02.swapExactTokensForTokens" in frames
+
+    flamegraph = GasFlamegraph()
+    flamegraph.add(tx)
+    flamegraph.add(tx)
+    assert flamegraph.transactions == 2
+    assert all(flamegraph.stacks[stack] == 2 * gas for stack, gas in stacks.items())
+
+    path = tmp_path / "harvest.folded"
+    flamegraph.write(path)
+    lines = path.read_text().splitlines()
+    assert len(lines) == sum(gas > 0 for gas in stacks.values())
+    print("Hottest frames:", flamegraph.hottest(5))
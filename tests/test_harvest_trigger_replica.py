@@ -0,0 +1,61 @@
+from brownie import chain
+from scripts.harvest_trigger import (
+    CREDIT_THRESHOLD,
+    FORCE_HARVEST,
+    HarvestTriggerPoller,
+    MAX_PROFIT,
+    MAX_REPORT_DELAY,
+    MIN_REPORT_DELAY,
+    NOTHING,
+)
+from utils.time_travel import travel
+
+# check our off-chain harvestTrigger against the real one at the same block
+def check_replica(poller, strategy, expected_reason=None):
+    travel()
+    block = chain.height
+    [(_, should_harvest, reason)] = poller.poll(block)
+    assert should_harvest == strategy.harvestTrigger(0, block_identifier=block)
+    if expected_reason is not None:
+        assert reason == expected_reason
+    print("Should we harvest?", should_harvest, "Why:", reason)
+    return should_harvest
+
+
+def test_harvest_trigger_replica(
+    gov, token, vault, whale, strategy, amount, sleep_time,
+):
+    poller = HarvestTriggerPoller([strategy])
+
+    ## deposit to the vault after approving, we have more credit than our threshold now
+    token.approve(vault, 2 ** 256 - 1, {"from": whale})
+    vault.deposit(amount, {"from": whale})
+    strategy.setCreditThreshold(amount / 2, {"from": gov})
+    assert check_replica(poller, strategy, CREDIT_THRESHOLD)
+
+    # harvest the credit, nothing should be ready now
+    travel(1, blocks=0)
+    strategy.harvest({"from": gov})
+    assert not check_replica(poller, strategy, NOTHING)
+
+    # manual trigger, then it resets on harvest
+    strategy.setForceHarvestTriggerOnce(True, {"from": gov})
+    assert check_replica(poller, strategy, FORCE_HARVEST)
+    travel(1, blocks=0)
+    strategy.harvest({"from": gov})
+    assert not check_replica(poller, strategy, NOTHING)
+
+    # both of our delays
+    travel(sleep_time, blocks=0)
+    strategy.setMinReportDelay(sleep_time - 1, {"from": gov})
+    assert check_replica(poller, strategy, MIN_REPORT_DELAY)
+    strategy.setHarvestTriggerParams(0, 0, 1e24, 10, {"from": gov})
+    if strategy.estimatedHarvestProfit() > 0:
+        assert check_replica(poller, strategy, MAX_PROFIT)
+    strategy.setHarvestTriggerParams(0, 50_000e18, 1e24, 10, {"from": gov})
+    strategy.setMaxReportDelay(sleep_time - 1, {"from": gov})
+    assert check_replica(poller, strategy, MAX_REPORT_DELAY)
+
+    # one multicall should serve many strategies at once
+    many = HarvestTriggerPoller([strategy] * 20)
+    assert all(should_harvest for _, should_harvest, _ in many.poll())
@@ -2,10 +2,12 @@ import brownie
 from brownie import Contract
 from brownie import config
 import math
+from utils.time_travel import travel
 
 # test migrating a strategy
 def test_migration(
     contract_name,
+    strategy_params,
     gov,
     token,
     vault,
@@ -21,21 +23,15 @@ def test_migration(
     strategy_name,
     sleep_time,
     is_convex,
+    funded_strategy,
+    starting_whale,
 ):
-
-    ## deposit to the vault after approving
-    startingWhale = token.balanceOf(whale)
-    token.approve(vault, 2 ** 256 - 1, {"from": whale})
-    vault.deposit(amount, {"from": whale})
-    chain.sleep(1)
-    strategy.harvest({"from": gov})
-    chain.sleep(1)
-
     if is_convex:
         # make sure to include all constructor parameters needed here
         new_strategy = strategist.deploy(
             contract_name,
             vault,
+            *strategy_params,
         )
 
         # can we harvest an unactivated strategy? should be no
@@ -47,13 +43,14 @@ def test_migration(
         new_strategy = strategist.deploy(
             contract_name,
             vault,
+            *strategy_params,
         )
         # harvestTrigger check for isActive() doesn't work if we have multiple curve strategies for the same LP
 
     total_old = strategy.estimatedTotalAssets()
 
     # sleep to collect earnings
-    chain.sleep(sleep_time)
+    travel(sleep_time, blocks=0)
 
     # migrate our old strategy
     vault.migrateStrategy(strategy, new_strategy, {"from": gov})
@@ -64,8 +61,13 @@ def test_migration(
     updated_total_old = strategy.estimatedTotalAssets()
     assert updated_total_old == 0
 
+    # same gauge, so our staked position moves over as is instead of being unstaked
+    if not is_convex:
+        assert new_strategy.stakedBalance() > 0
+        assert new_strategy.balanceOfWant() == 0
+
     # harvest to get funds back in strategy
-    chain.sleep(1)
+    travel(1, blocks=0)
     new_strategy.harvest({"from": gov})
     new_strat_balance = new_strategy.estimatedTotalAssets()
 
@@ -78,8 +80,7 @@ def test_migration(
     print("\nVault starting assets with new strategy: ", startingVault)
 
     # simulate earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    travel(sleep_time)
 
     # Test out our migrated strategy, confirm we're making a profit
     new_strategy.harvest({"from": gov})
@@ -2,6 +2,7 @@ import brownie
 from brownie import Contract
 from brownie import config
 import math
+from utils.time_travel import travel
 
 
 def test_odds_and_ends(
@@ -14,6 +15,7 @@ def test_odds_and_ends(
     chain,
     strategist_ms,
     contract_name,
+    strategy_params,
     pid,
     crv,
     amount,
@@ -30,18 +32,17 @@ def test_odds_and_ends(
     startingWhale = token.balanceOf(whale)
     token.approve(vault, 2 ** 256 - 1, {"from": whale})
     vault.deposit(amount, {"from": whale})
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.harvest({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
 
           # our whale donates 1 wei to the vault so we don't divide by zero (0.3.5 vault errors in vault._reportLoss)
     token.transfer(strategy, 1, {"from": whale})
 
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    travel(sleep_time)
     strategy.setDoHealthCheck(False, {"from": gov})
     strategy.harvest({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
 
     # we can also withdraw from an empty vault as well
     vault.withdraw({"from": whale})
@@ -60,6 +61,7 @@ def test_odds_and_ends(
         new_strategy = strategist.deploy(
             contract_name,
             vault,
+            *strategy_params,
         )
 
     total_old = strategy.estimatedTotalAssets()
@@ -79,8 +81,7 @@ def test_odds_and_ends(
     print("\nVault starting assets with new strategy: ", startingVault)
 
     # simulate one day of earnings
-    chain.sleep(86400)
-    chain.mine(1)
+    travel(86400)
 
     # Test out our migrated strategy, confirm we're making a profit
     new_strategy.harvest({"from": gov})
@@ -98,9 +99,9 @@ def test_odds_and_ends(
     strategy.isActive()
 
     # tend stuff
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.tend({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.tendTrigger(0, {"from": gov})
 
 
@@ -123,17 +124,17 @@ def test_odds_and_ends_2(
     startingWhale = token.balanceOf(whale)
     token.approve(vault, 2 ** 256 - 1, {"from": whale})
     vault.deposit(amount, {"from": whale})
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.harvest({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
 
         # our whale donates 1 wei to the vault so we don't divide by zero (0.3.5 vault errors in vault._reportLoss)
     token.transfer(strategy, 1, {"from": whale})
 
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.setDoHealthCheck(False, {"from": gov})
     strategy.harvest({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
 
     # we can also withdraw from an empty vault as well
     vault.withdraw({"from": whale})
@@ -141,6 +142,7 @@ def test_odds_and_ends_2(
 
 def test_odds_and_ends_migration(
     contract_name,
+    strategy_params,
     gov,
     token,
     vault,
@@ -155,15 +157,8 @@ def test_odds_and_ends_migration(
     strategy_name,
     is_convex,
     sleep_time,
+    funded_strategy,
 ):
-
-    ## deposit to the vault after approving
-    token.approve(vault, 2 ** 256 - 1, {"from": whale})
-    vault.deposit(amount, {"from": whale})
-    chain.sleep(1)
-    strategy.harvest({"from": gov})
-    chain.sleep(1)
-
     # deploy our new strategy
     if is_convex:
         new_strategy = strategist.deploy(
@@ -177,6 +172,7 @@ def test_odds_and_ends_migration(
         new_strategy = strategist.deploy(
             contract_name,
             vault,
+            *strategy_params,
         )
     total_old = strategy.estimatedTotalAssets()
 
@@ -187,7 +183,7 @@ def test_odds_and_ends_migration(
         assert tx == False
 
     # sleep
-    chain.sleep(sleep_time)
+    travel(sleep_time, blocks=0)
 
     # migrate our old strategy
     vault.migrateStrategy(strategy, new_strategy, {"from": gov})
@@ -196,7 +192,7 @@ def test_odds_and_ends_migration(
     assert updated_total_old == 0
 
     # harvest to get funds back in strategy
-    chain.sleep(1)
+    travel(1, blocks=0)
     new_strategy.harvest({"from": gov})
     new_strat_balance = new_strategy.estimatedTotalAssets()
 
@@ -209,12 +205,10 @@ def test_odds_and_ends_migration(
     print("\nVault starting assets with new strategy: ", startingVault)
 
     # simulate one day of earnings
-    chain.sleep(86400)
-    chain.mine(1)
+    travel(86400)
 
     # simulate a day of waiting for share price to bump back up
-    chain.sleep(86400)
-    chain.mine(1)
+    travel(86400)
 
     # Test out our migrated strategy, confirm we're making a profit
     new_strategy.harvest({"from": gov})
@@ -254,9 +248,9 @@ def test_odds_and_ends_liquidatePosition(
         stakingBeforeHarvest = strategy.stakedBalance()
 
     # harvest, store asset amount
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.harvest({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
     old_assets = vault.totalAssets()
     assert old_assets > 0
     assert token.balanceOf(strategy) == 0
@@ -270,13 +264,12 @@ def test_odds_and_ends_liquidatePosition(
         stakingBeforeHarvest < strategy.stakedBalance()
 
     # simulate time for earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    travel(sleep_time)
 
     # harvest, store new asset amount
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.harvest({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
     new_assets = vault.totalAssets()
 
     # confirm we made money, or at least that we have about the same
@@ -292,8 +285,7 @@ def test_odds_and_ends_liquidatePosition(
         ),
     )
     # simulate a day of waiting for share price to bump back up
-    chain.sleep(86400)
-    chain.mine(1)
+    travel(86400)
 
     # transfer funds to our strategy so we have enough for our withdrawal
     token.transfer(strategy, amount, {"from": whale})
@@ -330,19 +322,18 @@ def test_odds_and_ends_rekt(
     startingWhale = token.balanceOf(whale)
     token.approve(vault, 2 ** 256 - 1, {"from": whale})
     vault.deposit(amount, {"from": whale})
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.harvest({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
     # our whale donates 1 wei to the vault so we don't divide by zero (0.3.5 vault errors in vault._reportLoss)
     token.transfer(strategy, 1, {"from": whale})
 
     vault.updateStrategyDebtRatio(strategy, 0, {"from": gov})
 
     strategy.setDoHealthCheck(False, {"from": gov})
-    chain.sleep(1)
-    chain.mine(1)
+    travel(1)
     tx = strategy.harvest({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
 
     # we can also withdraw from an empty vault as well
     vault.withdraw({"from": whale})
@@ -367,9 +358,9 @@ def test_odds_and_ends_liquidate_rekt(
     startingWhale = token.balanceOf(whale)
     token.approve(vault, 2 ** 256 - 1, {"from": whale})
     vault.deposit(amount, {"from": whale})
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.harvest({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
 
 
     # we can also withdraw from an empty vault as well, but make sure we're okay with losing 100%
@@ -423,27 +414,21 @@ def test_odds_and_ends_empty_strat(
     no_profit,
     is_convex,
     gauge_is_not_tokenized,
+    funded_strategy,
 ):
-    ## deposit to the vault after approving
-    token.approve(vault, 2 ** 256 - 1, {"from": whale})
-    vault.deposit(amount, {"from": whale})
-    chain.sleep(1)
-    strategy.harvest({"from": gov})
-    chain.sleep(1)
-
     ## move our funds out of the strategy
     startingDebtRatio = vault.strategies(strategy)["debtRatio"]
     vault.updateStrategyDebtRatio(strategy, 0, {"from": gov})
-    chain.sleep(sleep_time)
+    travel(sleep_time, blocks=0)
     strategy.harvest({"from": gov})
 
     ## move our funds back into the strategy
     vault.updateStrategyDebtRatio(strategy, startingDebtRatio, {"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.harvest({"from": gov})
 
     # sleep to generate some profit
-    chain.sleep(sleep_time)
+    travel(sleep_time, blocks=0)
 
 
 
@@ -451,7 +436,7 @@ def test_odds_and_ends_empty_strat(
     token.transfer(strategy, 1, {"from": whale})
 
     # harvest to check that it works okay, turn off health check since we'll have profit without any (or most) assets lol
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.setDoHealthCheck(False, {"from": gov})
     tx = strategy.harvest({"from": gov})
     print("Harvest Profit with no assets:", tx.events["Harvested"]["profit"] / 1e18)
@@ -472,31 +457,25 @@ def test_odds_and_ends_no_profit(
     is_slippery,
     no_profit,
     is_convex,
+    funded_strategy,
+    starting_whale,
 ):
-    ## deposit to the vault after approving
-    startingWhale = token.balanceOf(whale)
-    token.approve(vault, 2 ** 256 - 1, {"from": whale})
-    vault.deposit(amount, {"from": whale})
-    chain.sleep(1)
-    strategy.harvest({"from": gov})
-    chain.sleep(1)
-
     # sleep two weeks into the future so we need to earmark, harvest to clear our profit
     strategy.setDoHealthCheck(False, {"from": gov})
-    chain.sleep(86400 * 14)
+    travel(86400 * 14, blocks=0)
     tx = strategy.harvest({"from": gov})
 
-    chain.mine(1)
-    chain.sleep(1)
+    travel()
+    travel(1, blocks=0)
     # withdraw and confirm we made money, or at least that we have about the same
     vault.withdraw({"from": whale})
     if is_slippery and no_profit:
         assert (
-            math.isclose(token.balanceOf(whale), startingWhale, abs_tol=10)
-            or token.balanceOf(whale) >= startingWhale
+            math.isclose(token.balanceOf(whale), starting_whale, abs_tol=10)
+            or token.balanceOf(whale) >= starting_whale
         )
     else:
-        assert token.balanceOf(whale) >= startingWhale
+        assert token.balanceOf(whale) >= starting_whale
 
 
 
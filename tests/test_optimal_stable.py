@@ -0,0 +1,50 @@
+import brownie
+from scripts.addresses import DAI, USDC
+from scripts.optimal_stable import TargetStableSelector
+from utils.time_travel import travel
+
+# make sure our keeper picks the stable that mints the most LP, and only pays gas when it's worth it
+def test_optimal_stable(
+    gov, token, vault, whale, strategy, amount, sleep_time, management,
+):
+    ## deposit to the vault after approving
+    token.approve(vault, 2 ** 256 - 1, {"from": whale})
+    vault.deposit(amount, {"from": whale})
+    travel(1, blocks=0)
+    strategy.harvest({"from": gov})
+    travel(sleep_time)
+
+    selector = TargetStableSelector(strategy)
+    # whatever pool and gauge this strategy was deployed with, not the ones in scripts/addresses.py
+    assert selector.pool.address == strategy.curve()
+    assert selector.gauge.address == strategy.gauge()
+    crv_amount = selector.expected_crv()
+    print("CRV we expect to sell:", crv_amount / 1e18)
+    if crv_amount == 0:
+        return
+
+    # what each stable gets us, in LP
+    selector.refresh()
+    lp = selector.lp_out(crv_amount)
+    best = max(lp, key=lambda stable: lp[stable])
+    other = USDC if best == DAI else DAI
+    print("LP from DAI:", lp[DAI] / 1e18, "LP from USDC:", lp[USDC] / 1e18)
+
+    # start on the worse one. if gas is absurd we shouldn't bother switching
+    strategy.setOptimal(0 if other == DAI else 1, {"from": gov})
+    assert selector.maybe_set_optimal(management, gas_price=10 ** 30) is None
+    assert strategy.targetStable() == other
+
+    # with free gas, any gain is worth it
+    if lp[best] > lp[other]:
+        tx = selector.maybe_set_optimal(management, gas_price=0)
+        assert tx is not None
+        assert strategy.targetStable() == best
+
+    # and once we're there, nothing else to do
+    assert selector.maybe_set_optimal(management, gas_price=0) is None
+
+    # harvesting should get us at least what we predicted, since more CRV accrued since
+    travel(1, blocks=0)
+    tx = strategy.harvest({"from": gov})
+    assert tx.events["Harvested"]["profit"] >= lp[strategy.targetStable()]
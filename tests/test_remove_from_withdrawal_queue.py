@@ -2,6 +2,7 @@ import brownie
 from brownie import Contract
 from brownie import config
 import math
+from utils.time_travel import travel
 
 # test removing a strategy from the withdrawal queue
 def test_remove_from_withdrawal_queue(
@@ -12,20 +13,13 @@ def test_remove_from_withdrawal_queue(
     strategy,
     chain,
     amount,
+    funded_strategy,
+    starting_whale,
 ):
-    ## deposit to the vault after approving
-    startingWhale = token.balanceOf(whale)
-    token.approve(vault, 2 ** 256 - 1, {"from": whale})
-    vault.deposit(amount, {"from": whale})
-    chain.sleep(1)
-    strategy.harvest({"from": gov})
-    chain.sleep(1)
-
     # simulate one day of earnings
-    chain.sleep(86400)
-    chain.mine(1)
+    travel(86400)
     strategy.harvest({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
     before = strategy.estimatedTotalAssets()
 
     # set emergency and exit, then confirm that the strategy has no funds
@@ -2,6 +2,7 @@ import brownie
 from brownie import Contract
 from brownie import config
 import math
+from utils.time_travel import travel
 
 # test revoking a strategy from the vault
 def test_revoke_strategy_from_vault(
@@ -21,21 +22,20 @@ def test_revoke_strategy_from_vault(
     startingWhale = token.balanceOf(whale)
     token.approve(vault, 2 ** 256 - 1, {"from": whale})
     vault.deposit(amount, {"from": whale})
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.harvest({"from": gov})
 
     # sleep to earn some yield
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    travel(sleep_time)
 
     vaultAssets_starting = vault.totalAssets()
     vault_holdings_starting = token.balanceOf(vault)
     strategy_starting = strategy.estimatedTotalAssets()
     vault.revokeStrategy(strategy.address, {"from": gov})
 
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.harvest({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
     vaultAssets_after_revoke = vault.totalAssets()
 
     # confirm we made money, or at least that we have about the same
@@ -46,8 +46,7 @@ def test_revoke_strategy_from_vault(
     assert token.balanceOf(vault) >= vault_holdings_starting + strategy_starting
 
     # simulate a day of waiting for share price to bump back up
-    chain.sleep(86400)
-    chain.mine(1)
+    travel(86400)
 
     # withdraw and confirm we made money, or at least that we have about the same
     vault.withdraw({"from": whale})
@@ -1,6 +1,7 @@
 import brownie
 from brownie import Contract
 from brownie import config
+from utils.time_travel import travel
 
 # test the setters on our strategy
 def test_setters(
@@ -37,7 +38,7 @@ def test_setters(
     startingWhale = token.balanceOf(whale)
     token.approve(vault, 2 ** 256 - 1, {"from": whale})
     vault.deposit(amount, {"from": whale})
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.harvest({"from": gov})
 
     # test our setters in baseStrategy and our main strategy
@@ -46,6 +47,13 @@ def test_setters(
     strategy.setMetadataURI(0, {"from": gov})
     strategy.setMinReportDelay(100, {"from": gov})
     strategy.setRewards(gov, {"from": strategist})
+    strategy.setDustThresholds(0, 0, {"from": gov})
+    assert strategy.minCrvToSell() == 0
+    strategy.setDustThresholds(1e18, 1e18, {"from": gov})
+    assert strategy.minStablesToDeposit() == 1e18
+    strategy.setHarvestTriggerParams(1e18, 100e18, 1e24, 5, {"from": gov})
+    assert strategy.harvestProfitMax() == 100e18
+    assert strategy.profitFactor() == 5
 
 
 
@@ -54,13 +62,13 @@ def test_setters(
     print("Strategy Name:", name)
 
     # health check stuff
-    chain.sleep(86400)
+    travel(86400, blocks=0)
     strategy.harvest({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.setDoHealthCheck(False, {"from": gov})
-    chain.sleep(86400)
+    travel(86400, blocks=0)
     strategy.harvest({"from": gov})
-    chain.sleep(86400)
+    travel(86400, blocks=0)
 
     zero = "0x0000000000000000000000000000000000000000"
 
@@ -78,13 +86,17 @@ def test_setters(
         strategy.setMaxReportDelay(1000, {"from": whale})
     with brownie.reverts():
         strategy.setRewards(strategist, {"from": whale})
+    with brownie.reverts():
+        strategy.setDustThresholds(0, 0, {"from": whale})
+    with brownie.reverts():
+        strategy.setHarvestTriggerParams(0, 0, 0, 0, {"from": whale})
 
 
     # try a health check with zero address as health check
     strategy.setHealthCheck(zero, {"from": gov})
     strategy.setDoHealthCheck(True, {"from": gov})
     strategy.harvest({"from": gov})
-    chain.sleep(86400)
+    travel(86400, blocks=0)
 
 
 #     # try a health check with random contract as health check
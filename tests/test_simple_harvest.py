@@ -2,6 +2,9 @@ import brownie
 from brownie import Contract
 from brownie import config
 import math
+from utils.abi_cache import cached_contract
+from utils.funding import fund
+from utils.time_travel import travel
 
 # test the our strategy's ability to deposit, harvest, and withdraw, with different optimal deposit tokens if we have them
 def test_simple_harvest(
@@ -19,15 +22,13 @@ def test_simple_harvest(
     no_profit,
     is_convex,
     crv,
-    accounts,
 ):
     ## deposit to the vault after approving
     startingWhale = token.balanceOf(whale)
     token.approve(vault, 2 ** 256 - 1, {"from": whale})
     vault.deposit(amount, {"from": whale})
     newWhale = token.balanceOf(whale)
-    chain.sleep(1)
-    chain.mine(1)
+    travel(1)
 
     # this is part of our check into the staking contract balance
     if is_convex:
@@ -41,8 +42,7 @@ def test_simple_harvest(
     # harvest, store asset amount
     tx = strategy.harvest({"from": gov})
     print("Harvest info:", tx.events["Harvested"])
-    chain.sleep(1)
-    chain.mine(1)
+    travel(1)
     old_assets = vault.totalAssets()
     assert old_assets > 0
     assert token.balanceOf(strategy) == 0
@@ -56,13 +56,12 @@ def test_simple_harvest(
         stakingBeforeHarvest < strategy.stakedBalance()
 
     # simulate profits
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    travel(sleep_time)
 
     # harvest, store new asset amount
-    chain.sleep(1)
+    travel(1, blocks=0)
     tx = strategy.harvest({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
     new_assets = vault.totalAssets()
     # confirm we made money, or at least that we have about the same
     assert new_assets >= old_assets
@@ -80,19 +79,14 @@ def test_simple_harvest(
 
     # simulate some profits if we don't have any to make sure everything else works
     if no_profit:
-        crv_whale = accounts.at(
-            "0x32D03DB62e464c9168e41028FFa6E9a05D8C6451", force=True
-        )
-        crv.transfer(strategy, 10_000e18, {"from": crv_whale})
+        fund(crv, strategy, 10_000e18)
 
         # harvest, store new asset amount, turn off health check since we're donating a lot
         old_assets = vault.totalAssets()
-        chain.sleep(1)
-        chain.mine(1)
+        travel(1)
         strategy.setDoHealthCheck(False, {"from": gov})
         tx = strategy.harvest({"from": gov})
-        chain.sleep(1)
-        chain.mine(1)
+        travel(1)
         new_assets = vault.totalAssets()
         # confirm we made money, or at least that we have about the same
         assert new_assets >= old_assets
@@ -110,20 +104,15 @@ def test_simple_harvest(
         assert tx.events["Harvested"]["profit"] > 0
 
         if is_convex:
-            cvx = Contract("0x4e3FBD56CD56c3e72c1403e103b45Db9da5B9D2B")
-            cvx_whale = accounts.at(
-                "0x28C6c06298d514Db089934071355E5743bf21d60", force=True
-            )
-            cvx.transfer(strategy, 1000e18, {"from": cvx_whale})
+            cvx = cached_contract("0x4e3FBD56CD56c3e72c1403e103b45Db9da5B9D2B")
+            fund(cvx, strategy, 1000e18)
 
             # harvest, store new asset amount, turn off health check since we're donating a lot
             old_assets = vault.totalAssets()
-            chain.sleep(1)
-            chain.mine(1)
+            travel(1)
             strategy.setDoHealthCheck(False, {"from": gov})
             tx = strategy.harvest({"from": gov})
-            chain.sleep(1)
-            chain.mine(1)
+            travel(1)
             new_assets = vault.totalAssets()
             # confirm we made money, or at least that we have about the same
             assert new_assets >= old_assets
@@ -157,13 +146,12 @@ def test_simple_harvest(
         stakingBeforeHarvest < strategy.stakedBalance()
 
     # simulate profits
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    travel(sleep_time)
 
     # harvest, store new asset amount
-    chain.sleep(1)
+    travel(1, blocks=0)
     tx = strategy.harvest({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
     after_usdc_assets = vault.totalAssets()
     # confirm we made money, or at least that we have about the same
     assert after_usdc_assets >= before_usdc_assets
@@ -191,13 +179,12 @@ def test_simple_harvest(
         stakingBeforeHarvest < strategy.stakedBalance()
 
     # simulate profits
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    travel(sleep_time)
 
     # harvest, store new asset amount
-    chain.sleep(1)
+    travel(1, blocks=0)
     tx = strategy.harvest({"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
     after_usdt_assets = vault.totalAssets()
     # confirm we made money, or at least that we have about the same
     assert after_usdt_assets >= before_usdt_assets
@@ -211,8 +198,7 @@ def test_simple_harvest(
         ),
     )
         # simulate a day of waiting for share price to bump back up
-    chain.sleep(86400)
-    chain.mine(1)
+    travel(86400)
 
     # withdraw and confirm we made money, or at least that we have about the same
     vault.withdraw({"from": whale})
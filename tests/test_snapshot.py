@@ -0,0 +1,52 @@
+from brownie import chain, interface
+from scripts.snapshot import SnapshotReader
+from utils.time_travel import travel
+
+# a batched snapshot should match reading everything one call at a time
+def test_snapshot_matches_direct_reads(
+    gov, token, vault, whale, strategy, amount, sleep_time,
+):
+    ## deposit to the vault after approving
+    token.approve(vault, 2 ** 256 - 1, {"from": whale})
+    vault.deposit(amount, {"from": whale})
+    travel(1, blocks=0)
+    strategy.harvest({"from": gov})
+    travel(sleep_time)
+
+    # donate a little so we have both loose and staked want
+    token.transfer(strategy, amount / 100, {"from": whale})
+    travel()
+
+    block = chain.height
+    reader = SnapshotReader([strategy])
+    [snapshot] = reader.read(block)
+    print(snapshot)
+
+    call = {"block_identifier": block}
+    assert snapshot.block == block
+    assert snapshot.timestamp == chain[block].timestamp
+    assert snapshot.staked_balance == strategy.stakedBalance(**call)
+    assert snapshot.balance_of_want == strategy.balanceOfWant(**call) > 0
+    assert snapshot.estimated_total_assets == strategy.estimatedTotalAssets(**call)
+    assert snapshot.target_stable == strategy.targetStable(**call)
+    assert snapshot.strategy == strategy.address
+    assert snapshot.vault == vault.address
+    params = vault.strategies(strategy, **call)
+    assert snapshot.params.performance_fee == params["performanceFee"]
+    assert snapshot.params.activation == params["activation"]
+    assert snapshot.params.debt_ratio == params["debtRatio"]
+    assert snapshot.params.min_debt_per_harvest == params["minDebtPerHarvest"]
+    assert snapshot.params.max_debt_per_harvest == params["maxDebtPerHarvest"]
+    assert snapshot.params.last_report == params["lastReport"]
+    assert snapshot.params.total_debt == params["totalDebt"]
+    assert snapshot.params.total_gain == params["totalGain"]
+    assert snapshot.params.total_loss == params["totalLoss"]
+    assert snapshot.credit_available == vault.creditAvailable(strategy, **call)
+    gauge = interface.IGauge(strategy.gauge())
+    assert snapshot.claimable_crv == gauge.claimable_tokens(strategy, **call)
+
+    # snapshots don't carry a __dict__, so hundreds of them stay cheap
+    assert not hasattr(snapshot, "__dict__")
+
+    # many strategies still come back from one read
+    assert len(SnapshotReader([strategy] * 50).read(block)) == 50
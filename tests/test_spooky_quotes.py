@@ -0,0 +1,34 @@
+import numpy as np
+import time
+from brownie import interface
+from scripts.addresses import CRV, DAI, SPOOKY, USDC, WFTM
+from scripts.spooky_quotes import SpookyQuoter
+
+# quote 10k CRV sizes for both stables from one reserve read, then spot check against the router
+def test_spooky_quotes_match_router(chain):
+    router = interface.IUniswapV2Router02(SPOOKY)
+    quoter = SpookyQuoter()
+
+    # 1 wei of CRV up to 10M CRV, log spaced
+    sizes = np.array(
+        sorted({int(10 ** (25 * k / 9_999)) for k in range(10_000)}), dtype=object
+    )
+    block = chain.height
+    start = time.perf_counter()
+    quotes = quoter.quote_all(sizes, block)
+    print(
+        f"\nQuoted {len(sizes)} sizes for {len(quotes)} stables in",
+        f"{(time.perf_counter() - start) * 1000:.1f}ms",
+    )
+
+    for stable in [DAI, USDC]:
+        path = [CRV, WFTM, stable]
+        for k in range(0, len(sizes), len(sizes) // 20):
+            expected = router.getAmountsOut(int(sizes[k]), path)
+            assert quoter.get_amounts_out(sizes[k], path).tolist() == list(expected)
+            assert quotes[stable][k] == expected[-1]
+
+    # same block means no new reads
+    reserves = dict(quoter.reserves)
+    quoter.refresh(block)
+    assert quoter.reserves == reserves and quoter.block == block
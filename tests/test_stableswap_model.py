@@ -0,0 +1,60 @@
+import numpy as np
+from brownie import interface
+from scripts.stableswap import (
+    PoolState,
+    add_liquidity,
+    calc_token_amount,
+    calc_withdraw_one_coin,
+    get_dy,
+    get_virtual_price,
+)
+
+# quote a big grid of deposits with one call, then spot check a sample against the pool itself
+def test_stableswap_model_matches_pool(token, whale, chain):
+    # our want is the 2pool LP, and the pool is its own LP token
+    pool = token
+    state = PoolState.from_pool(pool)
+
+    # from dust up to half of each side of the pool, including one-sided deposits
+    sizes = [
+        [0] + [int(b) * m // 10 ** k for k in range(1, 8) for m in (1, 2, 5)]
+        for b in state.balances
+    ]
+    amounts = np.array(
+        [[u, d] for u in sizes[0] for d in sizes[1] if u or d], dtype=object
+    )
+    print("Scenarios quoted in one call:", len(amounts))
+
+    deposits = calc_token_amount(state, amounts)
+    withdrawals = calc_token_amount(state, amounts, False)
+    minted = add_liquidity(state, amounts)
+    assert (minted <= deposits).all()
+
+    for k in range(0, len(amounts), max(len(amounts) // 25, 1)):
+        row = [int(a) for a in amounts[k]]
+        assert deposits[k] == pool.calc_token_amount(row, True)
+        assert withdrawals[k] == pool.calc_token_amount(row, False)
+
+    assert get_virtual_price(state) == pool.get_virtual_price()
+
+    # swaps and single sided withdrawals
+    lp_sizes = np.array([10 ** k for k in range(15, 24)], dtype=object)
+    for i in range(2):
+        dx = np.array([int(state.balances[i]) // 10 ** k for k in range(1, 8)])
+        dy = get_dy(state, i, 1 - i, dx)
+        out = calc_withdraw_one_coin(state, lp_sizes, i)
+        for k in range(len(dx)):
+            assert dy[k] == pool.get_dy(i, 1 - i, int(dx[k]))
+        for k in range(len(lp_sizes)):
+            assert out[k] == pool.calc_withdraw_one_coin(int(lp_sizes[k]), i)
+
+    # and the LP we predict for a real, lopsided deposit is exactly what gets minted
+    coins = [interface.ERC20(pool.coins(i)) for i in range(2)]
+    pool.remove_liquidity(pool.balanceOf(whale) // 10, [0, 0], {"from": whale})
+    deposit = [coins[0].balanceOf(whale) // 2, coins[1].balanceOf(whale)]
+    for coin in coins:
+        coin.approve(pool, 2 ** 256 - 1, {"from": whale})
+    predicted = add_liquidity(PoolState.from_pool(pool), deposit)
+    before = pool.balanceOf(whale)
+    pool.add_liquidity(deposit, 0, {"from": whale})
+    assert pool.balanceOf(whale) - before == predicted
@@ -0,0 +1,155 @@
+import os
+
+import brownie
+import pytest
+from brownie.test import strategy as st
+from utils.time_travel import travel
+
+# runs times steps is how many operations we make per CI run; every run starts from the same snapshot
+RUNS = int(os.environ.get("STATEFUL_RUNS", 50))
+STEPS = int(os.environ.get("STATEFUL_STEPS", 50))
+
+
+@pytest.fixture(scope="module")
+def mocks(tests_using_mocks, request):
+    if not tests_using_mocks:
+        pytest.skip("stateful tests need the mock chain, set use_mocks in conftest.py")
+    yield request.getfixturevalue("mock_infrastructure")
+
+
+# a whale and a small depositor, both approved. done here, not in the state machine, so it's in the snapshot
+@pytest.fixture(scope="module")
+def depositors(mocks, accounts, whale, token, vault, amount):
+    small = accounts[6]
+    token.transfer(small, amount // 100, {"from": whale})
+    for user in (whale, small):
+        token.approve(vault, 2 ** 256 - 1, {"from": user})
+    yield [whale, small]
+
+
+class StrategyStateMachine:
+    """
+    Deposits, withdrawals, donations, debt ratio changes, setOptimal, emergency exit and harvests in any
+    order. Nothing the strategy does can lose want, so the accounting checks below are exact: no
+    tolerances.
+    """
+
+    st_user = st("uint256", max_value=1)
+    st_bps = st("uint256", min_value=1, max_value=10_000)
+    st_ratio = st("uint256", max_value=10_000)
+    st_optimal = st("uint256", max_value=1)
+    st_sleep = st("uint256", min_value=1, max_value=7 * 86400)
+
+    def __init__(cls, vault, strategy, token, depositors, gov):
+        cls.vault = vault
+        cls.strategy = strategy
+        cls.token = token
+        cls.depositors = depositors
+        cls.gov = gov
+
+    def setup(self):
+        self.pps = self.vault.pricePerShare()
+        self.exited = False
+        self.just_harvested = False
+
+    def _step(self):
+        self.just_harvested = False
+
+    def rule_deposit(self, st_user, st_bps):
+        self._step()
+        user = self.depositors[st_user]
+        amount = self.token.balanceOf(user) * st_bps // 10_000
+        if amount > 0:
+            self.vault.deposit(amount, {"from": user})
+
+    def rule_withdraw(self, st_user, st_bps):
+        self._step()
+        user = self.depositors[st_user]
+        shares = self.vault.balanceOf(user) * st_bps // 10_000
+        if shares > 0:
+            before = self.token.balanceOf(user)
+            tx = self.vault.withdraw(shares, {"from": user})
+            assert self.token.balanceOf(user) - before == tx.return_value
+
+    def rule_donate(self, st_user, st_bps):
+        self._step()
+        user = self.depositors[st_user]
+        amount = self.token.balanceOf(user) * st_bps // 100_000
+        if amount > 0:
+            self.token.transfer(self.strategy, amount, {"from": user})
+
+    def rule_debt_ratio(self, st_ratio):
+        self._step()
+        if self.exited:
+            # the vault won't hand an exiting strategy a debt ratio again
+            with brownie.reverts():
+                self.vault.updateStrategyDebtRatio(
+                    self.strategy, st_ratio, {"from": self.gov}
+                )
+        else:
+            self.vault.updateStrategyDebtRatio(
+                self.strategy, st_ratio, {"from": self.gov}
+            )
+
+    def rule_set_optimal(self, st_optimal):
+        self._step()
+        self.strategy.setOptimal(st_optimal, {"from": self.gov})
+
+    def rule_emergency_exit(self):
+        self._step()
+        if not self.exited:
+            self.strategy.setEmergencyExit({"from": self.gov})
+            self.exited = True
+
+    def rule_sleep(self, st_sleep):
+        self._step()
+        travel(st_sleep, blocks=0)
+
+    def rule_harvest(self):
+        # the vault can't assess fees twice in one block
+        travel(1, blocks=0)
+        tx = self.strategy.harvest({"from": self.gov})
+        assert tx.events["Harvested"]["loss"] == 0
+        self.just_harvested = True
+
+    def invariant_accounting(self):
+        vault, strategy = self.vault, self.strategy
+        params = vault.strategies(strategy)
+        assets = strategy.estimatedTotalAssets()
+
+        # one strategy, so the vault's totals are ours
+        assert vault.totalDebt() == params["totalDebt"]
+        assert vault.debtRatio() == params["debtRatio"]
+        assert vault.totalAssets() == vault.totalIdle() + vault.totalDebt()
+        assert self.token.balanceOf(vault) == vault.totalIdle()
+        assert assets == strategy.balanceOfWant() + strategy.stakedBalance()
+
+        # we can't lose want: no loss is ever booked, and we always hold at least our debt
+        assert params["totalLoss"] == 0
+        assert assets >= params["totalDebt"]
+
+        # and depositors can't lose either, share price only goes up (it resets if everyone leaves)
+        pps = vault.pricePerShare()
+        if vault.totalSupply() > 0:
+            assert pps >= self.pps
+        self.pps = pps
+
+        # a harvest reports exactly what we hold over our debt and stakes everything it keeps
+        if self.just_harvested:
+            assert assets == params["totalDebt"]
+            if self.exited:
+                assert assets == 0
+            else:
+                assert strategy.balanceOfWant() == 0
+
+
+def test_stateful(mocks, depositors, vault, strategy, token, gov, state_machine):
+    state_machine(
+        StrategyStateMachine,
+        vault,
+        strategy,
+        token,
+        depositors,
+        gov,
+        settings={"max_examples": RUNS, "stateful_step_count": STEPS, "deadline": None},
+    )
@@ -0,0 +1,55 @@
+import os
+import random
+
+import pytest
+from scripts.strategy_model import Model, fuzz, replay, sequence
+
+# operations per sequence, and how many sampled sequences we replay on chain (each is its own test)
+LENGTH = int(os.environ.get("MODEL_LENGTH", 20))
+REPLAYS = int(os.environ.get("MODEL_REPLAYS", 10))
+REPLAY_SEEDS = random.Random(os.environ.get("MODEL_SEED", 0)).sample(
+    range(10 ** 9), REPLAYS
+)
+
+
+@pytest.fixture(scope="module")
+def mocks(tests_using_mocks, request):
+    if not tests_using_mocks:
+        pytest.skip("model replays need the mock chain, set use_mocks in conftest.py")
+    yield request.getfixturevalue("mock_infrastructure")
+
+
+# a whale and a small depositor, both approved, with gauge emissions off so only donations make profit
+@pytest.fixture(scope="module")
+def users(mocks, accounts, whale, token, vault, gov, amount):
+    small = accounts[6]
+    token.transfer(small, amount // 100, {"from": whale})
+    for user in (whale, small):
+        token.approve(vault, 2 ** 256 - 1, {"from": user})
+    mocks.gauge.setEmissionRate(0, {"from": gov})
+    yield [whale, small]
+
+
+# the model on its own is cheap, so check a lot of sequences on every core
+def test_strategy_model_invariants():
+    template = Model.fresh([10 ** 24, 10 ** 20])
+    run, failures = fuzz(template, 20_000, LENGTH)
+    assert run == 20_000
+    # rebuild any of these with sequence(seed, template, LENGTH)
+    assert failures == []
+
+
+# the same operations on the real vault and strategy should give the same events and state, to the wei
+@pytest.mark.parametrize("seed", REPLAY_SEEDS)
+def test_strategy_model_matches_chain(mocks, users, vault, strategy, token, gov, seed):
+    template = Model.from_chain(vault, strategy, token, users)
+    ops, _, failure = sequence(seed, template, LENGTH)
+    assert failure is None
+    print(f"Replaying seed {seed}:", ops)
+
+    divergences = replay(
+        ops, template.copy(), vault, strategy, token, mocks.gauge, users, gov
+    )
+    for step, op, expected, actual in divergences:
+        print(f"step {step} {op}: model {expected}, chain {actual}")
+    assert divergences == []
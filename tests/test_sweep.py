@@ -14,14 +14,8 @@ def test_sweep(
     strategist_ms,
     farmed,
     amount,
+    funded_strategy,
 ):
-
-    ## deposit to the vault after approving
-    token.approve(vault, 2 ** 256 - 1, {"from": whale})
-    vault.deposit(amount, {"from": whale})
-    chain.sleep(1)
-    strategy.harvest({"from": gov})
-    chain.sleep(1)
     strategy.sweep(farmed, {"from": gov})
 
     # Strategy want token doesn't work
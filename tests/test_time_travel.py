@@ -0,0 +1,31 @@
+from brownie import chain, web3
+from utils.time_travel import saved, travel
+
+# one batched travel should leave the chain, and brownie's idea of it, where chain.sleep and chain.mine would
+def test_time_travel(gov, strategy):
+    height = chain.height
+    start = web3.eth.get_block("latest").timestamp
+    before = saved["round_trips"]
+
+    assert travel(3600) == height + 1
+    assert web3.eth.get_block("latest").timestamp >= start + 3600
+    assert abs(chain.time() - web3.eth.get_block("latest").timestamp) <= 1
+
+    # a few blocks at once
+    assert travel(60, blocks=3) == height + 4
+
+    # to a timestamp, exactly
+    target = chain.time() + 86400
+    assert travel(timestamp=target) == height + 5
+    assert web3.eth.get_block("latest").timestamp == target
+
+    # only the clock, the next transaction mines
+    assert travel(600, blocks=0) is None
+    assert chain.height == height + 5
+    assert abs(chain.time() - (target + 600)) <= 1
+    tx = strategy.setDoHealthCheck(True, {"from": gov})
+    assert tx.timestamp >= target + 600
+
+    # brownie takes 6 round-trips to sleep and mine a block and 8 for three blocks, we take a batch and one
+    # chain.mine. mining at a timestamp or only sleeping is what brownie does already
+    assert saved["round_trips"] - before == 1 + 3 + 0 + 0
@@ -2,6 +2,7 @@ import brownie
 from brownie import Contract
 from brownie import config
 import math
+from utils.time_travel import travel
 
 # test our harvest triggers
 def test_triggers(
@@ -46,10 +47,9 @@ def test_triggers(
         strategy.setHarvestTriggerParams(90000e6, 150000e6, 1e24, False, {"from": gov})
 
         # harvest the credit
-        chain.sleep(1)
+        travel(1, blocks=0)
         strategy.harvest({"from": gov})
-        chain.sleep(1)
-        chain.mine(1)
+        travel(1)
 
         # should trigger false, nothing is ready yet
         tx = strategy.harvestTrigger(0, {"from": gov})
@@ -57,14 +57,12 @@ def test_triggers(
         assert tx == False
     else:
         # harvest the credit
-        chain.sleep(1)
+        travel(1, blocks=0)
         strategy.harvest({"from": gov})
-        chain.sleep(1)
-        chain.mine(1)
+        travel(1)
 
     # simulate earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    travel(sleep_time)
 
     # set our max delay to 1 day so we trigger true, then set it back to 21 days
     strategy.setMaxReportDelay(sleep_time - 1)
@@ -103,7 +101,7 @@ def test_triggers(
             assert tx == True
 
         # earmark should be false now (it's been too long), turn it off after
-        chain.sleep(86400 * 21)
+        travel(86400 * 21, blocks=0)
         strategy.setHarvestTriggerParams(90000e6, 150000e6, 1e24, True, {"from": gov})
         assert strategy.needsEarmarkReward() == True
         tx = strategy.harvestTrigger(0, {"from": gov})
@@ -113,18 +111,44 @@ def test_triggers(
         )
         assert tx == False
         strategy.setHarvestTriggerParams(90000e6, 150000e6, 1e24, False, {"from": gov})
-    else:  # curve uses minDelay as well
+    else:  # curve uses minDelay as well, as long as our profit pays for the harvest
         strategy.setMinReportDelay(sleep_time - 1)
+        profit = strategy.estimatedHarvestProfit()
+        print("\nEstimated profit:", profit / 1e18)
+        if not no_profit:
+            tx = strategy.harvestTrigger(0, {"from": gov})
+            print("\nShould we harvest? Should be True.", tx)
+            assert tx == True
+
+            # a harvest that costs more than profit / profitFactor shouldn't trigger
+            call_cost = 10 ** 18
+            profit_factor = profit // strategy.ethToWant(call_cost) + 1
+            strategy.setHarvestTriggerParams(
+                0, 50_000e18, 1e24, profit_factor, {"from": gov}
+            )
+            tx = strategy.harvestTrigger(call_cost, {"from": gov})
+            print("\nShould we harvest? Should be false, gas is too expensive.", tx)
+            assert tx == False
+
+            # unless our profit is over our max, then gas doesn't matter
+            strategy.setHarvestTriggerParams(0, 1, 1e24, profit_factor, {"from": gov})
+            tx = strategy.harvestTrigger(call_cost, {"from": gov})
+            print("\nShould we harvest? Should be true, profit is over max.", tx)
+            assert tx == True
+            strategy.setHarvestTriggerParams(0, 50_000e18, 1e24, 10, {"from": gov})
+
+        # below our min profit, minDelay alone doesn't trigger
+        strategy.setHarvestTriggerParams(profit + 1, 50_000e18, 1e24, 10, {"from": gov})
         tx = strategy.harvestTrigger(0, {"from": gov})
-        print("\nShould we harvest? Should be True.", tx)
-        assert tx == True
+        print("\nShould we harvest? Should be false, not enough profit.", tx)
+        assert tx == False
+        strategy.setHarvestTriggerParams(0, 50_000e18, 1e24, 10, {"from": gov})
 
     # harvest, wait
-    chain.sleep(1)
+    travel(1, blocks=0)
     tx = strategy.harvest({"from": gov})
     print("Harvest info:", tx.events["Harvested"])
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    travel(sleep_time)
 
         # withdraw and confirm we made money, or at least that we have about the same
     vault.withdraw({"from": whale})
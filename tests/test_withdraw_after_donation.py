@@ -1,6 +1,7 @@
 import brownie
-from brownie import chain, Contract, ZERO_ADDRESS
+from brownie import Contract, ZERO_ADDRESS
 import math
+from utils.time_travel import travel
 
 # these tests all assess whether a strategy will hit accounting errors following donations to the strategy.
 # lower debtRatio to 50%, donate, withdraw less than the donation, then harvest
@@ -16,15 +17,8 @@ def test_withdraw_after_donation_1(
     is_slippery,
     no_profit,
     sleep_time,
+    funded_strategy,
 ):
-
-    ## deposit to the vault after approving
-    token.approve(vault, 2 ** 256 - 1, {"from": whale})
-    vault.deposit(amount, {"from": whale})
-    chain.sleep(1)
-    strategy.harvest({"from": gov})
-    chain.sleep(1)
-
     prev_params = vault.strategies(strategy)
 
     currentDebt = vault.strategies(strategy)["debtRatio"]
@@ -39,18 +33,16 @@ def test_withdraw_after_donation_1(
     vault.withdraw(donation / 2, {"from": whale})
 
     # simulate some earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    travel(sleep_time)
 
     # turn off health check since we just took big profit
     strategy.setDoHealthCheck(False, {"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
     tx = strategy.harvest({"from": gov})
     new_params = vault.strategies(strategy)
 
     # sleep 10 hours to allow share price to normalize
-    chain.sleep(60 * 60 * 10)
-    chain.mine(1)
+    travel(60 * 60 * 10)
 
     profit = new_params["totalGain"] - prev_params["totalGain"]
 
@@ -92,15 +84,8 @@ def test_withdraw_after_donation_2(
     is_slippery,
     no_profit,
     sleep_time,
+    funded_strategy,
 ):
-
-    ## deposit to the vault after approving
-    token.approve(vault, 2 ** 256 - 1, {"from": whale})
-    vault.deposit(amount, {"from": whale})
-    chain.sleep(1)
-    strategy.harvest({"from": gov})
-    chain.sleep(1)
-
     prev_params = vault.strategies(strategy)
 
     currentDebt = vault.strategies(strategy)["debtRatio"]
@@ -115,18 +100,16 @@ def test_withdraw_after_donation_2(
     vault.withdraw(donation / 2, {"from": whale})
 
     # simulate some earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    travel(sleep_time)
 
     # turn off health check since we just took big profit
     strategy.setDoHealthCheck(False, {"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.harvest({"from": gov})
     new_params = vault.strategies(strategy)
 
     # sleep 10 hours to allow share price to normalize
-    chain.sleep(60 * 60 * 10)
-    chain.mine(1)
+    travel(60 * 60 * 10)
 
     profit = new_params["totalGain"] - prev_params["totalGain"]
 
@@ -168,15 +151,8 @@ def test_withdraw_after_donation_3(
     is_slippery,
     no_profit,
     sleep_time,
+    funded_strategy,
 ):
-
-    ## deposit to the vault after approving
-    token.approve(vault, 2 ** 256 - 1, {"from": whale})
-    vault.deposit(amount, {"from": whale})
-    chain.sleep(1)
-    strategy.harvest({"from": gov})
-    chain.sleep(1)
-
     prev_params = vault.strategies(strategy)
 
     currentDebt = vault.strategies(strategy)["debtRatio"]
@@ -195,18 +171,16 @@ def test_withdraw_after_donation_3(
     vault.withdraw(withdrawal_in_shares, {"from": whale})
 
     # simulate some earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    travel(sleep_time)
 
     # turn off health check since we just took big profit
     strategy.setDoHealthCheck(False, {"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.harvest({"from": gov})
     new_params = vault.strategies(strategy)
 
     # sleep 10 hours to allow share price to normalize
-    chain.sleep(60 * 60 * 10)
-    chain.mine(1)
+    travel(60 * 60 * 10)
 
     profit = new_params["totalGain"] - prev_params["totalGain"]
 
@@ -248,15 +222,8 @@ def test_withdraw_after_donation_4(
     is_slippery,
     no_profit,
     sleep_time,
+    funded_strategy,
 ):
-
-    ## deposit to the vault after approving
-    token.approve(vault, 2 ** 256 - 1, {"from": whale})
-    vault.deposit(amount, {"from": whale})
-    chain.sleep(1)
-    strategy.harvest({"from": gov})
-    chain.sleep(1)
-
     prev_params = vault.strategies(strategy)
 
     currentDebt = vault.strategies(strategy)["debtRatio"]
@@ -275,18 +242,16 @@ def test_withdraw_after_donation_4(
     vault.withdraw(withdrawal_in_shares, {"from": whale})
 
     # simulate some earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    travel(sleep_time)
 
     # turn off health check since we just took big profit
     strategy.setDoHealthCheck(False, {"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.harvest({"from": gov})
     new_params = vault.strategies(strategy)
 
     # sleep 10 hours to allow share price to normalize
-    chain.sleep(60 * 60 * 10)
-    chain.mine(1)
+    travel(60 * 60 * 10)
 
     profit = new_params["totalGain"] - prev_params["totalGain"]
 
@@ -331,15 +296,8 @@ def test_withdraw_after_donation_5(
     is_slippery,
     no_profit,
     sleep_time,
+    funded_strategy,
 ):
-
-    ## deposit to the vault after approving
-    token.approve(vault, 2 ** 256 - 1, {"from": whale})
-    vault.deposit(amount, {"from": whale})
-    chain.sleep(1)
-    strategy.harvest({"from": gov})
-    chain.sleep(1)
-
     prev_params = vault.strategies(strategy)
 
     # our whale donates dust to the vault, what a nice person!
@@ -354,18 +312,16 @@ def test_withdraw_after_donation_5(
     vault.withdraw(withdrawal_in_shares, {"from": whale})
 
     # simulate some earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    travel(sleep_time)
 
     # turn off health check since we just took big profit
     strategy.setDoHealthCheck(False, {"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.harvest({"from": gov})
     new_params = vault.strategies(strategy)
 
     # sleep 10 hours to allow share price to normalize
-    chain.sleep(60 * 60 * 10)
-    chain.mine(1)
+    travel(60 * 60 * 10)
 
     profit = new_params["totalGain"] - prev_params["totalGain"]
 
@@ -407,15 +363,8 @@ def test_withdraw_after_donation_6(
     is_slippery,
     no_profit,
     sleep_time,
+    funded_strategy,
 ):
-
-    ## deposit to the vault after approving
-    token.approve(vault, 2 ** 256 - 1, {"from": whale})
-    vault.deposit(amount, {"from": whale})
-    chain.sleep(1)
-    strategy.harvest({"from": gov})
-    chain.sleep(1)
-
     prev_params = vault.strategies(strategy)
 
     # our whale donates dust to the vault, what a nice person!
@@ -426,18 +375,16 @@ def test_withdraw_after_donation_6(
     vault.withdraw(donation / 2, {"from": whale})
 
     # simulate some earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    travel(sleep_time)
 
     # turn off health check since we just took big profit
     strategy.setDoHealthCheck(False, {"from": gov})
-    chain.sleep(1)
+    travel(1, blocks=0)
     strategy.harvest({"from": gov})
     new_params = vault.strategies(strategy)
 
     # sleep 10 hours to allow share price to normalize
-    chain.sleep(60 * 60 * 10)
-    chain.mine(1)
+    travel(60 * 60 * 10)
 
     profit = new_params["totalGain"] - prev_params["totalGain"]
 
@@ -480,15 +427,8 @@ def test_withdraw_after_donation_7(
     no_profit,
     vault_address,
     sleep_time,
+    funded_strategy,
 ):
-
-    ## deposit to the vault after approving
-    token.approve(vault, 2 ** 256 - 1, {"from": whale})
-    vault.deposit(amount, {"from": whale})
-    chain.sleep(1)
-    strategy.harvest({"from": gov})
-    chain.sleep(1)
-
     prev_params = vault.strategies(strategy)
     prev_assets = vault.totalAssets()
 
@@ -510,11 +450,10 @@ def test_withdraw_after_donation_7(
     vault.withdraw(withdrawal_in_shares, {"from": whale})
 
     # simulate some earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    travel(sleep_time)
 
     # We harvest twice to take profits and then to send the funds to our strategy. This is for our last check below.
-    chain.sleep(1)
+    travel(1, blocks=0)
 
     # turn off health check since we just took big profit
     strategy.setDoHealthCheck(False, {"from": gov})
@@ -546,8 +485,7 @@ def test_withdraw_after_donation_7(
         assert starting_total_vault_debt - starting_strategy_debt <= vault.totalDebt()
 
     # sleep 10 hours to allow share price to normalize
-    chain.sleep(60 * 60 * 10)
-    chain.mine(1)
+    travel(60 * 60 * 10)
 
     profit = new_params["totalGain"] - prev_params["totalGain"]
 
@@ -581,15 +519,8 @@ def test_withdraw_after_donation_8(
     no_profit,
     vault_address,
     sleep_time,
+    funded_strategy,
 ):
-
-    ## deposit to the vault after approving
-    token.approve(vault, 2 ** 256 - 1, {"from": whale})
-    vault.deposit(amount, {"from": whale})
-    chain.sleep(1)
-    strategy.harvest({"from": gov})
-    chain.sleep(1)
-
     prev_params = vault.strategies(strategy)
     prev_assets = vault.totalAssets()
 
@@ -611,11 +542,10 @@ def test_withdraw_after_donation_8(
     vault.withdraw(withdrawal_in_shares, {"from": whale})
 
     # simulate some earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    travel(sleep_time)
 
     # We harvest twice to take profits and then to send the funds to our strategy. This is for our last check below.
-    chain.sleep(1)
+    travel(1, blocks=0)
 
     # turn off health check since we just took big profit
     strategy.setDoHealthCheck(False, {"from": gov})
@@ -647,8 +577,7 @@ def test_withdraw_after_donation_8(
         assert starting_total_vault_debt - starting_strategy_debt <= vault.totalDebt()
 
     # sleep 10 hours to allow share price to normalize
-    chain.sleep(60 * 60 * 10)
-    chain.mine(1)
+    travel(60 * 60 * 10)
 
     profit = new_params["totalGain"] - prev_params["totalGain"]
 
@@ -0,0 +1,79 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from brownie import Contract, web3
+
+# content-addressed store: index.json maps each address to the sha256 of its ABI and the keccak of the runtime
+# code that ABI was fetched for. every distinct ABI is saved once as <sha256>.json and every distinct code as
+# code/<codehash>.bin. commit this folder and fixtures resolve without an explorer.
+# entries with a null codehash were written by hand rather than fetched, so nothing ties them to the deployed
+# contract yet: the first verified load replaces them with what the explorer and the chain say.
+ABI_STORE = Path(__file__).resolve().parent.parent / "abis"
+INDEX = ABI_STORE / "index.json"
+CODE_STORE = ABI_STORE / "code"
+
+_index = None
+
+
+def _load_index():
+    global _index
+    if _index is None:
+        _index = json.loads(INDEX.read_text()) if INDEX.exists() else {}
+    return _index
+
+
+def _save(address, name, abi, code):
+    blob = json.dumps(abi, sort_keys=True, separators=(",", ":"))
+    digest = hashlib.sha256(blob.encode()).hexdigest()
+    path = ABI_STORE / f"{digest}.json"
+    if not path.exists():
+        _write_atomic(path, blob)
+    codehash = web3.keccak(code).hex()
+    code_path = CODE_STORE / f"{codehash}.bin"
+    if not code_path.exists():
+        CODE_STORE.mkdir(exist_ok=True)
+        _write_atomic(code_path, code.hex())
+    # parallel workers may have added their own entries since we loaded, merge with what's on disk
+    index = json.loads(INDEX.read_text()) if INDEX.exists() else {}
+    index.update(_load_index())
+    index[address.lower()] = {"name": name, "abi": digest, "codehash": codehash}
+    _index.update(index)
+    _write_atomic(INDEX, json.dumps(index, indent=2, sort_keys=True) + "\n")
+
+
+def _write_atomic(path, text):
+    # readers on other workers see either the old file or the new one, never half of one
+    tmp = path.with_name(f".{path.name}.{os.getpid()}")
+    tmp.write_text(text)
+    os.replace(tmp, path)
+
+
+def _codehash(address):
+    return web3.keccak(web3.eth.get_code(address)).hex()
+
+
+def _fetch(address):
+    # autofetch_sources is off so a plain Contract() can't reach the explorer, ask it explicitly
+    contract = Contract.from_explorer(address)
+    _save(address, contract._name, contract.abi, web3.eth.get_code(address))
+    return contract
+
+
+def cached_contract(address, verify=True):
+    """
+    Contract(address), but read from our local store when we've seen the address before. On a miss we
+    fetch the ABI from the explorer and the code from the chain, and save both for next time. With verify
+    (the default), we also make sure the code at the address is still what we stored the ABI for.
+    """
+    entry = _load_index().get(address.lower())
+    if entry is None or (verify and entry["codehash"] is None):
+        return _fetch(address)
+
+    if verify and _codehash(address) != entry["codehash"]:
+        raise ValueError(
+            f"Code at {address} changed since its ABI was cached, delete it from {INDEX}"
+        )
+    abi = json.loads((ABI_STORE / f"{entry['abi']}.json").read_text())
+    return Contract.from_abi(entry["name"], address, abi, persist=False)
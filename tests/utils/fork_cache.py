@@ -0,0 +1,190 @@
+import gzip
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+from brownie._config import CONFIG
+
+from utils.parallel import resolve_fork
+
+# one file per fork source and block, holding every state read the forked chain made at that block. after one
+# warm-up run the whole suite forks from here: no RPC needed, and no round-trip per account, code or slot.
+CACHE_DIR = Path(__file__).resolve().parent.parent / "fork_cache"
+
+# reads that can't change once the block is pinned. anything asked at "latest" or "pending" is forwarded instead.
+CACHED_METHODS = {
+    "eth_chainId",
+    "net_version",
+    "eth_getBlockByNumber",
+    "eth_getBlockByHash",
+    "eth_getCode",
+    "eth_getStorageAt",
+    "eth_getBalance",
+    "eth_getTransactionCount",
+    "eth_getProof",
+    "eth_getTransactionByHash",
+    "eth_getTransactionReceipt",
+}
+UNPINNED = {"latest", "pending", "earliest", "safe", "finalized"}
+
+
+def _key(method, params):
+    return json.dumps([method, params], separators=(",", ":"))
+
+
+def _cacheable(method, params):
+    return method in CACHED_METHODS and not any(
+        isinstance(param, str) and param in UNPINNED for param in params
+    )
+
+
+class ForkCache:
+    """
+    A JSON-RPC proxy on 127.0.0.1 that the forked chain uses as its fork url. Pinned reads are answered from
+    the cache file, misses go upstream once and are remembered. Without an upstream (or with FORK_CACHE_OFFLINE)
+    a miss is an error instead, so a run that isn't fully cached fails loudly rather than hanging on the network.
+    """
+
+    def __init__(self, upstream, block, path, offline=False):
+        self.upstream = upstream
+        self.block = block
+        self.path = path
+        self.offline = offline or not upstream
+        self.session = requests.Session()
+        self.lock = threading.Lock()
+        self.entries = self._read()
+        self.new = {}
+        self.hits = 0
+        self.misses = 0
+        self.server = None
+
+    def _read(self):
+        if not self.path.exists():
+            return {}
+        with gzip.open(self.path, "rt") as f:
+            return json.load(f)
+
+    @property
+    def url(self):
+        host, port = self.server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self):
+        cache = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                if isinstance(body, list):
+                    response = cache.handle_batch(body)
+                else:
+                    response = cache.handle_batch([body])[0]
+                payload = json.dumps(response).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self.url
+
+    def handle_batch(self, calls):
+        responses = [None] * len(calls)
+        forward = []
+        for i, call in enumerate(calls):
+            method, params = call["method"], call.get("params", [])
+            result = self._lookup(method, params)
+            if result is not None:
+                responses[i] = {"jsonrpc": "2.0", "id": call["id"], "result": result}
+            else:
+                forward.append(i)
+        if forward:
+            # everything we don't have goes upstream in a single batch
+            for i, response in zip(forward, self._forward([calls[i] for i in forward])):
+                call = calls[i]
+                params = call.get("params", [])
+                if "result" in response and _cacheable(call["method"], params):
+                    self._store(call["method"], params, response["result"])
+                responses[i] = response
+        return responses
+
+    def _lookup(self, method, params):
+        if not _cacheable(method, params):
+            # the chain only asks for the latest block to check the one it forks from is old enough
+            if method == "eth_blockNumber" and self.offline:
+                return hex(self.block)
+            return None
+        with self.lock:
+            result = self.entries.get(_key(method, params))
+            if result is not None:
+                self.hits += 1
+            return result
+
+    def _store(self, method, params, result):
+        with self.lock:
+            self.misses += 1
+            self.entries[_key(method, params)] = result
+            self.new[_key(method, params)] = result
+
+    def _forward(self, calls):
+        if self.offline:
+            return [
+                {
+                    "jsonrpc": "2.0",
+                    "id": call["id"],
+                    "error": {
+                        "code": -32000,
+                        "message": f"{call['method']} {call.get('params')} isn't in {self.path.name}, "
+                        "run once with the fork's RPC available to warm the cache",
+                    },
+                }
+                for call in calls
+            ]
+        # send in the same order, match responses by id: batch responses may come back in any order
+        by_id = {
+            response["id"]: response
+            for response in self.session.post(
+                self.upstream, json=calls, timeout=120
+            ).json()
+        }
+        return [by_id[call["id"]] for call in calls]
+
+    def save(self):
+        """Write what this process fetched, merged with what other workers have saved since we loaded."""
+        if not self.new:
+            return
+        entries = self._read()
+        with self.lock:
+            entries.update(self.new)
+            self.new = {}
+        self.path.parent.mkdir(exist_ok=True)
+        # readers on other workers see either the old file or the new one, never half of one
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}")
+        with gzip.open(tmp, "wt", compresslevel=9) as f:
+            json.dump(entries, f, separators=(",", ":"), sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+def route_fork(network, block):
+    """
+    Start a ForkCache for network at block and make its chain fork through it. Returns the cache, save() it when
+    the session ends. Call this before pin_fork, which adds the block to whatever fork url is set.
+    """
+    upstream = resolve_fork(network)
+    # an env var left in the url means there's no key for the fork's RPC here, so the cache is all we have
+    offline = bool(os.environ.get("FORK_CACHE_OFFLINE")) or "$" in upstream
+    name = CONFIG.networks[network]["cmd_settings"].get("chain_id", network)
+    cache = ForkCache(
+        None if offline else upstream, block, CACHE_DIR / f"{name}@{block}.json.gz"
+    )
+    CONFIG.networks[network]["cmd_settings"]["fork"] = cache.start()
+    return cache
@@ -0,0 +1,114 @@
+import json
+import os
+from pathlib import Path
+
+from brownie import Wei, web3
+
+try:
+    from eth_abi import encode
+except ImportError:  # eth-abi before 2.2 (brownie 1.15 pins 2.1.1) only has encode_abi
+    from eth_abi import encode_abi as encode
+
+# where each token keeps its balances, keyed by the hash of its code: the same code always lays out storage the
+# same way, wherever it's deployed. once a token is in here funding never has to search for it again.
+SLOTS = Path(__file__).resolve().parent.parent / "balance_slots.json"
+
+# ganache, hardhat and anvil all name this differently, and hardhat and anvil won't take a zero-padded slot
+SET_STORAGE_METHODS = (
+    ("evm_setAccountStorageAt", True),
+    ("hardhat_setStorageAt", False),
+    ("anvil_setStorageAt", False),
+)
+
+# balances is almost always declared in the first few slots, search this far before giving up
+MAX_SLOT = 64
+
+# an account nobody holds anything in, so probing it can't clash with a real balance
+PROBE = "0x000000000000000000000000000000000000f00d"
+
+_slots = None
+_set_storage = None
+
+
+def _load_slots():
+    global _slots
+    if _slots is None:
+        _slots = json.loads(SLOTS.read_text()) if SLOTS.exists() else {}
+    return _slots
+
+
+def _save_slot(codehash, slot, vyper):
+    # parallel workers may have found their own slots since we loaded, merge with what's on disk
+    slots = json.loads(SLOTS.read_text()) if SLOTS.exists() else {}
+    slots.update(_load_slots())
+    slots[codehash] = {"slot": slot, "vyper": vyper}
+    _slots.update(slots)
+    tmp = SLOTS.with_name(f".{SLOTS.name}.{os.getpid()}")
+    tmp.write_text(json.dumps(slots, indent=2, sort_keys=True) + "\n")
+    os.replace(tmp, SLOTS)
+
+
+def _balance_key(holder, slot, vyper):
+    # solidity hashes the key then the slot, vyper the slot then the key
+    if vyper:
+        return web3.keccak(encode(["uint256", "address"], [slot, holder]))
+    return web3.keccak(encode(["address", "uint256"], [holder, slot]))
+
+
+def set_storage(address, key, value):
+    """Write value (an int) to storage key (bytes) of address, with whichever method our dev chain has."""
+    global _set_storage
+    word = "0x" + int(value).to_bytes(32, "big").hex()
+    methods = SET_STORAGE_METHODS if _set_storage is None else [_set_storage]
+    for method, padded in methods:
+        slot = "0x" + key.hex() if padded else hex(int.from_bytes(key, "big"))
+        response = web3.provider.make_request(method, [str(address), slot, word])
+        if "error" not in response:
+            _set_storage = (method, padded)
+            return
+    raise ValueError(
+        "Our dev chain can't set account storage. Use ganache v7+, hardhat or anvil."
+    )
+
+
+def _find_slot(token):
+    for slot in range(MAX_SLOT):
+        for vyper in (False, True):
+            key = _balance_key(PROBE, slot, vyper)
+            before = web3.eth.get_storage_at(token.address, key)
+            set_storage(token.address, key, 0x5EED)
+            found = token.balanceOf(PROBE) == 0x5EED
+            set_storage(token.address, key, int.from_bytes(before, "big"))
+            if found:
+                return slot, vyper
+    raise ValueError(
+        f"Couldn't find where {token.address} keeps balances in its first {MAX_SLOT} slots, fund it from a holder instead"
+    )
+
+
+def set_balance(token, holder, amount):
+    """
+    Make token.balanceOf(holder) exactly amount by writing it into the token's storage, no holder to impersonate.
+    The slot is found once per token code and cached in SLOTS. totalSupply is left alone, so don't fund more
+    than the token could plausibly have.
+    """
+    # Wei, not int: int(35_000e18) is off by a few wei
+    amount = int(Wei(amount))
+    codehash = web3.keccak(web3.eth.get_code(token.address)).hex()
+    entry = _load_slots().get(codehash)
+    if entry is not None:
+        set_storage(
+            token.address, _balance_key(holder, entry["slot"], entry["vyper"]), amount
+        )
+        # a proxy's code doesn't tell us its implementation's layout, so check the write landed
+        if token.balanceOf(holder) == amount:
+            return
+    slot, vyper = _find_slot(token)
+    _save_slot(codehash, slot, vyper)
+    set_storage(token.address, _balance_key(holder, slot, vyper), amount)
+    assert token.balanceOf(holder) == amount
+
+
+def fund(token, holder, amount):
+    """Add amount to holder's token balance."""
+    set_balance(token, holder, token.balanceOf(holder) + Wei(amount))
@@ -0,0 +1,55 @@
+import json
+import os
+from pathlib import Path
+
+# gas used and external calls made by each benchmarked code path, committed so every change is measured against it
+BASELINE = Path(__file__).resolve().parent.parent / "gas_baseline.json"
+
+# how much more gas than its baseline a path may use before the benchmark fails, in percent
+THRESHOLD = float(os.environ.get("GAS_REGRESSION_THRESHOLD", 2))
+
+# set from --update-gas by conftest: record the current numbers as the baseline instead of checking them
+UPDATE = False
+
+
+def load_baseline():
+    return json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+
+
+def record_baseline(path, gas_used, calls):
+    # merge with what's on disk, parallel workers record their own paths
+    baseline = load_baseline()
+    baseline[path] = {"gas": gas_used, "calls": calls}
+    tmp = BASELINE.with_name(f".{BASELINE.name}.{os.getpid()}")
+    tmp.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+    os.replace(tmp, BASELINE)
+
+
+def check_gas(path, tx):
+    """
+    Compare the gas tx used, and the external calls it made, with the baseline for path. Fails if gas went up by
+    more than THRESHOLD percent, if we make any more external calls than before, or if path has no baseline at
+    all. With --update-gas every path is recorded instead.
+    """
+    gas_used = tx.gas_used
+    calls = len(tx.subcalls)
+    expected = load_baseline().get(path)
+    print(f"{path}: {gas_used} gas, {calls} external calls (baseline {expected})")
+    if UPDATE:
+        record_baseline(path, gas_used, calls)
+        return gas_used
+
+    assert (
+        expected is not None
+    ), f"{path} has no baseline in {BASELINE.name}. Record it with --update-gas and commit the file."
+
+    limit = expected["gas"] * (100 + THRESHOLD) / 100
+    assert gas_used <= limit, (
+        f"{path} used {gas_used} gas, {100 * (gas_used - expected['gas']) / expected['gas']:.2f}% "
+        f"over its baseline of {expected['gas']}. If that's intended, rerun with --update-gas."
+    )
+    assert calls <= expected["calls"], (
+        f"{path} made {calls} external calls, up from {expected['calls']}. If that's intended, rerun "
+        f"with --update-gas."
+    )
+    return gas_used
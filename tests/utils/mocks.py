@@ -0,0 +1,115 @@
+from brownie import web3
+
+# we etch our mocks directly on top of the addresses the strategy hardcodes or is deployed with
+from scripts.addresses import (
+    CRV,
+    WFTM,
+    USDC,
+    DAI,
+    CURVE_POOL,
+    GAUGE,
+    GAUGE_FACTORY,
+    SPOOKY,
+)
+
+# ganache, hardhat and anvil all name this differently
+SET_CODE_METHODS = ("evm_setAccountCode", "hardhat_setCode", "anvil_setCode")
+
+
+class MockInfrastructure:
+    """Handles to every mock we etched, so fixtures can grab what they need."""
+
+    __slots__ = (
+        "crv",
+        "wftm",
+        "usdc",
+        "dai",
+        "pool",
+        "gauge",
+        "gauge_factory",
+        "router",
+    )
+
+    def __init__(self, **contracts):
+        for name, contract in contracts.items():
+            setattr(self, name, contract)
+
+
+def etch(container, target, deployer):
+    """Deploy a template of container, then copy its runtime code to target."""
+    template = container.deploy({"from": deployer})
+    code = "0x" + bytes(web3.eth.get_code(template.address)).hex()
+    for method in SET_CODE_METHODS:
+        response = web3.provider.make_request(method, [target, code])
+        if "error" not in response:
+            return container.at(target)
+    raise ValueError(
+        "Our dev chain can't set account code. Use ganache v7+, hardhat or anvil."
+    )
+
+
+def deploy_mock_infrastructure(deployer, crv_per_second=1e17):
+    """Etch the tokens, 2pool, gauge, gauge factory and router at their Fantom addresses and seed them."""
+    from brownie import (
+        MockERC20,
+        MockCurvePool,
+        MockGauge,
+        MockGaugeFactory,
+        MockRouter,
+    )
+
+    tx_params = {"from": deployer}
+    crv = etch(MockERC20, CRV, deployer)
+    crv.initialize("Curve DAO", "CRV", 18, tx_params)
+    wftm = etch(MockERC20, WFTM, deployer)
+    wftm.initialize("Wrapped Fantom", "WFTM", 18, tx_params)
+    usdc = etch(MockERC20, USDC, deployer)
+    usdc.initialize("USD Coin", "USDC", 6, tx_params)
+    dai = etch(MockERC20, DAI, deployer)
+    dai.initialize("Dai Stablecoin", "DAI", 18, tx_params)
+
+    # same coin order the strategy uses for add_liquidity, A and fees match the live 2pool
+    pool = etch(MockCurvePool, CURVE_POOL, deployer)
+    pool.initialize([usdc, dai], 2000, 1_000_000, 5_000_000_000, tx_params)
+    usdc.mint(deployer, 50_000_000e6, tx_params)
+    dai.mint(deployer, 50_000_000e18, tx_params)
+    usdc.approve(pool, 2 ** 256 - 1, tx_params)
+    dai.approve(pool, 2 ** 256 - 1, tx_params)
+    pool.add_liquidity([50_000_000e6, 50_000_000e18], 0, tx_params)
+
+    gauge_factory = etch(MockGaugeFactory, GAUGE_FACTORY, deployer)
+    gauge_factory.initialize(crv, tx_params)
+    gauge = etch(MockGauge, GAUGE, deployer)
+    gauge.initialize(pool, gauge_factory, tx_params)
+    gauge.setEmissionRate(crv_per_second, tx_params)
+
+    # roughly CRV = $0.60, WFTM = $0.30
+    router = etch(MockRouter, SPOOKY, deployer)
+    router.setReserves(crv, wftm, 1_000_000e18, 2_000_000e18, tx_params)
+    router.setReserves(wftm, usdc, 10_000_000e18, 3_000_000e6, tx_params)
+    router.setReserves(wftm, dai, 10_000_000e18, 3_000_000e18, tx_params)
+
+    return MockInfrastructure(
+        crv=crv,
+        wftm=wftm,
+        usdc=usdc,
+        dai=dai,
+        pool=pool,
+        gauge=gauge,
+        gauge_factory=gauge_factory,
+        router=router,
+    )
+
+
+def mint_lp(mocks, receiver, lp_amount):
+    """Give receiver about lp_amount of 2pool LP with a balanced deposit, no whale needed."""
+    pool = mocks.pool
+    lp_amount = int(lp_amount)
+    supply = pool.totalSupply()
+    # pad by 1% so rounding and fees never leave us short
+    amounts = [pool.balances(i) * lp_amount * 101 // (supply * 100) for i in range(2)]
+    mocks.usdc.mint(receiver, amounts[0], {"from": receiver})
+    mocks.dai.mint(receiver, amounts[1], {"from": receiver})
+    mocks.usdc.approve(pool, amounts[0], {"from": receiver})
+    mocks.dai.approve(pool, amounts[1], {"from": receiver})
+    pool.add_liquidity(amounts, 0, {"from": receiver})
@@ -0,0 +1,61 @@
+import os
+
+from brownie._config import CONFIG
+from web3 import HTTPProvider, Web3
+
+# with `brownie test -n N` every xdist worker launches its own chain, brownie already moves each one to
+# its own port. what we add: every worker forks the same block, so session fixtures (whale funding, vault
+# and strategy deployment) are rebuilt per worker from identical state, and tests are handed out one at
+# a time instead of one file per worker, so a single long file no longer sets the wall-clock time.
+
+
+def network_id(workerinput=None):
+    """The network this run (or this worker, given its workerinput) will connect to."""
+    network = workerinput["network"] if workerinput else CONFIG.argv["network"]
+    return network or CONFIG.settings["networks"]["default"]
+
+
+def resolve_fork(network):
+    """
+    Swap a fork given as another network's id (ftm-main) for that network's host, and return it. brownie does
+    this too, but only on the copy of the settings it connects with, so what we read and edit here is still the id.
+    """
+    network_settings = CONFIG.networks[network]
+    settings = network_settings["cmd_settings"]
+    fork = settings["fork"]
+    if fork in CONFIG.networks:
+        fork_settings = CONFIG.networks[fork]
+        # once it's a url brownie can't look these up from the id anymore, so carry them over like it would
+        settings.setdefault("chain_id", int(fork_settings["chainid"]))
+        network_settings["chainid"] = fork_settings["chainid"]
+        if "explorer" in fork_settings:
+            network_settings["explorer"] = fork_settings["explorer"]
+        fork = fork_settings["host"]
+    settings["fork"] = os.path.expandvars(fork)
+    return settings["fork"]
+
+
+def fork_block(network):
+    """
+    Block every worker should fork from. FORK_BLOCK pins it, otherwise we take the fork source's
+    latest block once, on the master. None when the network isn't a fork.
+    """
+    settings = CONFIG.networks[network].get("cmd_settings", {})
+    if "fork" not in settings:
+        return None
+    if os.environ.get("FORK_BLOCK"):
+        return int(os.environ["FORK_BLOCK"])
+    return Web3(HTTPProvider(resolve_fork(network))).eth.block_number
+
+
+def pin_fork(network, block):
+    """Make this worker's chain fork from block instead of whatever is latest when it launches."""
+    resolve_fork(network)
+    network_settings = CONFIG.networks[network]
+    settings = network_settings["cmd_settings"]
+    if "ganache" in network_settings.get("cmd", "ganache"):
+        # ganache takes the block as part of the fork url
+        settings["fork"] = f"{settings['fork']}@{block}"
+    else:
+        # hardhat and anvil
+        settings["fork_block"] = block
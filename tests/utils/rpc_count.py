@@ -0,0 +1,29 @@
+from collections import Counter
+
+from brownie import web3
+
+# JSON-RPC requests sent while each fixture was set up, summed over the session. conftest counts around every
+# fixture setup and prints the busiest ones at the end, so changes to how fixtures read the chain can be compared.
+by_fixture = Counter()
+
+_sent = 0
+
+
+def _counting(make_request):
+    def make_counted_request(method, params):
+        global _sent
+        _sent += 1
+        return make_request(method, params)
+
+    make_counted_request.counted = True
+    return make_counted_request
+
+
+def requests_sent():
+    """Requests sent through web3's provider so far. Wraps the provider the first time it sees it."""
+    provider = web3.provider
+    if provider is not None and not getattr(provider.make_request, "counted", False):
+        provider.make_request = _counting(provider.make_request)
+        # web3 caches the request function it built around make_request, make it build one around ours
+        provider._request_func_cache = (None, None)
+    return _sent
@@ -0,0 +1,68 @@
+import requests
+from brownie import chain, rpc, web3
+
+# round-trips a travel() saved over the chain.sleep and chain.mine calls it replaces, per test. conftest resets this
+# before every test and collects it after.
+saved = {"travels": 0, "round_trips": 0}
+
+_session = requests.Session()
+
+
+def _brownie_round_trips(seconds, blocks):
+    # chain.sleep: evm_increaseTime and a snapshot. chain.mine: each evm_mine, then the latest block, a snapshot
+    # and the block number
+    return (2 if seconds else 0) + (blocks + 3 if blocks else 0)
+
+
+def _batch(calls):
+    payload = [
+        {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+        for i, (method, params) in enumerate(calls)
+    ]
+    response = _session.post(web3.provider.endpoint_uri, json=payload, timeout=60)
+    for item in response.json():
+        if "error" in item:
+            method = calls[item["id"]][0]
+            raise ValueError(f"{method} failed: {item['error']['message']}")
+
+
+def travel(seconds=0, blocks=1, timestamp=None):
+    """
+    chain.sleep(seconds) then chain.mine(blocks), with the clock move and every block but the last sent to the dev
+    chain as a single JSON-RPC batch. The last block goes through chain.mine, which keeps brownie's clock and
+    snapshots in step. With timestamp, that last block is mined at exactly that time. blocks=0 only moves the clock,
+    for when the next transaction will mine the block anyway, and is just chain.sleep.
+    Returns the block number we end on, or None when no block was mined.
+    """
+    if timestamp is not None:
+        if seconds:
+            raise ValueError("Cannot use both `seconds` and `timestamp`")
+        if timestamp < chain.time():
+            raise ValueError(f"{timestamp} is in the past, it's {chain.time()} now")
+        if not blocks:
+            seconds, timestamp = timestamp - chain.time(), None
+    seconds = int(seconds)
+
+    saved["travels"] += 1
+    if not blocks:
+        if seconds:
+            chain.sleep(seconds)
+        return None
+
+    calls = []
+    if seconds:
+        # anvil only takes it as a quantity, ganache and hardhat take a plain number
+        anvil = rpc.backend.__name__.endswith("anvil")
+        calls.append(("evm_increaseTime", [hex(seconds) if anvil else seconds]))
+    calls += [("evm_mine", [])] * (blocks - 1)
+    if calls:
+        _batch(calls)
+    height = chain.mine(timestamp=timestamp)
+
+    # we sent the batch, if any, and one chain.mine
+    saved["round_trips"] += (
+        _brownie_round_trips(seconds, blocks)
+        - (1 if calls else 0)
+        - _brownie_round_trips(0, 1)
+    )
+    return height